@@ -15,9 +15,9 @@ from typing import Optional
 import hashlib
 import base64
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -32,12 +32,18 @@ from engine.ats_optimizer import analyze_ats_coverage
 from output.latex_generator import generate_latex
 from output.pdf_generator import generate_pdf
 from output.docx_generator import generate_docx
-from scrapers.linkedin_scraper import scrape_linkedin_jobs
-from scrapers.indeed_scraper import scrape_indeed_jobs
-from scrapers.greenhouse_lever import scrape_greenhouse_board, scrape_lever_board
+from scrapers.greenhouse_lever import crawl_board
+from scrapers.crawl_state import get_crawl_state
+from scrapers.boards import load_boards
+from scrapers.scheduler import CrawlScheduler
+from scrapers.engine import iterate, run_searches, stream_searches
+from scrapers.sources import enabled_sources, source_names
+from scrapers.resilience import get_resilience
 from tracker.application_tracker import (
-    add_application, update_status, get_applications, get_stats,
-    check_duplicate, get_follow_ups, set_follow_up, _load_data
+    add_application, add_applications_bulk, update_status, get_applications, get_stats,
+    query_applications, get_status_history, archive_stale, search_applications,
+    check_duplicate, get_follow_ups, set_follow_up, refresh_postings, near_duplicate_index,
+    _load_data, TRACK_BATCH
 )
 
 app = FastAPI(title="JobPilot API", version="1.0.0")
@@ -64,12 +70,14 @@ class TailorRequest(BaseModel):
     user_id: Optional[str] = None  # If set, uses profile from config/profiles/{user_id}.json
 
 class ScrapeRequest(BaseModel):
-    source: str = "all"  # all, linkedin, indeed
+    source: str = "all"  # all, or a registered source (linkedin, indeed, ...)
     query: Optional[str] = None
+    stream: bool = False  # newline-delimited JSON, one listing per line as pages arrive
 
 class BoardRequest(BaseModel):
     url: str
     filter: str = "AI,ML,Data,Engineer"
+    full: bool = False  # ignore the last crawl and process every posting
 
 class StatusUpdate(BaseModel):
     status: str
@@ -435,7 +443,8 @@ def finalize_endpoint(req: FinalizeRequest):
             cover_letter_path=str(cl_path),
             ats_score=ats["overall_score"],
             keywords_matched=ats.get("matched_required", []) + ats.get("matched_tech", []),
-            keywords_missing=ats.get("missing_required", []) + ats.get("missing_tech", [])
+            keywords_missing=ats.get("missing_required", []) + ats.get("missing_tech", []),
+            description=parsed.summary  # the raw JD text is not kept in the session
         )
 
         # Clean cache
@@ -539,7 +548,8 @@ def tailor_endpoint(req: TailorRequest):
             cover_letter_path=str(cl_path),
             ats_score=ats["overall_score"],
             keywords_matched=ats.get("matched_required", []) + ats.get("matched_tech", []),
-            keywords_missing=ats.get("missing_required", []) + ats.get("missing_tech", [])
+            keywords_missing=ats.get("missing_required", []) + ats.get("missing_tech", []),
+            description=parsed.raw_text
         )
 
         return {
@@ -603,9 +613,50 @@ def download_file(filename: str):
 # ── Applications / Tracker ───────────────────────────────────────
 
 @app.get("/api/applications")
-def list_applications(status: Optional[str] = None):
-    """List all tracked applications."""
-    return get_applications(status=status)
+def list_applications(
+    status: Optional[str] = None,
+    source: Optional[str] = None,
+    company: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    min_score: Optional[float] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    include_archived: bool = False
+):
+    """
+    List tracked applications one page at a time.
+    Returns {"items": [...], "next_cursor": ...}; pass next_cursor back as
+    ?cursor= for the next page. `company` is a case-insensitive prefix,
+    since/until bound created_at, `fields` is a comma-separated projection.
+    Archived applications are skipped unless include_archived=true.
+    """
+    try:
+        return query_applications(
+            status=status, source=source, company_prefix=company,
+            created_after=since, created_before=until, min_ats_score=min_score,
+            sort=sort, descending=order.lower() != "asc", limit=limit,
+            cursor=cursor, fields=fields.split(",") if fields else None,
+            include_archived=include_archived
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+@app.get("/api/applications/search")
+def search_applications_endpoint(q: str, limit: int = 20, include_archived: bool = False):
+    """Ranked full-text search over tracked applications and their job descriptions."""
+    return {"query": q, "results": search_applications(q, limit, include_archived)}
+
+
+@app.post("/api/applications/archive")
+def archive_applications():
+    """Move closed and stale applications to the archive tier."""
+    archived = archive_stale()
+    return {"archived": len(archived), "ids": archived}
 
 
 @app.get("/api/applications/stats")
@@ -617,10 +668,17 @@ def application_stats():
 @app.patch("/api/applications/{app_id}/status")
 def update_app_status(app_id: int, req: StatusUpdate):
     """Update application status."""
-    update_status(app_id, req.status, req.notes)
+    if update_status(app_id, req.status, req.notes) is None:
+        raise HTTPException(404, f"Application {app_id} not found")
     return {"status": "updated"}
 
 
+@app.get("/api/applications/{app_id}/history")
+def application_history(app_id: int):
+    """Status changes for an application, oldest first."""
+    return get_status_history(app_id)
+
+
 @app.post("/api/applications/{app_id}/followup")
 def set_app_follow_up(app_id: int, req: FollowUpRequest):
     """Set a follow-up reminder."""
@@ -639,44 +697,29 @@ def list_follow_ups():
 @app.post("/api/scrape")
 def scrape_jobs(req: ScrapeRequest):
     """Scrape jobs from specified sources."""
-    all_jobs = []
     query = req.query or "AI ML Engineer"
+    if req.source != "all" and req.source not in source_names():
+        raise HTTPException(400, f"Unknown source {req.source!r}")
+    sources = enabled_sources() if req.source == "all" else [req.source]
+
+    if req.stream:
+        return StreamingResponse(_stream_scrape(query, sources),
+                                 media_type="application/x-ndjson")
 
     try:
-        if req.source in ("all", "linkedin"):
-            jobs = scrape_linkedin_jobs(query, "United States", max_results=15)
-            all_jobs.extend([j.__dict__ for j in jobs])
-
-        if req.source in ("all", "indeed"):
-            jobs = scrape_indeed_jobs(query, "United States", max_results=15)
-            all_jobs.extend([j.__dict__ for j in jobs])
-
-        # Deduplicate
-        seen = set()
-        unique = []
-        for job in all_jobs:
-            key = (job.get("company", "").lower(), job.get("title", "").lower())
-            if key not in seen and job.get("title"):
-                seen.add(key)
-                unique.append(job)
+        # Sources and pages are fetched concurrently
+        jobs = run_searches([query], ["United States"], sources, max_results=15)
+
+        # Merge the same job listed by several sources (or already discovered)
+        postings = near_duplicate_index()
+        unique = [j.__dict__ for j in jobs if j.title and postings.add(j)[1]]
 
         # Track new ones
-        new_count = 0
-        for job in unique:
-            if not check_duplicate(job["company"], job["title"]):
-                add_application(
-                    company=job["company"],
-                    title=job["title"],
-                    location=job.get("location", ""),
-                    url=job.get("url", ""),
-                    source=job.get("source", ""),
-                    status="discovered"
-                )
-                new_count += 1
+        new_ids, _ = add_applications_bulk(unique)
 
         return {
             "total_found": len(unique),
-            "new_added": new_count,
+            "new_added": len(new_ids),
             "jobs": unique[:20]
         }
 
@@ -684,33 +727,101 @@ def scrape_jobs(req: ScrapeRequest):
         raise HTTPException(500, f"Scraping failed: {str(e)}")
 
 
+def _stream_scrape(query: str, sources: list[str]):
+    """
+    New (deduplicated) listings as NDJSON, sent as they arrive and tracked
+    in batches of TRACK_BATCH.
+    """
+    postings = near_duplicate_index()
+    pending = []
+    try:
+        for job in iterate(stream_searches([query], ["United States"], sources,
+                                           max_results=15)):
+            if not job.title or not postings.add(job)[1]:
+                continue
+            new = not check_duplicate(job.company, job.title, job.location, job.url,
+                                      job.job_id, job.source)
+            if new:
+                pending.append(job)
+                if len(pending) >= TRACK_BATCH:
+                    add_applications_bulk(pending)
+                    pending = []
+            yield json.dumps({**job.__dict__, "new": new}) + "\n"
+    finally:
+        # Also when the client disconnects mid-stream
+        if pending:
+            add_applications_bulk(pending)
+
+
+@app.get("/api/scrape/sources")
+def scrape_sources():
+    """Registered search sources."""
+    enabled = set(enabled_sources())
+    return [{"name": name, "enabled": name in enabled} for name in source_names()]
+
+
+@app.get("/api/scrape/health")
+def scrape_health():
+    """Per-source request metrics and circuit breaker state."""
+    return get_resilience().health()
+
+
 @app.post("/api/scrape/board")
 def scrape_board(req: BoardRequest):
-    """Scrape a specific Greenhouse/Lever board."""
+    """Crawl a Greenhouse/Lever board; returns the postings new or changed since the last crawl."""
+    if "greenhouse" not in req.url and "lever" not in req.url:
+        raise HTTPException(400, "URL must be a Greenhouse or Lever board")
     try:
-        if "greenhouse" in req.url:
-            jobs = scrape_greenhouse_board(req.url, title_filter=req.filter)
-        elif "lever" in req.url:
-            jobs = scrape_lever_board(req.url, title_filter=req.filter)
-        else:
-            raise HTTPException(400, "URL must be a Greenhouse or Lever board")
-
-        results = [j.__dict__ for j in jobs]
-
-        new_count = 0
-        for job in results:
-            if not check_duplicate(job["company"], job["title"]):
-                add_application(
-                    company=job["company"],
-                    title=job["title"],
-                    location=job.get("location", ""),
-                    url=job.get("url", ""),
-                    source=job.get("source", ""),
-                    status="discovered"
-                )
-                new_count += 1
-
-        return {"total_found": len(results), "new_added": new_count, "jobs": results}
+        if req.full:
+            get_crawl_state().reset(req.url)
+        delta = crawl_board(req.url, title_filter=req.filter)
+
+        results = [j.__dict__ for j in delta.new + delta.changed]
+
+        new_ids, _ = add_applications_bulk(results)
+        updated = refresh_postings(delta.changed)
+
+        return {
+            "total_found": delta.total,
+            "new_postings": len(delta.new),
+            "changed": len(delta.changed),
+            "removed": delta.removed,
+            "new_added": len(new_ids),
+            "descriptions_updated": len(updated),
+            "jobs": results,
+        }
+
+    except Exception as e:
+        raise HTTPException(500, str(e))
+
+
+@app.post("/api/scrape/boards")
+def scrape_boards(crawl_all: bool = Query(False, alias="all")):
+    """Crawl the registered boards that are due (all of them with ?all=true)."""
+    try:
+        boards = load_boards()
+        scheduler = CrawlScheduler(boards)
+        results = scheduler.crawl(boards if crawl_all else None)
+
+        summary, new_total = [], 0
+        for result in results:
+            if result.error:
+                summary.append({"board": result.board.name, "error": result.error})
+                continue
+            delta = result.delta
+            new_ids, _ = add_applications_bulk([j.__dict__ for j in delta.new + delta.changed])
+            refresh_postings(delta.changed)
+            new_total += len(new_ids)
+            summary.append({
+                "board": result.board.name,
+                "new_postings": len(delta.new),
+                "changed": len(delta.changed),
+                "removed": len(delta.removed),
+                "new_jobs": [j.__dict__ for j in delta.new],
+            })
+
+        return {"registered": len(boards), "crawled": len(results),
+                "new_added": new_total, "boards": summary}
 
     except Exception as e:
         raise HTTPException(500, str(e))
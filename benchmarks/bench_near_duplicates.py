@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate posting detection on a synthetic 50k-listing corpus.
+
+The corpus is generated from a fixed seed: distinct jobs, each listed by
+one to four sources with the variations real sources produce (title
+abbreviations and suffixes, company suffixes, location spellings,
+descriptions only on some sources, trimmed descriptions). Every company
+also has sibling roles with near-identical titles, and popular titles
+recur across companies, so both kinds of false merge are exercised.
+
+Reports grouping throughput, LSH candidates compared per listing, and
+pairwise precision/recall against the known grouping for:
+
+  exact      the old (company.lower(), title.lower()) key
+  minhash    tracker.near_duplicates.NearDuplicateIndex
+
+Usage:
+  python benchmarks/bench_near_duplicates.py
+  python benchmarks/bench_near_duplicates.py --listings 10000 --threshold 0.65
+  python benchmarks/bench_near_duplicates.py --write corpus.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tracker.near_duplicates import NearDuplicateIndex
+
+SENIORITY = ["", "Senior ", "Staff ", "Principal ", "Lead "]
+ROLES = [
+    "Machine Learning Engineer", "Data Scientist", "AI Engineer", "ML Ops Engineer",
+    "Research Scientist", "Data Engineer", "Applied Scientist", "Software Engineer",
+    "NLP Engineer", "Computer Vision Engineer", "Analytics Engineer", "ML Platform Engineer",
+]
+TEAMS = ["Ads", "Search", "Clinical AI", "Imaging", "Payments", "Risk", "Genomics",
+         "Growth", "Platform", "Personalization", "Fraud", "Infrastructure"]
+CITIES = [("San Francisco", "CA"), ("New York", "NY"), ("Boston", "MA"), ("Seattle", "WA"),
+          ("Austin", "TX"), ("Chicago", "IL"), ("Denver", "CO"), ("Remote", "")]
+WORDS = ("model data patient clinical pipeline team build deploy training inference "
+         "python pytorch research product scale health care quality evaluation metrics "
+         "experiment production feature learning system design review partner impact "
+         "cloud real time signal label dataset annotation privacy secure platform").split()
+SOURCES = ["greenhouse", "linkedin", "indeed", "linkedin_via_google"]
+
+
+def _company(rng, i: int) -> str:
+    stem = "".join(rng.choice("bcdfghjklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+    return f"{stem.title()} {rng.choice(['Health', 'AI', 'Labs', 'Bio', 'Systems'])} {i}"
+
+
+def _description(rng, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _variant_title(rng, title: str, team: str) -> str:
+    title = rng.choice([title, title, title.replace("Senior", "Sr.").replace("Engineer", "Eng"),
+                        title.replace("Machine Learning", "ML")])
+    return rng.choice([title, f"{title}, {team}", f"{title} - {team}", f"{title} ({team})"])
+
+
+def _variant_company(rng, company: str) -> str:
+    return rng.choice([company, company, f"{company}, Inc.", f"{company} Inc", company.upper()])
+
+
+def _variant_location(rng, city: str, state: str) -> str:
+    if not state:
+        return rng.choice(["Remote", "Remote (US)", "United States (Remote)"])
+    return rng.choice([f"{city}, {state}", f"{city}, {state}", city,
+                       f"{city}, {state}, United States", ""])
+
+
+def build_corpus(listings: int, seed: int = 7) -> list[dict]:
+    """Synthetic listings, each tagged with its true posting id ("truth")."""
+    rng = random.Random(seed)
+    corpus, job = [], 0
+    company_count = max(1, listings // 25)
+    companies = [_company(rng, i) for i in range(company_count)]
+    while len(corpus) < listings:
+        company = rng.choice(companies)
+        role = rng.choice(ROLES)
+        # Sibling roles: same company and role, different seniority or team
+        for _ in range(rng.randint(1, 3)):
+            title = rng.choice(SENIORITY) + role
+            team = rng.choice(TEAMS)
+            city, state = rng.choice(CITIES)
+            description = _description(rng, rng.randint(150, 400))
+            for source in rng.sample(SOURCES, rng.randint(1, 4)):
+                has_description = source == "greenhouse" or rng.random() < 0.4
+                text = description
+                if has_description and source != "greenhouse":
+                    words = text.split()
+                    text = " ".join(words[rng.randint(0, 10):])  # trimmed intro
+                corpus.append({
+                    "title": _variant_title(rng, title, team),
+                    "company": _variant_company(rng, company),
+                    "location": _variant_location(rng, city, state),
+                    "source": source,
+                    "description": text if has_description else "",
+                    "truth": job,
+                })
+            job += 1
+    rng.shuffle(corpus)
+    return corpus[:listings]
+
+
+def _pairs(groups) -> int:
+    return sum(n * (n - 1) // 2 for n in groups)
+
+
+def pair_scores(predicted: list[int], truth: list[int]) -> tuple[float, float]:
+    """Pairwise precision and recall of a grouping against the true one."""
+    together = _pairs(Counter(zip(predicted, truth)).values())
+    predicted_pairs = _pairs(Counter(predicted).values())
+    true_pairs = _pairs(Counter(truth).values())
+    precision = together / predicted_pairs if predicted_pairs else 1.0
+    recall = together / true_pairs if true_pairs else 1.0
+    return precision, recall
+
+
+def bench_exact(corpus: list[dict]):
+    start = time.perf_counter()
+    keys, predicted = {}, []
+    for listing in corpus:
+        key = (listing["company"].lower(), listing["title"].lower())
+        predicted.append(keys.setdefault(key, len(keys)))
+    return time.perf_counter() - start, predicted, len(keys), 0
+
+
+def bench_minhash(corpus: list[dict], threshold: float):
+    index = NearDuplicateIndex(threshold)
+    start = time.perf_counter()
+    predicted = [index.add(listing)[0].id for listing in corpus]
+    return time.perf_counter() - start, predicted, len(index.postings), index.comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listings", type=int, default=50_000)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--write", help="Also save the corpus as JSON lines")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.listings, args.seed)
+    truth = [listing["truth"] for listing in corpus]
+    if args.write:
+        with open(args.write, "w") as f:
+            f.writelines(json.dumps(listing) + "\n" for listing in corpus)
+
+    print(f"{len(corpus)} listings of {len(set(truth))} distinct postings "
+          f"(threshold {args.threshold})\n")
+    print(f"{'method':10s} {'postings':>9s} {'seconds':>8s} {'listings/s':>11s} "
+          f"{'cmp/listing':>12s} {'precision':>10s} {'recall':>8s}")
+    for name, run in (("exact", bench_exact),
+                      ("minhash", lambda c: bench_minhash(c, args.threshold))):
+        elapsed, predicted, postings, comparisons = run(corpus)
+        precision, recall = pair_scores(predicted, truth)
+        print(f"{name:10s} {postings:9d} {elapsed:8.2f} {len(corpus) / elapsed:11.0f} "
+              f"{comparisons / len(corpus):12.1f} {precision:10.3f} {recall:8.3f}")
+
+    # Sub-linear: the per-listing cost should stay flat as the corpus grows
+    print("\nminhash scaling (fresh corpus per size):")
+    for n in (len(corpus) // 8, len(corpus) // 4, len(corpus) // 2, len(corpus)):
+        elapsed, _, _, comparisons = bench_minhash(build_corpus(n, args.seed), args.threshold)
+        print(f"  {n:7d} listings  {elapsed / n * 1e6:7.1f} us/listing  "
+              f"{comparisons / n:6.1f} comparisons/listing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+HTML parse time per page, per source, on the pages in benchmarks/fixtures.
+
+The pages are synthetic (benchmarks/generate_fixtures.py): seeded copies
+of each site's markup and page chrome, written to match the scrapers'
+selectors. They measure parse cost, not whether the selectors still fit
+the live sites.
+
+  bs4 tree   BeautifulSoup(html, "html.parser"), the tree the scrapers
+             used to build before extracting anything
+  lxml tree  a full lxml parse of the same page
+  extract    the scraper's parser: partial lxml parse + compiled selectors
+
+Usage:
+  python benchmarks/bench_parsers.py
+  python benchmarks/bench_parsers.py --repeat 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from bs4 import BeautifulSoup
+
+from scrapers import greenhouse_lever, indeed_scraper, linkedin_scraper
+from scrapers.extract import parse_html
+
+FIXTURES = PROJECT_ROOT / "benchmarks" / "fixtures"
+
+# fixture -> (source, page, parser)
+PAGES = {
+    "linkedin_search.html": ("linkedin", "search", linkedin_scraper.parse_search_page),
+    "linkedin_job.html": ("linkedin", "job", linkedin_scraper.parse_description),
+    "google_search.html": ("google", "search",
+                           lambda html: linkedin_scraper._parse_google_results(html, 20)),
+    "indeed_search.html": ("indeed", "search", indeed_scraper.parse_search_page),
+    "indeed_job.html": ("indeed", "job", indeed_scraper.parse_description),
+    "greenhouse_board.html": ("greenhouse", "board",
+                              lambda html: greenhouse_lever._parse_greenhouse_html(
+                                  html, "https://boards.greenhouse.io/acme", "Acme")),
+    "greenhouse_job.html": ("greenhouse", "job", greenhouse_lever.parse_greenhouse_description),
+    "lever_board.html": ("lever", "board",
+                         lambda html: greenhouse_lever._parse_lever_html(html, "Acme")),
+    "lever_job.html": ("lever", "job", greenhouse_lever.parse_lever_description),
+}
+
+
+def ms_per_call(fn, html: str, repeat: int) -> float:
+    fn(html)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parsing per source")
+    parser.add_argument("--repeat", type=int, default=20, help="Parses timed per page")
+    args = parser.parse_args()
+
+    print(f"{'source':11s} {'page':7s} {'KB':>5s} {'items':>6s} "
+          f"{'bs4 tree':>9s} {'lxml tree':>10s} {'extract':>9s} {'speedup':>8s}")
+    print("-" * 72)
+    for name, (source, page, extract) in PAGES.items():
+        html = (FIXTURES / name).read_text()
+        result = extract(html)
+        items = len(result) if isinstance(result, list) else int(bool(result))
+        if not items:
+            raise SystemExit(f"{name}: parser extracted nothing")
+
+        bs4_ms = ms_per_call(lambda h: BeautifulSoup(h, "html.parser"), html, args.repeat)
+        lxml_ms = ms_per_call(parse_html, html, args.repeat)
+        extract_ms = ms_per_call(extract, html, args.repeat)
+        print(f"{source:11s} {page:7s} {len(html) // 1024:5d} {items:6d} "
+              f"{bs4_ms:8.2f}ms {lxml_ms:9.2f}ms {extract_ms:8.2f}ms {bs4_ms / extract_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper throughput, replayed offline from a fixture store.
+
+Every scenario runs the real scraper code (search sources, the Google
+fallback, board listing, description fetching) with the shared session
+routed through the replay transport in scrapers/replay.py, so nothing
+touches the network and runs are repeatable. Per scenario it reports:
+
+  pages/s      responses served per second, end to end
+  listings/s   listings (or descriptions) produced per second
+  ms/page      parse time per HTML page for each parser backend:
+               extract (the scraper's own lxml parser), a full lxml
+               tree, and a BeautifulSoup html.parser tree
+
+Results are checked against expected.json in the store (listing count and
+a digest of titles/URLs), so a parser change that drops listings fails
+the benchmark instead of looking fast.
+
+Building the store:
+
+  --seed     offline: the synthetic pages in benchmarks/fixtures (see
+             generate_fixtures.py), saved under the URLs the scrapers
+             request for the benchmark query (board APIs answer 404, so
+             the HTML fallbacks run)
+  --record   live: run the scenarios against the real sites and save
+             every response (boards from --board or config/boards.yaml)
+
+Both write expected.json from a run over the new store.
+
+Usage:
+  python benchmarks/bench_scrapers.py
+  python benchmarks/bench_scrapers.py --repeat 20
+  python benchmarks/bench_scrapers.py --seed
+  python benchmarks/bench_scrapers.py --record --board https://boards.greenhouse.io/openai
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote_plus
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from scrapers import greenhouse_lever, indeed_scraper, linkedin_scraper, replay
+from scrapers.boards import load_boards
+from scrapers.descriptions import extract_description, fetch_descriptions_async
+from scrapers.engine import run
+from scrapers.sources import get_source, source_names
+
+FIXTURES = PROJECT_ROOT / "benchmarks" / "fixtures"
+STORE = FIXTURES / "recorded"
+EXPECTED = "expected.json"
+
+QUERY, LOCATION = "AI Engineer", "United States"
+MAX_RESULTS = 50
+DESCRIPTIONS_PER_SOURCE = 10
+
+# Seed boards, served from the synthetic board pages
+SEED_BOARDS = [
+    {"name": "Acme", "url": "https://boards.greenhouse.io/acme", "filter": "AI,ML,Data,Engineer"},
+    {"name": "Acme", "url": "https://jobs.lever.co/acme", "filter": "AI,ML,Data,Engineer"},
+]
+
+# Source -> its search page parser, for the per-backend parse timings
+SEARCH_PARSERS = {
+    "linkedin": linkedin_scraper.parse_search_page,
+    "indeed": indeed_scraper.parse_search_page,
+}
+
+BACKENDS = {
+    "extract": None,  # the scenario's own parser
+    "lxml": lxml_html.fromstring,
+    "bs4": lambda html: BeautifulSoup(html, "html.parser"),
+}
+
+
+def _google_url(query: str, location: str, max_results: int) -> str:
+    # Mirrors linkedin_scraper._scrape_via_google_async
+    search_query = f"site:linkedin.com/jobs/view {query} {location}"
+    return f"https://www.google.com/search?q={quote_plus(search_query)}&num={min(max_results, 20)}"
+
+
+def _field(job, name: str) -> str:
+    return (job.get(name) if isinstance(job, dict) else getattr(job, name, "")) or ""
+
+
+# --- Scenarios ---------------------------------------------------------------
+# A scenario is a dict (saved in expected.json) naming what to run; run_scenario
+# returns its listings, and page_parser how to parse each page it fetched.
+
+async def _collect(agen) -> list:
+    return [item async for item in agen]
+
+
+async def _descriptions(jobs: list) -> list:
+    return [result.description async for result in fetch_descriptions_async(jobs)
+            if result.ok]
+
+
+def run_scenario(scenario: dict) -> list:
+    kind, args = scenario["kind"], scenario["args"]
+    if kind == "source":
+        # The raw stream: the listing filters are not part of scraping
+        stream = get_source(args["source"]).stream
+        return run(_collect(stream(args["query"], args["location"],
+                                   max_results=args["max_results"])))
+    if kind == "google":
+        return run(linkedin_scraper._scrape_via_google_async(
+            args["query"], args["location"], args["max_results"]))
+    if kind == "board":
+        list_board = (greenhouse_lever._list_greenhouse_board if "greenhouse" in args["url"]
+                      else greenhouse_lever._list_lever_board)
+        return run(list_board(args["url"], args["name"], args["filter"]))
+    if kind == "descriptions":
+        return run(_descriptions(args["jobs"]))
+    raise ValueError(f"Unknown scenario kind {kind!r}")
+
+
+def page_parser(scenario: dict):
+    """(url, html) -> parsed result, for this scenario's HTML pages (or None)."""
+    kind, args = scenario["kind"], scenario["args"]
+    if kind == "source":
+        parse = SEARCH_PARSERS.get(args["source"])
+        return (lambda url, html: parse(html)) if parse else None
+    if kind == "google":
+        return lambda url, html: linkedin_scraper._parse_google_results(html, args["max_results"])
+    if kind == "board":
+        if "greenhouse" in args["url"]:
+            return lambda url, html: greenhouse_lever._parse_greenhouse_html(
+                html, args["url"], args["name"], args["filter"])
+        return lambda url, html: greenhouse_lever._parse_lever_html(
+            html, args["name"], args["filter"])
+    if kind == "descriptions":
+        return lambda url, html: extract_description(html, url)
+    return None
+
+
+def digest(items: list) -> str:
+    """Order-independent fingerprint of a scenario's output."""
+    keys = sorted(f"{_field(item, 'title')}|{_field(item, 'url')}" if not isinstance(item, str)
+                  else item for item in items)
+    return hashlib.sha256("\n".join(keys).encode()).hexdigest()[:16]
+
+
+def build_scenarios(boards: list, query: str, location: str, max_results: int) -> list:
+    """
+    Run the searches and boards once, then a description scenario for the
+    first listings of each source (so recording captures their pages too).
+    """
+    scenarios = [{"name": name, "kind": "source",
+                  "args": {"source": name, "query": query, "location": location,
+                           "max_results": max_results}}
+                 for name in source_names()]
+    scenarios.append({"name": "google", "kind": "google",
+                      "args": {"query": query, "location": location, "max_results": 20}})
+    for board in boards:
+        source = "greenhouse" if "greenhouse" in board["url"] else "lever"
+        scenarios.append({"name": f"{source}:{board['name']}", "kind": "board",
+                          "args": {"url": board["url"], "name": board["name"],
+                                   "filter": board.get("filter") or ""}})
+    jobs = {}
+    for scenario in scenarios:
+        for job in run_scenario(scenario):
+            source = _field(job, "source")
+            if job.url and len(jobs.setdefault(source, [])) < DESCRIPTIONS_PER_SOURCE:
+                jobs[source].append({"url": job.url, "source": source})
+    scenarios.append({"name": "descriptions", "kind": "descriptions",
+                      "args": {"jobs": [job for batch in jobs.values() for job in batch]}})
+    run_scenario(scenarios[-1])
+    return scenarios
+
+
+def snapshot(store: Path, scenarios: list):
+    """Replay every scenario over store and save the results as expected.json."""
+    replay.install("replay", str(store))
+    try:
+        for scenario in scenarios:
+            items = run_scenario(scenario)
+            scenario["expected"] = {"listings": len(items), "digest": digest(items)}
+    finally:
+        replay.uninstall()
+    with open(store / EXPECTED, "w") as f:
+        json.dump({"scenarios": scenarios}, f, indent=1)
+    print(f"Wrote {store / EXPECTED} ({len(scenarios)} scenarios)")
+
+
+# --- Building the store ------------------------------------------------------
+
+def seed(store: Path, query: str, location: str, max_results: int):
+    """Fixture store from the synthetic pages, under the URLs the scrapers request."""
+    if store.exists():
+        shutil.rmtree(store)
+    fixtures = replay.FixtureStore(str(store))
+    html = {"Content-Type": "text/html; charset=utf-8"}
+
+    def page(url: str, name: str):
+        fixtures.add(url, 200, html, (FIXTURES / name).read_bytes(), "OK")
+
+    for start in range(0, max_results, 25):
+        page(linkedin_scraper._search_url(query, location, start), "linkedin_search.html")
+    for start in range(0, max_results, 10):
+        page(indeed_scraper._search_url(query, location, start), "indeed_search.html")
+    page(_google_url(query, location, 20), "google_search.html")
+
+    job_pages = {"linkedin": "linkedin_job.html", "linkedin_via_google": "linkedin_job.html",
+                 "indeed": "indeed_job.html", "greenhouse": "greenhouse_job.html",
+                 "lever": "lever_job.html"}
+    parsed = [
+        *linkedin_scraper.parse_search_page((FIXTURES / "linkedin_search.html").read_text()),
+        *indeed_scraper.parse_search_page((FIXTURES / "indeed_search.html").read_text()),
+        *linkedin_scraper._parse_google_results((FIXTURES / "google_search.html").read_text(), 20),
+    ]
+    for board in SEED_BOARDS:
+        if "greenhouse" in board["url"]:
+            slug = board["url"].rstrip("/").split("/")[-1]
+            api = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs?content=true"
+            page(board["url"], "greenhouse_board.html")
+            parsed += greenhouse_lever._parse_greenhouse_html(
+                (FIXTURES / "greenhouse_board.html").read_text(), board["url"], board["name"])
+        else:
+            api = f"https://api.lever.co/v0/postings/{board['url'].rstrip('/').split('/')[-1]}"
+            page(board["url"], "lever_board.html")
+            parsed += greenhouse_lever._parse_lever_html(
+                (FIXTURES / "lever_board.html").read_text(), board["name"])
+        fixtures.add(api, 404, {"Content-Type": "application/json"},
+                     b'{"status":404,"error":"Not Found"}', "Not Found")
+    for job in parsed:
+        if job.url and job.url not in fixtures:
+            page(job.url, job_pages[job.source])
+    fixtures.save()
+    print(f"Seeded {store} with {len(fixtures)} responses")
+
+
+def record(store: Path, boards: list, query: str, location: str, max_results: int) -> list:
+    """Run the scenarios live, saving every response into store."""
+    replay.install("record", str(store))
+    try:
+        return build_scenarios(boards, query, location, max_results)
+    finally:
+        replay.uninstall()
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def _html_pages(store: replay.FixtureStore, urls: list) -> list:
+    pages = []
+    for url in dict.fromkeys(urls):
+        resp = store.response(url)
+        if resp.status_code == 200 and "html" in resp.headers.get("Content-Type", "html"):
+            pages.append((url, resp.text))
+    return pages
+
+
+def parse_ms(parse, pages: list, repeat: int) -> float:
+    """Mean ms to parse one page."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url, html in pages:
+            parse(url, html)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(pages))
+
+
+def bench(store: Path, repeat: int) -> bool:
+    with open(store / EXPECTED) as f:
+        scenarios = json.load(f)["scenarios"]
+    adapter = replay.install("replay", str(store))
+    ok = True
+    print(f"{'scenario':22s} {'pages':>6s} {'listings':>9s} {'pages/s':>9s} {'listings/s':>11s}  "
+          + " ".join(f"{name + ' ms/pg':>14s}" for name in BACKENDS) + "  check")
+    print("-" * 120)
+    try:
+        for scenario in scenarios:
+            adapter.served.clear()
+            adapter.missing.clear()
+            items = run_scenario(scenario)  # warm up, and the result to check
+            urls = list(adapter.served)
+            pages = len(adapter.served) + len(adapter.missing)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                run_scenario(scenario)
+            elapsed = (time.perf_counter() - start) / repeat
+
+            expected = scenario.get("expected") or {}
+            check = "ok"
+            if expected and (len(items), digest(items)) != (expected["listings"],
+                                                           expected["digest"]):
+                check, ok = f"MISMATCH (expected {expected['listings']} listings)", False
+            if adapter.missing:
+                check += f", {len(adapter.missing)} unrecorded"
+
+            parse = page_parser(scenario)
+            html_pages = _html_pages(adapter.store, urls) if parse else []
+            timings = []
+            for name, backend in BACKENDS.items():
+                if not html_pages:
+                    timings.append(f"{'-':>14s}")
+                    continue
+                fn = parse if backend is None else (lambda url, html, b=backend: b(html))
+                timings.append(f"{parse_ms(fn, html_pages, max(1, repeat // 2)):12.2f}ms")
+
+            print(f"{scenario['name'][:22]:22s} {pages:6d} {len(items):9d} "
+                  f"{pages / elapsed:9.0f} {len(items) / elapsed:11.0f}  "
+                  + " ".join(timings) + f"  {check}")
+    finally:
+        replay.uninstall()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", default=str(STORE), help="Fixture store directory")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per scenario")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--seed", action="store_true",
+                      help="Rebuild the store from benchmarks/fixtures (offline)")
+    mode.add_argument("--record", action="store_true",
+                      help="Record the store from the live sites")
+    parser.add_argument("--board", action="append", default=[],
+                        help="Board URL to record (default: config/boards.yaml)")
+    parser.add_argument("--query", default=QUERY)
+    parser.add_argument("--location", default=LOCATION)
+    parser.add_argument("--max-results", type=int, default=MAX_RESULTS)
+    args = parser.parse_args()
+    store = Path(args.store)
+
+    if args.seed:
+        seed(store, args.query, args.location, args.max_results)
+        replay.install("replay", str(store))
+        try:
+            scenarios = build_scenarios(SEED_BOARDS, args.query, args.location, args.max_results)
+        finally:
+            replay.uninstall()
+        snapshot(store, scenarios)
+    elif args.record:
+        boards = ([{"name": url.rstrip("/").split("/")[-1], "url": url} for url in args.board]
+                  or [{"name": b.name, "url": b.url, "filter": b.filter} for b in load_boards()])
+        snapshot(store, record(store, boards, args.query, args.location, args.max_results))
+
+    if not (store / EXPECTED).exists():
+        raise SystemExit(f"No fixture store at {store}; build one with --seed or --record")
+    if not bench(store, args.repeat):
+        raise SystemExit("Replayed results differ from expected.json")
+
+
+if __name__ == "__main__":
+    main()
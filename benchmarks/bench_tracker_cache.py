@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Dashboard latency with and without the tracker snapshot cache.
+
+"cold" clears the cache before every render (every read goes to storage,
+as before the cache existed); "warm" renders repeatedly between writes.
+
+Usage:
+  python benchmarks/bench_tracker_cache.py --size 10000 --renders 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.bench_tracker_storage import make_app
+from tracker import application_tracker as tracker
+from tracker.storage import open_storage, close_storages
+
+
+def render_ms(path: str, renders: int, cold: bool) -> float:
+    sink = io.StringIO()
+    start = time.perf_counter()
+    for _ in range(renders):
+        if cold:
+            tracker.clear_cache()
+            storage = open_storage(path)
+            if storage.kind == "json":
+                storage._discard_cache()
+        with contextlib.redirect_stdout(sink):
+            tracker.print_dashboard(db_path=path)
+        sink.seek(0)
+        sink.truncate()
+    return (time.perf_counter() - start) * 1000 / renders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached dashboard reads")
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'backend':8s} {'size':>8s} {'cold ms':>10s} {'warm ms':>10s}")
+        print("-" * 40)
+        for backend in args.backends:
+            ext = ".json" if backend == "json" else ".db"
+            path = os.path.join(workdir, f"cache_{backend}{ext}")
+            open_storage(path).insert([make_app(i) for i in range(args.size)])
+            cold = render_ms(path, args.renders, cold=True)
+            warm = render_ms(path, args.renders, cold=False)
+            print(f"{backend:8s} {args.size:8d} {cold:10.2f} {warm:10.2f}")
+            close_storages()
+
+
+if __name__ == "__main__":
+    main()
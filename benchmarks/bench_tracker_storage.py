@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tracker storage benchmark: JSON vs SQLite backends.
+
+Seeds a tracker with N synthetic applications, then times the calls a
+scrape run makes (check_duplicate + add_application) plus status updates
+and reads.
+
+Usage:
+  python benchmarks/bench_tracker_storage.py
+  python benchmarks/bench_tracker_storage.py --sizes 10000 100000 --ops 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tracker import application_tracker as tracker
+from tracker.storage import open_storage, close_storages
+
+
+def make_app(i: int) -> dict:
+    now = datetime.now().isoformat()
+    return {
+        "company": f"Company {i % 5000}",
+        "title": f"ML Engineer {i}",
+        "location": "Remote",
+        "url": f"https://example.com/jobs/{i}",
+        "source": ("linkedin", "indeed", "greenhouse", "lever")[i % 4],
+        "status": ("discovered", "applied", "rejected", "interview")[i % 4],
+        "resume_path": "",
+        "cover_letter_path": "",
+        "ats_score": (i % 100) / 100,
+        "keywords_matched": ["python", "pytorch"],
+        "keywords_missing": ["kubernetes"],
+        "notes": "",
+        "date_discovered": now,
+        "date_applied": "",
+        "date_response": "",
+        "date_interview": "",
+        "follow_up_date": "",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def timed(fn, ops: int) -> float:
+    """Average milliseconds per call over ops calls."""
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - start) * 1000 / ops
+
+
+def bench(backend: str, size: int, ops: int, workdir: str) -> dict:
+    ext = ".json" if backend == "json" else ".db"
+    path = os.path.join(workdir, f"bench_{backend}_{size}{ext}")
+    storage = open_storage(path)
+    storage.insert([make_app(i) for i in range(size)])
+
+    results = {
+        "add_application": timed(lambda i: tracker.add_application(
+            company=f"New Co {i}", title="AI Engineer", source="bench", db_path=path
+        ), ops),
+        "check_duplicate": timed(lambda i: tracker.check_duplicate(
+            f"Company {i}", f"ML Engineer {i}", db_path=path
+        ), ops),
+        "update_status": timed(lambda i: tracker.update_status(
+            i + 1, "applied", "bench", db_path=path
+        ), ops),
+        "get_stats": timed(lambda i: tracker.get_stats(db_path=path), max(1, ops // 4)),
+    }
+    close_storages()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tracker storage backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--ops", type=int, default=20, help="Calls timed per operation")
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'backend':8s} {'size':>8s} {'operation':18s} {'ms/op':>10s}")
+        print("-" * 48)
+        for size in args.sizes:
+            for backend in args.backends:
+                for op, ms in bench(backend, size, args.ops, workdir).items():
+                    print(f"{backend:8s} {size:8d} {op:18s} {ms:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
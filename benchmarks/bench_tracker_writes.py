@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Concurrent write throughput for the JSON tracker.
+
+Simulates parallel /api/tailor/finalize requests: several threads each
+call add_application. Compares one flush per write (commit window 0)
+against group commit, with indented and compact file formats.
+
+Usage:
+  python benchmarks/bench_tracker_writes.py --size 5000 --threads 8 --writes 25
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.bench_tracker_storage import make_app
+from tracker.storage import JSONStorage
+
+
+def run(path: str, threads: int, writes: int, **options) -> float:
+    """Writes per second with `threads` concurrent writers."""
+    storage = JSONStorage(path, **options)
+
+    def worker(n):
+        for i in range(writes):
+            storage.insert([make_app(n * writes + i)])
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return threads * writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON tracker group commit")
+    parser.add_argument("--size", type=int, default=5000, help="Applications to seed")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=25, help="Writes per thread")
+    args = parser.parse_args()
+
+    configs = [
+        ("per-write flush, indented", {"commit_window": 0, "compact": False}),
+        ("group commit, indented", {"commit_window": 0.002, "compact": False}),
+        ("group commit, compact", {"commit_window": 0.002, "compact": True}),
+    ]
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'mode':28s} {'writes/s':>10s}")
+        print("-" * 40)
+        for name, options in configs:
+            path = os.path.join(workdir, f"writes_{len(name)}_{options['compact']}.json")
+            JSONStorage(path, **options).insert([make_app(i) for i in range(args.size)])
+            print(f"{name:28s} {run(path, args.threads, args.writes, **options):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Generate the synthetic job board pages in benchmarks/fixtures.
+
+These are not captured pages. Each one is built from a fixed seed to
+follow the markup of the real site (LinkedIn and Indeed search results
+and job pages, Google results, Greenhouse and Lever boards and job
+pages): job cards and description containers with the sites' class
+names, inside page chrome that real pages also have (inline script and
+style blobs in the <head>, navigation, footers). The chrome is what
+makes a full-page parse slow, so the pages are meant for timing parsers.
+Because they are written to match the scrapers' selectors, they say
+nothing about whether those selectors still match the live sites; use
+`bench_scrapers.py --record` for that.
+
+Usage:
+  python benchmarks/generate_fixtures.py
+  python benchmarks/generate_fixtures.py --out /tmp/fixtures
+"""
+
+import argparse
+import html
+import os
+import random
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = PROJECT_ROOT / "benchmarks" / "fixtures"
+
+SEED = 16
+COMPANIES = ["Tempus", "Abridge", "Hippocratic AI", "Viz.ai", "PathAI", "Aidoc", "Owkin",
+             "Komodo Health", "Flatiron Health", "Cohere Health", "Suki", "Nabla",
+             "Ambience Healthcare", "Iodine Software", "Qventus"]
+TITLES = ["Machine Learning Engineer", "Senior AI Engineer", "Applied Scientist, NLP",
+          "ML Platform Engineer", "Staff Machine Learning Engineer", "AI Engineer, Clinical LLMs",
+          "Data Scientist", "MLOps Engineer", "Research Engineer",
+          "Software Engineer, ML Infrastructure"]
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Boston, MA", "Remote", "Seattle, WA",
+             "Austin, TX", "Chicago, IL"]
+WORDS = ("patients clinical models training inference pipelines python pytorch kubernetes llm "
+         "evaluation deployment data healthcare reliability latency features experiments").split()
+
+
+class PageBuilder:
+    """Page parts drawn from one seeded random source, so output is reproducible."""
+
+    def __init__(self, seed: int = SEED):
+        self.rng = random.Random(seed)
+
+    def head(self, scripts: int = 12) -> str:
+        """<head> full of inline script and style blobs, then the site navigation."""
+        rng = self.rng
+        parts = ['<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Jobs</title>']
+        for i in range(scripts):
+            body = ";".join(
+                f"window.__d{i}_{j}={{k:'{rng.getrandbits(64):x}',"
+                f"v:[{','.join(str(rng.randint(0, 999)) for _ in range(8))}]}}"
+                for j in range(25))
+            parts.append(f"<script>{body}</script>")
+            parts.append("<style>" + " ".join(
+                f".c{i}-{j}{{margin:{j}px;color:#{rng.getrandbits(24):06x}}}"
+                for j in range(30)) + "</style>")
+        parts.append('<link rel="stylesheet" href="/static/app.css"></head><body>')
+        parts.append('<header class="global-nav"><nav>' + "".join(
+            f'<a class="nav-link" href="/n{i}">Menu {i}</a>' for i in range(40)) + "</nav></header>")
+        return "".join(parts)
+
+    @staticmethod
+    def footer() -> str:
+        return ("<footer>" + "".join(
+            '<ul class="footer-col">' + "".join(
+                f'<li><a href="/f{i}{j}">Footer link {j}</a></li>' for j in range(12)) + "</ul>"
+            for i in range(6))
+            + "</footer><script>window.analytics&&analytics.page()</script></body></html>")
+
+    def sentence(self, n: int = 6) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(n * 12)).capitalize() + "."
+
+    def description(self) -> str:
+        """A job description body: intro, duties, requirements, closing."""
+        return (f"<p>{self.sentence()}</p><h3>What you'll do</h3><ul>"
+                + "".join(f"<li>{self.sentence(1)}</li>" for _ in range(8))
+                + "</ul><h3>Requirements</h3><ul>"
+                + "".join(f"<li>{self.sentence(1)}</li>" for _ in range(8))
+                + f"</ul><p>{self.sentence(4)}</p>")
+
+
+def _linkedin_card(i: int, title: str, company: str, location: str) -> str:
+    job_id = 3900000000 + i
+    slug = f"{title.lower().replace(' ', '-').replace(',', '')}-at-{company.lower().replace(' ', '-')}"
+    return f'''<li><div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-tracking-id="x{i}">
+<a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="https://www.linkedin.com/jobs/view/{slug}-{job_id}?refId=abc&amp;trackingId=def">
+<span class="sr-only">{html.escape(title)}</span></a>
+<div class="search-entity-media"><img class="artdeco-entity-image" data-delayed-url="https://media.licdn.com/logo{i}.png" alt="{html.escape(company)}"></div>
+<div class="base-search-card__info"><h3 class="base-search-card__title">
+          {html.escape(title)}
+        </h3><h4 class="base-search-card__subtitle"><a class="hidden-nested-link" href="https://www.linkedin.com/company/{i}">
+            {html.escape(company)}
+          </a></h4>
+<div class="base-search-card__metadata"><span class="job-search-card__location">
+            {location}
+          </span><div class="job-posting-benefits text-sm"><span class="job-posting-benefits__text">Actively Hiring</span></div>
+<time class="job-search-card__listdate" datetime="2026-10-{1 + i % 17:02d}">
+            {i % 6 + 1} days ago
+          </time></div></div></div></li>'''
+
+
+def _indeed_card(jk: str, title: str, company: str, location: str, snippet: str) -> str:
+    return f'''<li class="css-5lfssm eu4oa1w0"><div class="cardOutline tapItem dd-privacy-allow result job_{jk} resultWithShelf sponTapItem desktop vjs-highlight css-1m4cuuf eu4oa1w0"><div class="slider_container css-12igfu7 eu4oa1w0"><div class="slider_list css-utbbho eu4oa1w0"><div class="slider_item css-17bghu4 eu4oa1w0"><div class="job_seen_beacon"><table class="mainContentTable css-131ju4w eu4oa1w0" cellpadding="0" cellspacing="0" role="presentation"><tbody><tr><td class="resultContent css-1qwrrf0 eu4oa1w0"><div class="css-dekpa e37uo190"><h2 class="jobTitle jobTitle-newJob css-1psdjh5 eu4oa1w0" tabindex="-1"><a id="job_{jk}" data-jk="{jk}" class="jcs-JobTitle css-jspxzf eu4oa1w0" href="/rc/clk?jk={jk}&amp;bb=abc&amp;xkcb=SoA" role="button"><span title="{html.escape(title)}" id="jobTitle-{jk}">{html.escape(title)}</span></a></h2></div><div class="company_location css-17fky0v e37uo190"><div><span data-testid="company-name" class="css-1h7lukg eu4oa1w0">{html.escape(company)}</span><div data-testid="text-location" class="css-1restlb eu4oa1w0">{location}</div></div></div><div class="css-1ihavw2 eu4oa1w0"><ul style="list-style-type:circle;margin-top: 0px;margin-bottom: 0px;padding-left:20px;"><li>{snippet}</li></ul></div></td></tr></tbody></table></div></div></div></div></div></li>'''
+
+
+def generate() -> dict:
+    """{file name: page}; the draw order fixes the output for SEED."""
+    page = PageBuilder()
+    rng = page.rng
+    pages = {}
+
+    cards = [_linkedin_card(i, rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(LOCATIONS))
+             for i in range(25)]
+    pages["linkedin_search.html"] = (
+        page.head() + '<main><section class="two-pane-serp-page__results-list">'
+        '<ul class="jobs-search__results-list">' + "\n".join(cards) + "</ul></section></main>"
+        + page.footer())
+    pages["linkedin_job.html"] = (
+        page.head() + '<main><section class="top-card-layout"><h1 class="top-card-layout__title">'
+        'Machine Learning Engineer</h1></section><section class="core-section-container my-3 '
+        'description"><div class="description__text description__text--rich"><section '
+        'class="show-more-less-html"><div class="show-more-less-html__markup '
+        f'show-more-less-html__markup--clamp-after-5">{page.description()}</div></section></div>'
+        '</section><section class="similar-jobs">' + "".join(cards[:6]) + "</section></main>"
+        + page.footer())
+
+    results = []
+    for i in range(10):
+        title, company = rng.choice(TITLES), rng.choice(COMPANIES)
+        results.append(
+            f'<div class="g"><div class="tF2Cxc"><div class="yuRUbf"><a href="https://www.linkedin.com'
+            f'/jobs/view/{3900000100 + i}" data-ved="x"><br><h3 class="LC20lb MBeuO DKV0Md">'
+            f'{html.escape(title)} - {html.escape(company)} | LinkedIn</h3><div class="notranslate">'
+            f'<cite>linkedin.com › jobs › view</cite></div></a></div><div class="VwiC3b"><span>'
+            f'{page.sentence(2)}</span></div></div></div>')
+    pages["google_search.html"] = (page.head(8) + '<div id="search"><div id="rso">'
+                                   + "".join(results) + "</div></div>" + page.footer())
+
+    cards = []
+    for _ in range(15):
+        jk = f"{rng.getrandbits(64):016x}"
+        title, company, location = rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(LOCATIONS)
+        cards.append(_indeed_card(jk, title, company, location, page.sentence(1)))
+    pages["indeed_search.html"] = (
+        page.head() + '<main><div id="mosaic-jobResults"><div class="jobsearch-LeftPane"><div '
+        'id="mosaic-provider-jobcards"><ul class="css-zu9cdh eu4oa1w0">' + "".join(cards)
+        + "</ul></div></div></div></main>" + page.footer())
+    pages["indeed_job.html"] = (
+        page.head() + '<main><div class="jobsearch-JobComponent"><h1 class="jobsearch-JobInfoHeader-'
+        'title">AI Engineer</h1><div id="jobDescriptionText" class="jobsearch-JobComponent-'
+        f'description css-16y4thd eu4oa1w0">{page.description()}</div></div></main>'
+        + page.footer())
+
+    openings = []
+    for d in range(6):
+        openings.append(f'<section class="level-0"><h3 id="{4000 + d}">Department {d}</h3>')
+        for i in range(10):
+            title, location = rng.choice(TITLES), rng.choice(LOCATIONS)
+            openings.append(
+                f'<div class="opening" department_id="{4000 + d}" office_id="{d}" '
+                f'data-office-{d}="true" data-department-{4000 + d}="true"><a data-mapped="true" '
+                f'href="/acme/jobs/{4100000 + d * 100 + i}">{html.escape(title)}</a><br>'
+                f'<span class="location">{location}</span></div>')
+        openings.append("</section>")
+    pages["greenhouse_board.html"] = (
+        page.head(6) + '<div id="wrapper"><div id="main"><div id="flash-wrapper"></div>'
+        '<h1>Current Job Openings at Acme</h1>' + "".join(openings) + "</div></div>"
+        + page.footer())
+    pages["greenhouse_job.html"] = (
+        page.head(6) + '<div id="wrapper"><div id="app_body"><div id="header"><h1 class="app-title">'
+        'Machine Learning Engineer</h1><div class="company-name">at Acme</div><div '
+        f'class="location">Remote</div></div><div id="content">{page.description()}</div>'
+        '<div id="application"><form id="application_form">' + "".join(
+            f'<div class="field"><label>Field {i}</label><input type="text" name="q{i}"></div>'
+            for i in range(30)) + "</form></div></div></div>" + page.footer())
+
+    postings = []
+    for g in range(6):
+        postings.append(f'<div class="postings-group"><div class="large-category-header">Team {g}</div>')
+        for _ in range(10):
+            title, location = rng.choice(TITLES), rng.choice(LOCATIONS)
+            pid = f"{rng.getrandbits(128):032x}"
+            pid = f"{pid[:8]}-{pid[8:12]}-{pid[12:16]}-{pid[16:20]}-{pid[20:]}"
+            postings.append(
+                f'<div class="posting" data-qa-posting-id="{pid}"><div class="posting-apply" '
+                f'data-qa="btn-apply"><a href="https://jobs.lever.co/acme/{pid}/apply" '
+                'class="posting-btn-submit template-btn-submit hex-color">Apply</a></div><a '
+                f'class="posting-title" href="https://jobs.lever.co/acme/{pid}"><h5 '
+                f'data-qa="posting-name">{html.escape(title)}</h5><div class="posting-categories">'
+                '<span href="#" class="sort-by-location posting-category small-category-label '
+                f'location">{location}</span><span href="#" class="sort-by-team posting-category '
+                'small-category-label department">Engineering</span><span href="#" '
+                'class="display-inline-block small-category-label workplaceTypes">Hybrid</span>'
+                '</div></a></div>')
+        postings.append("</div>")
+    pages["lever_board.html"] = (
+        page.head(6) + '<div class="main-header page-full-width section-wrapper"><div '
+        'class="main-header-content"><h1>Acme</h1></div></div><div class="content-wrapper '
+        'posting-page"><div class="content"><div class="postings-wrapper">' + "".join(postings)
+        + "</div></div></div>" + page.footer())
+    pages["lever_job.html"] = (
+        page.head(6) + '<div class="content-wrapper posting-page"><div class="content"><div '
+        'class="section-wrapper page-full-width"><div class="posting-headline"><h2>Machine '
+        'Learning Engineer</h2></div></div><div class="section-wrapper page-full-width"><div '
+        f'class="section page-centered" data-qa="job-description">{page.description()}</div>'
+        "</div></div></div>" + page.footer())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=str(FIXTURES), help="Directory to write the pages to")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, text in generate().items():
+        with open(os.path.join(args.out, name), "w") as f:
+            f.write(text)
+        print(f"{name:22s} {len(text) // 1024:4d} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Multi-process stress check for the tracker (as under `uvicorn --workers N`).
+
+Several processes call add_application (and update_status) concurrently
+on one tracker file. Afterwards every write must be present exactly once
+and no application ID may be handed out twice. Exits 1 on failure.
+
+Usage:
+  python benchmarks/stress_tracker_processes.py --processes 4 --writes 50
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def worker(path: str, worker_id: int, writes: int, results):
+    from tracker import application_tracker as tracker
+
+    ids = []
+    for i in range(writes):
+        app_id = tracker.add_application(
+            company=f"Worker {worker_id}", title=f"Role {i}", source="stress", db_path=path
+        )
+        tracker.update_status(app_id, "applied", f"w{worker_id}", db_path=path)
+        ids.append(app_id)
+    results.put(ids)
+
+
+def check(path: str, processes: int, writes: int) -> bool:
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=worker, args=(path, n, writes, results))
+        for n in range(processes)
+    ]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    returned = [app_id for _ in procs for app_id in results.get(timeout=300)]
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    from tracker import application_tracker as tracker
+    apps = tracker.get_applications(db_path=path)
+    stored = Counter(a["id"] for a in apps)
+    expected = processes * writes
+
+    problems = []
+    if len(returned) != len(set(returned)):
+        problems.append(f"{len(returned) - len(set(returned))} duplicate IDs handed out")
+    if len(apps) != expected:
+        problems.append(f"{expected - len(apps)} lost inserts ({len(apps)}/{expected} stored)")
+    if any(c > 1 for c in stored.values()):
+        problems.append("duplicate IDs stored")
+    not_applied = sum(1 for a in apps if a["status"] != "applied")
+    if not_applied:
+        problems.append(f"{not_applied} lost status updates")
+    if tracker.get_stats(db_path=path)["total"] != len(apps):
+        problems.append("stats counters out of sync")
+
+    status = "OK" if not problems else "FAIL: " + "; ".join(problems)
+    print(f"{os.path.basename(path):16s} {expected:6d} writes  {elapsed:6.2f}s  {status}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process tracker stress check")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=50, help="Inserts per process")
+    args = parser.parse_args()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in ("stress_json.json", "stress_sqlite.db"):
+            ok &= check(os.path.join(workdir, name), args.processes, args.writes)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,9 @@ from dataclasses import dataclass, field, asdict
 from typing import Optional
 
 import anthropic
-import requests
-from bs4 import BeautifulSoup
+
+from scrapers import http_client
+from scrapers.extract import page_text
 
 
 @dataclass
@@ -45,39 +46,10 @@ class ParsedJD:
 
 def fetch_jd_from_url(url: str) -> str:
     """Fetch job description text from a URL."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-    }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = http_client.get(url)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Remove script/style elements
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
-
-        # Try common job description containers
-        selectors = [
-            ".job-description", ".description", "#job-description",
-            "[data-testid='jobDescription']",  # LinkedIn
-            ".posting-page",  # Lever
-            "#content",  # Greenhouse
-            "article", "main", ".content"
-        ]
-        for sel in selectors:
-            container = soup.select_one(sel)
-            if container and len(container.get_text(strip=True)) > 200:
-                return container.get_text(separator="\n", strip=True)
-
-        # Fallback: get body text
-        body = soup.find("body")
-        if body:
-            return body.get_text(separator="\n", strip=True)[:8000]
-
-        return soup.get_text(separator="\n", strip=True)[:8000]
+        return page_text(resp.text)
 
     except Exception as e:
         raise RuntimeError(f"Failed to fetch JD from URL: {e}")
@@ -1,7 +1,8 @@
-import React, { useState, useEffect, useCallback } from 'react'
+import React, { useState, useEffect, useCallback, useRef } from 'react'
 import './App.css'
 
 const API = '/api'
+const PAGE_SIZE = 50
 
 const STATUS_COLORS = {
   discovered: '#94a3b8',
@@ -980,6 +981,8 @@ export default function App() {
   const [page, setPage] = useState('tailor')
   const [stats, setStats] = useState({})
   const [applications, setApplications] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const pagedPastFirst = useRef(false)
   const [apiStatus, setApiStatus] = useState(null)
   const [profile, setProfile] = useState(null)
   const [selectedApp, setSelectedApp] = useState(null)
@@ -988,11 +991,22 @@ export default function App() {
     try {
       const [statsRes, appsRes, healthRes] = await Promise.all([
         fetch(`${API}/applications/stats`),
-        fetch(`${API}/applications`),
+        fetch(`${API}/applications?limit=${PAGE_SIZE}`),
         fetch(`${API}/health`),
       ])
       if (statsRes.ok) setStats(await statsRes.json())
-      if (appsRes.ok) setApplications(await appsRes.json())
+      if (appsRes.ok) {
+        const page = await appsRes.json()
+        if (pagedPastFirst.current) {
+          // Refresh only the first page; rows from "Load more" keep their
+          // place and the cursor still points past them
+          const fresh = new Set(page.items.map(app => app.id))
+          setApplications(prev => [...page.items, ...prev.filter(app => !fresh.has(app.id))])
+        } else {
+          setApplications(page.items)
+          setNextCursor(page.next_cursor)
+        }
+      }
       if (healthRes.ok) setApiStatus(await healthRes.json())
     } catch (e) {
       console.error('API not running:', e)
@@ -1006,6 +1020,20 @@ export default function App() {
     return () => clearInterval(interval)
   }, [loadData])
 
+  const loadMore = async () => {
+    if (!nextCursor) return
+    const res = await fetch(`${API}/applications?limit=${PAGE_SIZE}&cursor=${encodeURIComponent(nextCursor)}`)
+    if (!res.ok) return
+    const page = await res.json()
+    setApplications(prev => {
+      // A row pushed down by newer ones may already be on screen
+      const shown = new Set(prev.map(app => app.id))
+      return [...prev, ...page.items.filter(app => !shown.has(app.id))]
+    })
+    setNextCursor(page.next_cursor)
+    pagedPastFirst.current = true
+  }
+
   const handleStatusChange = async (appId, newStatus) => {
     await fetch(`${API}/applications/${appId}/status`, {
       method: 'PATCH',
@@ -1069,6 +1097,11 @@ export default function App() {
               onStatusChange={handleStatusChange}
               onSelectApp={setSelectedApp}
             />
+            {nextCursor && (
+              <div style={{ textAlign: 'center', marginTop: 16 }}>
+                <button className="btn btn-secondary" onClick={loadMore}>Load more</button>
+              </div>
+            )}
           </>
         )}
         {page === 'tailor' && (
@@ -9,9 +9,18 @@ Usage:
   python main.py scrape                           Scrape new job listings
   python main.py scrape --source linkedin         Scrape from specific source
   python main.py batch                            Scrape + tailor for all new jobs
+  python main.py batch --limit 20 --concurrency 8 Tailor more jobs, fetching 8 JDs at once
   python main.py dashboard                        Show application dashboard
   python main.py followups                        Show pending follow-ups
+  python main.py followups --watch                Remind as follow-ups come due
   python main.py board --url <board_url>          Scrape a specific Greenhouse/Lever board
+  python main.py crawl [--all] [--watch]          Crawl the boards in config/boards.yaml
+  python main.py migrate                          Migrate applications.json to SQLite
+  python main.py rebuild-stats                    Recompute tracker statistics
+  python main.py archive                          Move closed/stale applications to the archive
+  python main.py search "kubernetes healthcare"   Full-text search of tracked applications
+  python main.py --record DIR scrape              Save every response to a fixture store
+  python main.py --replay DIR scrape              Run offline against a fixture store
 """
 
 import argparse
@@ -26,22 +35,31 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from engine.jd_parser import parse_jd, fetch_jd_from_url, ParsedJD
+from engine.jd_parser import parse_jd, ParsedJD
 from engine.resume_tailor import tailor_resume, TailoredResume
 from engine.cover_letter_gen import generate_cover_letter
 from engine.ats_optimizer import analyze_ats_coverage, print_ats_report
 from output.latex_generator import generate_latex
 from output.docx_generator import generate_docx
-from scrapers.linkedin_scraper import scrape_linkedin_jobs, fetch_job_description
-from scrapers.indeed_scraper import scrape_indeed_jobs, fetch_indeed_description
-from scrapers.greenhouse_lever import (
-    scrape_greenhouse_board, scrape_lever_board,
-    fetch_greenhouse_description, fetch_lever_description
-)
+from scrapers.linkedin_scraper import fetch_job_description
+from scrapers.indeed_scraper import fetch_indeed_description
+from scrapers.greenhouse_lever import crawl_board
+from scrapers.crawl_state import get_crawl_state
+from scrapers.descriptions import fetch_descriptions
+from scrapers.engine import iterate, stream_searches
+from scrapers.filters import listing_filter
+from scrapers.sources import enabled_sources, source_names
+from scrapers.http_cache import get_cache
+from scrapers.resilience import get_resilience
+from scrapers import replay
 from tracker.application_tracker import (
-    add_application, update_status, check_duplicate,
-    print_dashboard, get_follow_ups, get_stats, set_follow_up
+    add_application, add_applications_bulk, update_status, check_duplicate,
+    print_dashboard, get_follow_ups, get_stats, set_follow_up,
+    migrate_json_to_sqlite, rebuild_stats, archive_stale, search_applications,
+    set_description, refresh_postings, near_duplicate_index, near_duplicate_threshold,
+    LEGACY_JSON_PATH, TRACKER_PATH, TRACK_BATCH
 )
+from tracker.near_duplicates import group_postings
 
 
 def load_settings():
@@ -166,7 +184,8 @@ def cmd_tailor(args):
         cover_letter_path=str(cl_path),
         ats_score=ats["overall_score"],
         keywords_matched=ats["matched_required"] + ats["matched_tech"],
-        keywords_missing=ats["missing_required"] + ats["missing_tech"]
+        keywords_missing=ats["missing_required"] + ats["missing_tech"],
+        description=parsed.raw_text
     )
     print(f"\nTracked as application #{app_id}")
 
@@ -177,6 +196,17 @@ def cmd_tailor(args):
     print(f"  ATS Score:       {ats['overall_score']:.0%}")
 
 
+def print_source_health():
+    """One line per source that failed or was cut off during this run."""
+    for source, health in get_resilience().health().items():
+        if not (health["failures"] or health["short_circuited"]):
+            continue
+        state = "" if health["state"] == "closed" else f", circuit {health['state']}"
+        print(f"  {source}: {health['successes']}/{health['requests']} ok, "
+              f"{health['retries']} retried, {health['blocked']} blocked, "
+              f"{health['short_circuited']} skipped{state} (last: {health['last_error']})")
+
+
 def cmd_scrape(args):
     """Scrape new job listings."""
     settings = load_settings()
@@ -184,49 +214,49 @@ def cmd_scrape(args):
     titles = search_config.get("titles", ["AI Engineer", "ML Engineer"])
     locations = search_config.get("locations", ["United States"])
 
-    all_jobs = []
     source = getattr(args, 'source', 'all')
-
-    for title in titles[:3]:  # Limit to top 3 titles to avoid rate limits
-        for location in locations[:1]:  # Primary location
-            print(f"\nSearching: {title} in {location}...")
-
-            if source in ('all', 'linkedin'):
-                print("  LinkedIn...", end=" ", flush=True)
-                jobs = scrape_linkedin_jobs(title, location, max_results=10)
-                all_jobs.extend(jobs)
-                print(f"found {len(jobs)}")
-
-            if source in ('all', 'indeed'):
-                print("  Indeed...", end=" ", flush=True)
-                jobs = scrape_indeed_jobs(title, location, max_results=10)
-                all_jobs.extend(jobs)
-                print(f"found {len(jobs)}")
-
-    # Deduplicate by company+title
-    seen = set()
-    unique_jobs = []
-    for job in all_jobs:
-        key = (job.company.lower(), job.title.lower())
-        if key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
-
-    # Track discovered jobs
-    new_count = 0
-    for job in unique_jobs:
-        if not check_duplicate(job.company, job.title):
-            add_application(
-                company=job.company,
-                title=job.title,
-                location=job.location,
-                url=job.url,
-                source=job.source,
-                status="discovered"
-            )
-            new_count += 1
-
-    print(f"\n✓ Found {len(unique_jobs)} jobs, {new_count} new")
+    sources = enabled_sources() if source == "all" else [source]
+
+    # Top 3 titles in the primary location; every search and page runs
+    # concurrently, paced per host by the rate limiter
+    titles, locations = titles[:3], locations[:1]
+    print(f"\nSearching {len(titles)} titles in {locations[0]} on {', '.join(sources)}...")
+
+    # Listings are tracked as their pages arrive. The same job seen on
+    # another source (or already waiting to be tailored) is merged rather
+    # than tracked again.
+    postings = near_duplicate_index()
+    unique_jobs, pending, new_ids = [], [], []
+    found = dict.fromkeys(sources, 0)
+    merged = 0
+    for job in iterate(stream_searches(titles, locations, sources, max_results=10)):
+        name = job.source.split("_")[0]
+        found[name] = found.get(name, 0) + 1
+        if not postings.add(job)[1]:
+            merged += 1
+            continue
+        unique_jobs.append(job)
+        pending.append(job)
+        if len(pending) >= TRACK_BATCH:
+            new_ids += add_applications_bulk(pending)[0]
+            pending = []
+    if pending:
+        new_ids += add_applications_bulk(pending)[0]
+
+    for name, count in found.items():
+        print(f"  {name}: found {count}")
+    dropped = listing_filter().dropped
+    if dropped:
+        reasons = ", ".join(f"{count} {reason}" for reason, count in dropped.most_common())
+        print(f"  filtered out: {reasons}")
+    cache = get_cache()
+    if cache is not None:
+        print("  HTTP cache: {hits} hits, {revalidated} not modified, {misses} fetched".format(
+            **cache.stats))
+    print_source_health()
+
+    print(f"\n✓ Found {len(unique_jobs)} jobs, {len(new_ids)} new "
+          f"({merged} near-duplicate listings merged)")
     print("\nNew discoveries:")
     for job in unique_jobs[:15]:
         print(f"  {job.title[:40]:40s} @ {job.company[:30]:30s} ({job.source})")
@@ -247,21 +277,45 @@ def cmd_batch(args):
         print("\nNo new jobs to process.")
         return
 
-    print(f"\nFound {len(discovered)} discovered jobs. Processing...")
-
-    for app in discovered[:5]:  # Process top 5 at a time
+    # Filters may have changed since these were scraped
+    keep = listing_filter()
+    discovered = [app for app in discovered if keep(app)]
+
+    # Tailor each job once, from its richest listing
+    postings = group_postings(discovered, near_duplicate_threshold())
+    batch = [posting.canonical for posting in postings][:getattr(args, "limit", 5)]
+    duplicates = {posting.canonical["id"]: [app["id"] for app in posting.listings
+                                            if app["id"] != posting.canonical["id"]]
+                  for posting in postings}
+
+    def close_duplicates(app):
+        # The other listings of a processed job must not be tailored next run
+        for app_id in duplicates.get(app["id"], ()):
+            update_status(app_id, "low_match", f"Duplicate of #{app['id']}")
+    print(f"\nFound {len(discovered)} discovered jobs ({len(postings)} distinct). "
+          f"Processing {len(batch)}...")
+
+    # Descriptions are fetched concurrently and handled as each one arrives
+    failures = []
+    for result in fetch_descriptions(batch, concurrency=getattr(args, "concurrency", 8)):
+        app = result.job
         print(f"\n--- Processing: {app['title']} @ {app['company']} ---")
 
-        try:
-            # Get the full JD
-            if app.get("url"):
-                jd_text = fetch_jd_from_url(app["url"])
-            else:
-                print("  No URL, skipping...")
-                continue
+        if not result.ok:
+            print(f"  Could not fetch JD ({result.error}), skipping...")
+            failures.append(result)
+            continue
 
-            if not jd_text or len(jd_text) < 100:
-                print("  Could not fetch JD, skipping...")
+        try:
+            jd_text = result.description
+            set_description(app["id"], jd_text)
+
+            # The description can state a salary below search.filters.min_salary
+            reason = keep.reason({**app, "description": jd_text})
+            if reason:
+                update_status(app["id"], "low_match", f"Filtered out ({reason})")
+                close_duplicates(app)
+                print(f"  ✗ Filtered out ({reason}), skipped")
                 continue
 
             # Parse and tailor
@@ -299,44 +353,108 @@ def cmd_batch(args):
                 update_status(app["id"], "low_match",
                              f"ATS Score: {ats['overall_score']:.0%} - below threshold")
                 print(f"  ✗ ATS: {ats['overall_score']:.0%} - below threshold, skipped")
+            close_duplicates(app)
 
         except Exception as e:
             print(f"  Error: {e}")
             continue
 
+    if failures:
+        print(f"\n{len(failures)} job descriptions could not be fetched:")
+        for result in failures:
+            print(f"  {result.job['company']} - {result.job['title']}: {result.error}")
+        print_source_health()
     print("\n✓ Batch processing complete")
 
 
 def cmd_board(args):
-    """Scrape a specific Greenhouse/Lever board."""
+    """Crawl a specific Greenhouse/Lever board; only changes since the last crawl are processed."""
     url = args.url
     title_filter = getattr(args, 'filter', 'AI,ML,Data,Engineer')
 
     if "greenhouse" in url:
-        print(f"Scraping Greenhouse board: {url}")
-        jobs = scrape_greenhouse_board(url, title_filter=title_filter)
+        print(f"Crawling Greenhouse board: {url}")
     elif "lever" in url:
-        print(f"Scraping Lever board: {url}")
-        jobs = scrape_lever_board(url, title_filter=title_filter)
+        print(f"Crawling Lever board: {url}")
     else:
         print("URL must be a Greenhouse or Lever board URL")
         return
 
-    print(f"\nFound {len(jobs)} matching jobs:")
-    for job in jobs:
-        print(f"  {job.title} ({job.location}) - {job.url}")
-
-    # Track
-    new_count = 0
-    for job in jobs:
-        if not check_duplicate(job.company, job.title):
-            add_application(
-                company=job.company, title=job.title,
-                location=job.location, url=job.url, source=job.source,
-                status="discovered"
-            )
-            new_count += 1
-    print(f"\n{new_count} new jobs added to tracker")
+    if getattr(args, "full", False):
+        get_crawl_state().reset(url)
+    try:
+        delta = crawl_board(url, title_filter=title_filter)
+    except Exception as e:
+        print(f"Could not crawl board: {e}")
+        return
+
+    print(f"\n{delta.total} matching jobs: {len(delta.new)} new, "
+          f"{len(delta.changed)} changed, {len(delta.removed)} removed")
+    for label, jobs in (("+", delta.new), ("~", delta.changed)):
+        for job in jobs:
+            print(f"  {label} {job.title} ({job.location}) - {job.url}")
+    for posting in delta.removed:
+        print(f"  - {posting['title']} - {posting['url']}")
+
+    # Track only the delta
+    new_ids, _ = add_applications_bulk(delta.new + delta.changed)
+    updated = refresh_postings(delta.changed)
+    print(f"\n{len(new_ids)} new jobs added to tracker, {len(updated)} descriptions updated")
+
+
+def cmd_crawl(args):
+    """Crawl the registered boards that are due (or all of them with --all)."""
+    from scrapers.boards import load_boards
+    from scrapers.scheduler import CrawlScheduler
+
+    def registry():
+        return load_boards(args.registry)
+
+    boards = registry()
+    if not boards:
+        print("No boards registered. Add Greenhouse/Lever boards to config/boards.yaml")
+        return
+
+    def track(result):
+        board, delta = result.board, result.delta
+        if result.error:
+            print(f"  ✗ {board.name:28s} {result.error}")
+            return
+        add_applications_bulk(delta.new + delta.changed)
+        refresh_postings(delta.changed)
+        print(f"  {board.name:30s} {len(delta.new):3d} new {len(delta.changed):3d} changed "
+              f"{len(delta.removed):3d} removed ({delta.total} open)")
+
+    scheduler = CrawlScheduler(registry, on_result=track)
+
+    if args.watch:
+        print(f"Crawling {len(boards)} boards as they come due (Ctrl+C to stop)...")
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            print("\nStopped.")
+        return
+
+    due = boards if args.all else scheduler.due()
+    if not due:
+        wait = scheduler.seconds_until_next() / 60
+        print(f"No boards due. Next crawl in {wait:.0f} minutes (use --all to crawl now).")
+        return
+
+    print(f"\nCrawling {len(due)} of {len(boards)} boards...")
+    results = scheduler.crawl(due)
+
+    # Summary of new postings per board
+    crawled = [r for r in results if r.delta]
+    new_total = sum(len(r.delta.new) for r in crawled)
+    print(f"\n✓ {len(crawled)} boards crawled, {len(results) - len(crawled)} failed, "
+          f"{new_total} new postings")
+    print_source_health()
+    for result in sorted(crawled, key=lambda r: r.board.name.lower()):
+        if result.delta.new:
+            print(f"\n{result.board.name} ({len(result.delta.new)} new):")
+            for job in result.delta.new:
+                print(f"  {job.title[:50]:50s} {job.location[:25]:25s} {job.url}")
 
 
 def cmd_dashboard(args):
@@ -346,6 +464,9 @@ def cmd_dashboard(args):
 
 def cmd_followups(args):
     """Show pending follow-ups."""
+    if getattr(args, "watch", False):
+        return watch_followups(args)
+
     follow_ups = get_follow_ups()
     if not follow_ups:
         print("\nNo pending follow-ups. Nice!")
@@ -362,12 +483,73 @@ def cmd_followups(args):
         print(f"       URL: {app.get('url', 'N/A')}")
 
 
+def watch_followups(args):
+    """Daemon mode: sleep until the next follow-up is due, then remind."""
+    from tracker.scheduler import FollowUpScheduler
+
+    def remind(app):
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        print(f"[{stamp}] Follow up: [{app['id']}] {app['title']} @ {app['company']}")
+        if app.get("url"):
+            print(f"       URL: {app['url']}")
+
+    print("Watching for follow-ups (Ctrl+C to stop)...")
+    scheduler = FollowUpScheduler(remind, max_sleep=args.max_sleep)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+def cmd_migrate(args):
+    """Migrate a legacy JSON tracker into the SQLite tracker."""
+    try:
+        count = migrate_json_to_sqlite(args.source, args.dest)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
+    print(f"✓ Migrated {count} applications to {args.dest}")
+
+
+def cmd_rebuild_stats(args):
+    """Recompute tracker statistics from scratch."""
+    stats = rebuild_stats()
+    print(f"✓ Rebuilt stats for {stats['total']} applications")
+    for status, count in stats["by_status"].items():
+        print(f"  {status}: {count}")
+
+
+def cmd_archive(args):
+    """Move closed and stale applications to the archive tier."""
+    archived = archive_stale()
+    print(f"✓ Archived {len(archived)} applications")
+
+
+def cmd_search(args):
+    """Full-text search of tracked applications."""
+    results = search_applications(args.query, limit=args.limit,
+                                  include_archived=args.archived)
+    if not results:
+        print(f"\nNo applications match \"{args.query}\".")
+        return
+
+    print(f"\n{len(results)} matches for \"{args.query}\":")
+    for app in results:
+        print(f"  [{app['id']:>4}] [{app['status']:12s}] {app['title'][:35]:35s} "
+              f"@ {app['company'][:25]:25s} ({app['score']:.2f})")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="JobPilot - Automated Job Application Pipeline",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__
     )
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--record", metavar="DIR",
+                           help="Save every HTTP response to a fixture store")
+    transport.add_argument("--replay", metavar="DIR",
+                           help="Serve HTTP responses from a fixture store (offline)")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # tailor
@@ -378,14 +560,18 @@ def main():
 
     # scrape
     p_scrape = subparsers.add_parser("scrape", help="Scrape new job listings")
-    p_scrape.add_argument("--source", choices=["all", "linkedin", "indeed"],
+    p_scrape.add_argument("--source", choices=["all", *source_names()],
                           default="all", help="Source to scrape")
     p_scrape.set_defaults(func=cmd_scrape)
 
     # batch
     p_batch = subparsers.add_parser("batch", help="Scrape + auto-tailor all new jobs")
-    p_batch.add_argument("--source", choices=["all", "linkedin", "indeed"],
+    p_batch.add_argument("--source", choices=["all", *source_names()],
                          default="all")
+    p_batch.add_argument("--limit", type=int, default=5,
+                         help="Discovered jobs to tailor per run")
+    p_batch.add_argument("--concurrency", type=int, default=8,
+                         help="Job descriptions fetched at once")
     p_batch.set_defaults(func=cmd_batch)
 
     # board
@@ -393,22 +579,64 @@ def main():
     p_board.add_argument("--url", required=True, help="Board URL")
     p_board.add_argument("--filter", default="AI,ML,Data,Engineer",
                          help="Title filter keywords (comma-separated)")
+    p_board.add_argument("--full", action="store_true",
+                         help="Forget the last crawl and process every posting")
     p_board.set_defaults(func=cmd_board)
 
+    # crawl
+    p_crawl = subparsers.add_parser("crawl", help="Crawl registered Greenhouse/Lever boards")
+    p_crawl.add_argument("--all", action="store_true",
+                         help="Crawl every board now, not just the due ones")
+    p_crawl.add_argument("--watch", action="store_true",
+                         help="Keep running, crawling each board when it comes due")
+    p_crawl.add_argument("--registry", default=None,
+                         help="Board registry file (default: config/boards.yaml)")
+    p_crawl.set_defaults(func=cmd_crawl)
+
     # dashboard
     p_dash = subparsers.add_parser("dashboard", help="Show application dashboard")
     p_dash.set_defaults(func=cmd_dashboard)
 
     # followups
     p_follow = subparsers.add_parser("followups", help="Show pending follow-ups")
+    p_follow.add_argument("--watch", action="store_true",
+                          help="Keep running and remind as follow-ups come due")
+    p_follow.add_argument("--max-sleep", type=float, default=3600,
+                          help="Max seconds between checks for new follow-ups (--watch)")
     p_follow.set_defaults(func=cmd_followups)
 
+    # migrate
+    p_migrate = subparsers.add_parser("migrate", help="Migrate applications.json to SQLite")
+    p_migrate.add_argument("--from", dest="source", default=LEGACY_JSON_PATH,
+                           help="Legacy JSON tracker path")
+    p_migrate.add_argument("--to", dest="dest", default=TRACKER_PATH,
+                           help="SQLite tracker path")
+    p_migrate.set_defaults(func=cmd_migrate)
+
+    # rebuild-stats
+    p_rebuild = subparsers.add_parser("rebuild-stats", help="Recompute tracker statistics")
+    p_rebuild.set_defaults(func=cmd_rebuild_stats)
+
+    # archive
+    p_archive = subparsers.add_parser("archive", help="Archive closed/stale applications")
+    p_archive.set_defaults(func=cmd_archive)
+
+    # search
+    p_search = subparsers.add_parser("search", help="Search tracked applications")
+    p_search.add_argument("query", help="Words to search for (all must match)")
+    p_search.add_argument("--limit", type=int, default=20)
+    p_search.add_argument("--archived", action="store_true",
+                          help="Also search archived applications")
+    p_search.set_defaults(func=cmd_search)
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return
 
+    if args.record or args.replay:
+        replay.install("record" if args.record else "replay", args.record or args.replay)
     args.func(args)
 
 
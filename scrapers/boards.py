@@ -0,0 +1,63 @@
+"""
+Board Registry
+The company job boards crawled by `python main.py crawl`, read from
+config/boards.yaml (scrapers.crawl.registry in settings.yaml). Boards
+listed under scrapers.greenhouse_lever.company_boards are included too.
+"""
+
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from scrapers.config import project_path, scraper_settings
+
+DEFAULT_REGISTRY = "config/boards.yaml"
+DEFAULT_FILTER = "AI,ML,Data,Engineer"
+
+
+@dataclass
+class Board:
+    """A registered Greenhouse or Lever board."""
+    url: str
+    name: str = ""
+    filter: str = DEFAULT_FILTER
+
+    @property
+    def kind(self) -> str:
+        return "greenhouse" if "greenhouse" in self.url else "lever"
+
+
+def _board(entry, default_filter: str):
+    if isinstance(entry, str):
+        entry = {"url": entry}
+    url = (entry.get("url") or "").strip()
+    if "greenhouse" not in url and "lever" not in url:
+        print(f"Skipping board entry (not a Greenhouse/Lever URL): {entry}")
+        return None
+    name = entry.get("name") or urlsplit(url).path.strip("/").split("/")[-1]
+    return Board(url=url, name=name, filter=entry.get("filter", default_filter))
+
+
+def load_boards(path: str = None) -> list[Board]:
+    """Registered boards, in file order, without duplicate URLs."""
+    import yaml
+
+    settings = scraper_settings()
+    path = project_path(path or (settings.get("crawl") or {}).get("registry")
+                        or DEFAULT_REGISTRY)
+    try:
+        with open(path) as f:
+            registry = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        registry = {}
+
+    default_filter = (registry.get("defaults") or {}).get("filter", DEFAULT_FILTER)
+    entries = list(registry.get("boards") or [])
+    entries += (settings.get("greenhouse_lever") or {}).get("company_boards") or []
+
+    boards, seen = [], set()
+    for entry in entries:
+        board = _board(entry, default_filter)
+        if board and board.url not in seen:
+            seen.add(board.url)
+            boards.append(board)
+    return boards
@@ -0,0 +1,36 @@
+"""
+Scraper Settings
+The `scrapers` and `search` sections of config/settings.yaml, loaded once
+per process.
+"""
+
+import os
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+SETTINGS_PATH = os.path.join(PROJECT_ROOT, "config", "settings.yaml")
+
+
+@lru_cache(maxsize=1)
+def _settings() -> dict:
+    try:
+        import yaml
+        with open(SETTINGS_PATH) as f:
+            return yaml.safe_load(f) or {}
+    except (ImportError, OSError):
+        return {}
+
+
+def scraper_settings() -> dict:
+    """The scrapers section of settings.yaml ({} if missing)."""
+    return _settings().get("scrapers", {}) or {}
+
+
+def search_settings() -> dict:
+    """The search section of settings.yaml ({} if missing)."""
+    return _settings().get("search", {}) or {}
+
+
+def project_path(path: str) -> str:
+    """A settings path; relative paths are relative to the project root."""
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
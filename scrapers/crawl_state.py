@@ -0,0 +1,211 @@
+"""
+Board Crawl State
+What each Greenhouse/Lever board looked like on its last crawl, so a new
+crawl only reports what changed.
+
+Per board we keep every posting's ID, its `updated_at` and a hash of its
+content, plus the board's newest `updated_at` (its watermark). A posting
+whose `updated_at` matches the stored one is unchanged without looking at
+its content; otherwise the content hash decides. Postings missing from a
+crawl are reported as removed.
+
+Boards also carry their crawl schedule (interval and next crawl time),
+maintained by scrapers/scheduler.py.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from scrapers.config import project_path, scraper_settings
+
+DEFAULT_PATH = "scrapers/crawl_state.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    board TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL DEFAULT '',
+    crawled_at REAL,
+    changed_at REAL,
+    interval REAL,
+    next_crawl_at REAL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    board TEXT NOT NULL,
+    posting TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (board, posting)
+);
+"""
+
+
+def posting_key(job) -> str:
+    """A posting's identity on its board: the ATS job ID, else its URL."""
+    return job.job_id or job.url
+
+
+def content_hash(job) -> str:
+    content = json.dumps([job.title, job.location, job.url, job.description])
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+@dataclass
+class BoardDelta:
+    """What changed on a board since its previous crawl."""
+    board: str
+    new: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)  # [{"posting", "title", "url"}]
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Postings currently on the board."""
+        return len(self.new) + len(self.changed) + self.unchanged
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.new or self.changed or self.removed)
+
+
+class CrawlState:
+    """Crawl state for many boards, in one SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(boards)")}
+        for column in ("interval", "next_crawl_at"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE boards ADD COLUMN {column} REAL")
+
+    def known(self, board: str) -> dict:
+        """{posting key: updated_at} from the board's last crawl."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT posting, updated_at FROM postings WHERE board = ?", (board,)
+            ))
+
+    def board(self, board: str):
+        """
+        {watermark, crawled_at, changed_at, interval, next_crawl_at} for a
+        board, or None if it was never crawled or scheduled.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, crawled_at, changed_at, interval, next_crawl_at "
+                "FROM boards WHERE board = ?", (board,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("watermark", "crawled_at", "changed_at", "interval", "next_crawl_at"),
+                        row))
+
+    def set_schedule(self, board: str, interval: float, next_crawl_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO boards (board, interval, next_crawl_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(board) DO UPDATE SET interval = excluded.interval, "
+                "next_crawl_at = excluded.next_crawl_at",
+                (board, interval, next_crawl_at)
+            )
+
+    def update(self, board: str, jobs: list, now: float = None) -> BoardDelta:
+        """Compare a full crawl of board with its stored state, then store it."""
+        now = time.time() if now is None else now
+        delta = BoardDelta(board)
+        with self._lock:
+            stored = {row[0]: row[1:] for row in self._conn.execute(
+                "SELECT posting, updated_at, hash, title, url FROM postings WHERE board = ?",
+                (board,)
+            )}
+            seen, upserts, touched = set(), [], []
+            for job in jobs:
+                key = posting_key(job)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                previous = stored.get(key)
+                updated_at = getattr(job, "updated_at", "") or ""
+                if previous and updated_at and previous[0] == updated_at:
+                    # Same updated_at: unchanged, content not even parsed
+                    delta.unchanged += 1
+                    touched.append((now, board, key))
+                    continue
+                digest = content_hash(job)
+                if previous is None:
+                    delta.new.append(job)
+                elif previous[1] != digest:
+                    delta.changed.append(job)
+                else:
+                    delta.unchanged += 1
+                upserts.append((board, key, job.title, job.url, updated_at, digest, now, now))
+
+            for key, (_, _, title, url) in stored.items():
+                if key not in seen:
+                    delta.removed.append({"posting": key, "title": title, "url": url})
+
+            watermark = max((getattr(job, "updated_at", "") or "" for job in jobs), default="")
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(board, posting) DO UPDATE SET title = excluded.title, "
+                    "url = excluded.url, updated_at = excluded.updated_at, "
+                    "hash = excluded.hash, last_seen = excluded.last_seen", upserts
+                )
+                self._conn.executemany(
+                    "UPDATE postings SET last_seen = ? WHERE board = ? AND posting = ?", touched
+                )
+                self._conn.executemany(
+                    "DELETE FROM postings WHERE board = ? AND posting = ?",
+                    [(board, r["posting"]) for r in delta.removed]
+                )
+                self._conn.execute(
+                    "INSERT INTO boards (board, watermark, crawled_at, changed_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(board) DO UPDATE SET "
+                    "watermark = excluded.watermark, crawled_at = excluded.crawled_at, "
+                    "changed_at = COALESCE(excluded.changed_at, boards.changed_at)",
+                    (board, watermark, now, now if delta.has_changes else None)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return delta
+
+    def reset(self, board: str):
+        """Forget a board, so its next crawl reports every posting as new."""
+        with self._lock:
+            self._conn.execute("DELETE FROM postings WHERE board = ?", (board,))
+            self._conn.execute("DELETE FROM boards WHERE board = ?", (board,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_crawl_state() -> CrawlState:
+    """The process-wide crawl state, at scrapers.crawl_state_path in settings.yaml."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = CrawlState(project_path(
+                scraper_settings().get("crawl_state_path") or DEFAULT_PATH
+            ))
+        return _state
@@ -0,0 +1,107 @@
+"""
+Bulk Job Description Fetcher
+Fetches many job descriptions concurrently and streams them back as they
+complete.
+
+Each listing goes to its source's extractor (LinkedIn, Indeed, Greenhouse,
+Lever), with the generic page extractor as the fallback. At most
+`concurrency` pages are in flight; per-host pacing and the HTTP cache come
+from the engine's get(). A failed listing is reported in its result and
+never stops the batch. Listings that already carry a description (from
+the Greenhouse and Lever APIs) are returned without a request.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Union
+
+from scrapers.engine import get, iterate
+from scrapers.extract import page_text
+from scrapers.greenhouse_lever import parse_greenhouse_description, parse_lever_description
+from scrapers.http_cache import source_for
+from scrapers.indeed_scraper import parse_description as parse_indeed_description
+from scrapers.linkedin_scraper import JobListing, parse_description as parse_linkedin_description
+
+# Source -> description extractor (html -> text)
+EXTRACTORS = {
+    "linkedin": parse_linkedin_description,
+    "indeed": parse_indeed_description,
+    "greenhouse": parse_greenhouse_description,
+    "lever": parse_lever_description,
+}
+
+# Shorter text than this is treated as a failed extraction
+MIN_DESCRIPTION_CHARS = 100
+
+
+@dataclass
+class DescriptionResult:
+    """The outcome of fetching one listing's description."""
+    job: Union[JobListing, dict]
+    description: str = ""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def _field(job, name: str) -> str:
+    return (job.get(name) if isinstance(job, dict) else getattr(job, name, "")) or ""
+
+
+def extract_description(html: str, url: str, source: str = "") -> str:
+    """Description text from a job page, using the source's extractor first."""
+    source = source.split("_")[0] if source else ""
+    extractor = EXTRACTORS.get(source) or EXTRACTORS.get(source_for(url))
+    description = extractor(html) if extractor else ""
+    if len(description) < MIN_DESCRIPTION_CHARS:
+        description = page_text(html)
+    return description
+
+
+async def _fetch_one(job, semaphore: asyncio.Semaphore) -> DescriptionResult:
+    existing = _field(job, "description")
+    if len(existing) >= MIN_DESCRIPTION_CHARS:
+        # Board APIs include descriptions with the listing
+        return DescriptionResult(job, existing)
+
+    url = _field(job, "url")
+    if not url:
+        return DescriptionResult(job, error="no URL")
+
+    try:
+        async with semaphore:
+            resp = await get(url)
+        if resp.status_code != 200:
+            return DescriptionResult(job, error=f"HTTP {resp.status_code}")
+        description = extract_description(resp.text, url, _field(job, "source"))
+    except Exception as e:
+        return DescriptionResult(job, error=str(e) or type(e).__name__)
+
+    if len(description) < MIN_DESCRIPTION_CHARS:
+        return DescriptionResult(job, description, error="no description found")
+    if isinstance(job, JobListing):
+        job.description = description
+    return DescriptionResult(job, description)
+
+
+async def fetch_descriptions_async(jobs, concurrency: int = 8):
+    """Async generator of DescriptionResults, in completion order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [asyncio.ensure_future(_fetch_one(job, semaphore)) for job in jobs]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def fetch_descriptions(jobs, concurrency: int = 8):
+    """
+    Fetch descriptions for JobListings or tracker application dicts.
+    Yields a DescriptionResult per job as soon as it completes; fetching
+    continues in the background while the caller handles each result.
+    """
+    return iterate(fetch_descriptions_async(list(jobs), concurrency))
@@ -0,0 +1,218 @@
+"""
+Async Scraping Engine
+Runs every source, query and page concurrently.
+
+Blocking HTTP calls run on a bounded thread pool over the shared pooled
+session in scrapers/http_client.py; politeness comes from
+the per-host token buckets in scrapers/ratelimit.py rather than sleeps.
+Hosts never wait on each other, so a scrape takes about as long as the
+slowest host's rate limit allows instead of the sum of every delay.
+Retries, backoff and circuit breaking per source come from
+scrapers/resilience.py.
+
+Search sources stream their listings page by page (see scrapers/sources.py).
+stream_searches() merges every search into one stream in arrival order;
+iterate() consumes any async generator from synchronous code. The sync
+scraper functions (scrape_linkedin_jobs, ...) wrap their async versions
+with run(), so existing callers keep working.
+"""
+
+import asyncio
+import functools
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from scrapers.config import scraper_settings
+from scrapers.http_client import fetch, from_cache
+from scrapers.ratelimit import get_limiter
+from scrapers.resilience import get_resilience
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=scraper_settings().get("max_concurrency", 16),
+                thread_name_prefix="scrape"
+            )
+        return _pool
+
+
+async def get(url: str, headers: dict = None, timeout=None, **kwargs) -> requests.Response:
+    """GET url from the cache, or as soon as its host's token bucket allows.
+
+    Failures are retried with backoff; raises SourceUnavailable without a
+    request while url's source is blocked.
+    """
+    resp = from_cache(url, **kwargs)
+    if resp is not None:
+        return resp
+    guard = get_resilience()
+    loop = asyncio.get_running_loop()
+    request = functools.partial(fetch, url, headers=headers, timeout=timeout, **kwargs)
+    for attempt in itertools.count():
+        # Fail fast before queueing on the limiter, then recheck: the
+        # source may have been blocked while we waited
+        guard.check(url, admit=False)
+        await get_limiter().acquire_async(url)
+        guard.check(url)
+        started = time.monotonic()
+        try:
+            resp = await loop.run_in_executor(_executor(), request)
+        except Exception as e:
+            delay = guard.record(url, attempt, time.monotonic() - started, error=e)
+            if delay is None:
+                raise
+        except BaseException:
+            # Cancelled (e.g. by in_order's cleanup): free a claimed probe
+            guard.release(url)
+            raise
+        else:
+            delay = guard.record(url, attempt, time.monotonic() - started, resp=resp)
+            if delay is None:
+                return resp
+        await asyncio.sleep(delay)
+
+
+def run(coro):
+    """Run a coroutine to completion from synchronous code."""
+    return asyncio.run(coro)
+
+
+async def in_order(aws):
+    """
+    Start every awaitable at once; yield their results (or the exception
+    each raised) in the given order, as soon as each is available.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for task in tasks:
+            try:
+                yield await task
+            except Exception as e:
+                yield e
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # retrieved, so it isn't logged as unhandled
+
+
+_DONE = object()
+
+
+def iterate(agen):
+    """
+    Iterate an async generator from synchronous code. It runs on its own
+    event loop in a background thread, so it keeps producing while the
+    caller handles each item; closing the iterator stops it.
+    """
+    items = queue.Queue()
+    stop = threading.Event()
+
+    async def produce():
+        try:
+            async for item in agen:
+                if stop.is_set():
+                    break
+                items.put(item)
+        finally:
+            await agen.aclose()
+
+    def run_loop():
+        try:
+            asyncio.run(produce())
+        except Exception as e:
+            items.put(e)
+        finally:
+            items.put(_DONE)
+
+    threading.Thread(target=run_loop, name="iterate", daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def _searches(titles, locations, sources):
+    from scrapers.sources import enabled_sources, get_source
+
+    names = enabled_sources() if sources is None else sources
+    return [(get_source(name), title, location)
+            for name in names for title in titles for location in locations]
+
+
+async def stream_searches(titles: list[str], locations: list[str],
+                          sources=None, max_results: int = 10):
+    """
+    Run every (source, title, location) search concurrently, yielding
+    JobListings as their pages arrive. sources defaults to every enabled
+    registered source; a failing search is reported and skipped.
+    """
+    searches = _searches(titles, locations, sources)
+    listings = asyncio.Queue()
+
+    async def pump(source, title, location):
+        try:
+            async for job in source.search_async(title, location, max_results):
+                await listings.put(job)
+        except Exception as e:
+            print(f"{source.name} search for {title!r} in {location} failed: {e}")
+        finally:
+            await listings.put(_DONE)
+
+    tasks = [asyncio.ensure_future(pump(*search)) for search in searches]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            job = await listings.get()
+            if job is _DONE:
+                remaining -= 1
+            else:
+                yield job
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def scrape_searches(titles: list[str], locations: list[str],
+                          sources=None, max_results: int = 10) -> list:
+    """
+    Run every (source, title, location) search concurrently.
+    Returns the JobListings in a stable order (source, then title, then
+    location); a failing search is reported and skipped.
+    """
+    searches = _searches(titles, locations, sources)
+    results = await asyncio.gather(
+        *(source.collect(title, location, max_results) for source, title, location in searches),
+        return_exceptions=True
+    )
+    jobs = []
+    for (source, title, location), result in zip(searches, results):
+        if isinstance(result, Exception):
+            print(f"{source.name} search for {title!r} in {location} failed: {result}")
+            continue
+        jobs.extend(result)
+    return jobs
+
+
+def run_searches(titles: list[str], locations: list[str],
+                 sources=None, max_results: int = 10) -> list:
+    """Synchronous scrape_searches()."""
+    return run(scrape_searches(titles, locations, sources, max_results))
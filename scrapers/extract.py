@@ -0,0 +1,122 @@
+"""
+HTML Extraction
+lxml-based parsing helpers shared by the scrapers.
+
+lxml's C parser replaces BeautifulSoup's pure-Python html.parser, and
+selectors are XPath expressions compiled once at import. parse_html() can
+also skip ahead to the part of the page that matters (the first job card,
+the description container): nothing before it can match, so it is never
+parsed.
+"""
+
+from lxml import etree, html as lxml_html
+
+# Elements whose text is never page content (BeautifulSoup skips them too)
+_SKIP_TEXT = {"script", "style", "template"}
+
+
+def has_class(name: str) -> str:
+    """XPath predicate: the class attribute contains the token `name`."""
+    # The plain substring test is cheap and rejects most elements first
+    return (f"contains(@class, '{name}') and "
+            f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')")
+
+
+def class_contains(fragment: str, ignore_case: bool = False) -> str:
+    """XPath predicate: the class attribute contains `fragment` anywhere."""
+    if ignore_case:
+        return (f"contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+                f"'abcdefghijklmnopqrstuvwxyz'), '{fragment.lower()}')")
+    return f"contains(@class, '{fragment}')"
+
+
+def xpath(expr: str) -> etree.XPath:
+    """Compile a selector once, at import time."""
+    return etree.XPath(expr)
+
+
+def parse_html(text: str, markers: tuple = ()):
+    """
+    Parse an HTML page (or the tail of it) into an lxml tree.
+    With markers, parsing starts at the tag containing the earliest one;
+    a page without any marker is parsed whole.
+    """
+    if markers:
+        starts = [i for i in (text.find(m) for m in markers) if i >= 0]
+        if starts:
+            tag_start = text.rfind("<", 0, min(starts))
+            if tag_start > 0:
+                text = text[tag_start:]
+    if not text.strip():
+        return lxml_html.fromstring("<html></html>")
+    try:
+        return lxml_html.document_fromstring(text)
+    except ValueError:
+        # str input with an XML encoding declaration
+        return lxml_html.document_fromstring(text.encode("utf-8"))
+
+
+def first(node, *selectors):
+    """The first match of the first selector that matches, or None."""
+    for selector in selectors:
+        found = selector(node)
+        if found:
+            return found[0]
+    return None
+
+
+def _strings(node):
+    # Document order: an element's text, its children, then its tail
+    for event, el in etree.iterwalk(node, events=("start", "end", "comment", "pi")):
+        if event == "start":
+            if el.tag not in _SKIP_TEXT and el.text:
+                yield el.text
+        elif el is not node and el.tail:
+            # "end", or a comment/processing instruction (only its tail is text)
+            yield el.tail
+
+
+def text(node, separator: str = "") -> str:
+    """Like BeautifulSoup's get_text(separator, strip=True)."""
+    if node is None:
+        return ""
+    return separator.join(s for s in (s.strip() for s in _strings(node)) if s)
+
+
+def fragment_text(fragment: str) -> str:
+    """Text of an HTML fragment, such as a description field from a JSON API."""
+    if not fragment or not fragment.strip():
+        return ""
+    return text(lxml_html.fragment_fromstring(fragment, create_parent="div"), separator="\n")
+
+
+# Common job description containers on any site, most specific first
+_CONTAINERS = [xpath(expr) for expr in (
+    f"//*[{has_class('job-description')}]",
+    f"//*[{has_class('description')}]",
+    "//*[@id='job-description']",
+    "//*[@data-testid='jobDescription']",  # LinkedIn
+    f"//*[{has_class('posting-page')}]",  # Lever
+    "//*[@id='content']",  # Greenhouse
+    "//article", "//main",
+    f"//*[{has_class('content')}]",
+)]
+_CHROME = xpath("//nav|//footer|//header")
+
+
+def page_text(html: str) -> str:
+    """Job description text from an arbitrary job page."""
+    root = parse_html(html)
+
+    # Remove page chrome (script/style text is never extracted)
+    for tag in _CHROME(root):
+        tag.drop_tree()
+
+    for selector in _CONTAINERS:
+        container = first(root, selector)
+        if container is not None and len(text(container)) > 200:
+            return text(container, separator="\n")
+
+    # Fallback: body text
+    body = root.find("body")
+    return text(body if body is not None else root, separator="\n")[:8000]
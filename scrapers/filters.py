@@ -0,0 +1,141 @@
+"""
+Listing Filters
+Drops irrelevant listings before anything is spent on them: no
+description fetch, no tracker write, no LLM call.
+
+Rules come from the search section of settings.yaml: title keywords to
+require or exclude (search.exclude_keywords), companies to skip,
+locations to keep or skip, and a minimum salary. Each keyword list is
+compiled once into a single case-insensitive regex, so checking a
+listing is one scan per field however many keywords there are.
+
+Keywords match whole words ("intern" doesn't drop "Internal Tools"); a
+trailing * makes a keyword match as a prefix ("intern*" drops both).
+Listings are kept when a field a rule needs is missing, e.g. a listing
+with no location passes a location rule and one with no stated salary
+passes min_salary.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Optional, Pattern
+
+from scrapers.config import search_settings
+
+# "$150,000", "$150k", "$ 150.5K", "USD 150,000"
+_SALARY = re.compile(
+    r"(?:\$|usd\s?)\s?(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?\s?k\b|\d{5,7}\b)", re.IGNORECASE
+)
+
+# Amounts below this are hourly rates or noise, not annual salaries
+MIN_ANNUAL = 10_000
+
+
+def compile_keywords(keywords, whole_words: bool = True) -> Optional[Pattern]:
+    """
+    One regex matching any of keywords (case-insensitive), or None if
+    there are none. Longest keywords first, so overlapping alternatives
+    resolve to the most specific one.
+    """
+    words = sorted({str(k).strip().lower() for k in keywords or () if str(k).strip()},
+                   key=len, reverse=True)
+    if not words:
+        return None
+    parts = []
+    for word in words:
+        prefix = word.endswith("*")
+        body = re.escape(word.rstrip("*"))
+        if whole_words:
+            body = r"(?<![a-z0-9])" + body + ("" if prefix else r"(?![a-z0-9])")
+        parts.append(body)
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def title_matcher(title_filter: str = None) -> Callable[[str], bool]:
+    """
+    Matcher for a board's comma-separated title filter ("AI,ML,Data").
+    Keywords match anywhere in the title, as board filters always have;
+    compiled once per filter string.
+    """
+    pattern = compile_keywords((title_filter or "").split(","), whole_words=False)
+    if pattern is None:
+        return lambda title: True
+    return lambda title: pattern.search(title or "") is not None
+
+
+def max_salary(text: str) -> Optional[int]:
+    """The largest annual amount stated in text, or None."""
+    amounts = []
+    for match in _SALARY.finditer(text or ""):
+        value = match.group(1).replace(",", "").replace(" ", "").lower()
+        amount = float(value[:-1]) * 1000 if value.endswith("k") else float(value)
+        if amount >= MIN_ANNUAL:
+            amounts.append(int(amount))
+    return max(amounts) if amounts else None
+
+
+def _get(job, name: str) -> str:
+    return (job.get(name) if isinstance(job, dict) else getattr(job, name, "")) or ""
+
+
+@dataclass
+class ListingFilter:
+    """Compiled include/exclude rules for JobListings or application dicts."""
+    include_titles: Optional[Pattern] = None
+    exclude_titles: Optional[Pattern] = None
+    exclude_companies: Optional[Pattern] = None
+    locations: Optional[Pattern] = None
+    exclude_locations: Optional[Pattern] = None
+    min_salary: int = 0
+    dropped: Counter = field(default_factory=Counter)  # reason -> listings dropped
+
+    @classmethod
+    def from_settings(cls, search: dict) -> "ListingFilter":
+        rules = search.get("filters") or {}
+        return cls(
+            include_titles=compile_keywords(rules.get("include_titles")),
+            exclude_titles=compile_keywords(
+                list(search.get("exclude_keywords") or []) + list(rules.get("exclude_titles") or [])
+            ),
+            exclude_companies=compile_keywords(rules.get("exclude_companies")),
+            locations=compile_keywords(rules.get("locations")),
+            exclude_locations=compile_keywords(rules.get("exclude_locations")),
+            min_salary=int(rules.get("min_salary") or 0),
+        )
+
+    def reason(self, job) -> str:
+        """Why job is filtered out ("" to keep it)."""
+        title = _get(job, "title")
+        if self.exclude_titles and self.exclude_titles.search(title):
+            return "excluded title"
+        if self.include_titles and not self.include_titles.search(title):
+            return "title"
+        if self.exclude_companies and self.exclude_companies.search(_get(job, "company")):
+            return "company"
+        location = _get(job, "location")
+        if location:
+            if self.exclude_locations and self.exclude_locations.search(location):
+                return "excluded location"
+            if self.locations and not self.locations.search(location):
+                return "location"
+        if self.min_salary:
+            salary = max_salary(_get(job, "description"))
+            if salary is not None and salary < self.min_salary:
+                return "salary"
+        return ""
+
+    def __call__(self, job) -> bool:
+        """Whether to keep job (dropped listings are counted by reason)."""
+        reason = self.reason(job)
+        if reason:
+            self.dropped[reason] += 1
+        return not reason
+
+
+@lru_cache(maxsize=1)
+def listing_filter() -> ListingFilter:
+    """The process-wide filter, compiled from settings.yaml once."""
+    return ListingFilter.from_settings(search_settings())
@@ -2,200 +2,378 @@
 Greenhouse & Lever Job Board Scraper
 Scrapes jobs from company-specific Greenhouse and Lever boards.
 These are the most automation-friendly ATS platforms.
+Requests are paced by the per-host rate limiter; the async variants let
+the engine crawl many boards at once. HTML pages are parsed with lxml
+using the precompiled selectors below.
+
+Both JSON APIs return full descriptions with the listing (Greenhouse with
+?content=true), so a board costs one request instead of one per job.
+crawl_board() goes further and returns only what changed since the last
+crawl (see scrapers/crawl_state.py). Postings are checked against the
+board's title filter and the listing filters (scrapers/filters.py) before
+their descriptions are parsed.
 """
 
-import time
-import random
+import html
 import json
-from urllib.parse import quote_plus
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+from scrapers import http_client
+from scrapers.crawl_state import BoardDelta, CrawlState, get_crawl_state
+from scrapers.engine import get, run
+from scrapers.extract import (
+    class_contains, first, fragment_text, has_class, parse_html, text, xpath
+)
+from scrapers.filters import listing_filter, title_matcher
+from scrapers.linkedin_scraper import JobListing
+
+
+# Greenhouse board and job pages
+_GH_OPENINGS = xpath(f"//div[{has_class('opening')}]")
+_GH_LINK = xpath(".//a")
+_GH_LOCATION = xpath(f".//span[{has_class('location')}]")
+_GH_DESCRIPTION = (
+    xpath("//div[@id='content']"),
+    xpath(f"//div[{has_class('job-post')}]"),
+)
+_GH_DESCRIPTION_MARKERS = ('id="content"', "id='content'", "id=content", "job-post")
+
+# Lever board and job pages
+_LEVER_POSTINGS = xpath(f"//div[{has_class('posting')}]")
+_LEVER_HEADING = xpath(".//h5")
+_LEVER_LINK = xpath(f".//a[{has_class('posting-title')}]")
+_LEVER_LOCATION = xpath(f".//span[{has_class('location')}]")
+_LEVER_DESCRIPTION = (
+    xpath(f"//div[{has_class('posting-page')}]"),
+    xpath(f"//div[{class_contains('description', ignore_case=True)}]"),
+)
+# No bare "description" marker: it would match <meta name="description">
+# in the <head>; pages without posting-page are parsed whole
+_LEVER_DESCRIPTION_MARKERS = ("posting-page",)
+
+
+def _greenhouse_description(job_data: dict) -> str:
+    # The API returns the posting's HTML entity-escaped
+    return fragment_text(html.unescape(job_data.get("content") or ""))
+
+
+def _parse_greenhouse_api(data: dict, company: str, title_filter: str = None,
+                          known: dict = None) -> list[JobListing]:
+    """
+    Listings from the board API. Postings in `known` ({job_id: updated_at},
+    from the last crawl) with the same updated_at skip description parsing.
+    """
+    jobs = []
+    matches, keep = title_matcher(title_filter), listing_filter()
+    for job_data in data.get("jobs", []):
+        title = job_data.get("title", "")
+        if not matches(title):
+            continue
+
+        job_id = str(job_data.get("id", ""))
+        updated_at = job_data.get("updated_at") or ""
+        unchanged = known and updated_at and known.get(job_id) == updated_at
+        job = JobListing(
+            title=title,
+            company=company,
+            location=(job_data.get("location") or {}).get("name", ""),
+            url=job_data.get("absolute_url", ""),
+            date_posted=job_data.get("first_published") or updated_at,
+            job_id=job_id,
+            updated_at=updated_at,
+            source="greenhouse"
+        )
+        if not keep(job):
+            continue
+        if not unchanged:
+            # Checked again with the description, for the salary rule
+            job.description = _greenhouse_description(job_data)
+            if not keep(job):
+                continue
+        jobs.append(job)
+    return jobs
+
+
+def _parse_greenhouse_html(html: str, board_url: str, company_name: str = "",
+                           title_filter: str = None) -> list[JobListing]:
+    jobs = []
+    matches, keep = title_matcher(title_filter), listing_filter()
+    root = parse_html(html, ("opening",))
+
+    for opening in _GH_OPENINGS(root):
+        job = JobListing(source="greenhouse")
 
-import requests
-from bs4 import BeautifulSoup
+        link = first(opening, _GH_LINK)
+        if link is not None:
+            job.title = text(link)
+            href = link.get("href", "")
+            job.url = href if href.startswith("http") else board_url.rstrip("/") + href
 
-from scrapers.linkedin_scraper import JobListing, HEADERS
+        job.location = text(first(opening, _GH_LOCATION))
+
+        job.company = company_name
+
+        if not matches(job.title) or not keep(job):
+            continue
+
+        if job.title:
+            jobs.append(job)
+
+    return jobs
 
 
-# Common healthcare AI / ML companies using Greenhouse or Lever
-DEFAULT_BOARDS = {
-    "greenhouse": [
-        # Add company board URLs as you find them
-        # Format: {"name": "Company", "url": "https://boards.greenhouse.io/company"}
-    ],
-    "lever": [
-        # Format: {"name": "Company", "url": "https://jobs.lever.co/company"}
-    ]
-}
+async def _list_greenhouse_board(board_url: str, company_name: str = "",
+                                 title_filter: str = None, known: dict = None,
+                                 api_only: bool = False) -> list[JobListing]:
+    """
+    Every matching posting on a Greenhouse board; raises if the board can't
+    be read. api_only raises instead of falling back to the HTML page.
+    """
+    # Greenhouse has a JSON API
+    api_url = board_url.rstrip("/")
+    if "boards.greenhouse.io" in api_url:
+        company_slug = api_url.split("/")[-1]
+        json_url = f"https://boards-api.greenhouse.io/v1/boards/{company_slug}/jobs?content=true"
+
+        resp = await get(json_url)
+        if resp.status_code == 200:
+            return _parse_greenhouse_api(resp.json(), company_name or company_slug,
+                                         title_filter, known)
+        if api_only:
+            resp.raise_for_status()
+    if api_only:
+        raise ValueError(f"No Greenhouse API listing for {board_url}")
+
+    # Fallback: HTML scraping
+    resp = await get(board_url)
+    resp.raise_for_status()
+    return _parse_greenhouse_html(resp.text, board_url, company_name, title_filter)
+
+
+async def scrape_greenhouse_board_async(board_url: str, company_name: str = "",
+                                        title_filter: str = None) -> list[JobListing]:
+    """Async scrape_greenhouse_board()."""
+    try:
+        return await _list_greenhouse_board(board_url, company_name, title_filter)
+    except Exception as e:
+        print(f"Greenhouse scraping error for {board_url}: {e}")
+        return []
 
 
 def scrape_greenhouse_board(board_url: str, company_name: str = "",
                             title_filter: str = None) -> list[JobListing]:
     """Scrape jobs from a Greenhouse board."""
-    jobs = []
+    return run(scrape_greenhouse_board_async(board_url, company_name, title_filter))
 
-    try:
-        # Greenhouse has a JSON API
-        api_url = board_url.rstrip("/")
-        if "boards.greenhouse.io" in api_url:
-            company_slug = api_url.split("/")[-1]
-            json_url = f"https://boards-api.greenhouse.io/v1/boards/{company_slug}/jobs"
 
-            resp = requests.get(json_url, headers=HEADERS, timeout=15)
-            if resp.status_code == 200:
-                data = resp.json()
-                for job_data in data.get("jobs", []):
-                    title = job_data.get("title", "")
-
-                    # Filter by title keywords if specified
-                    if title_filter:
-                        title_lower = title.lower()
-                        filters = [f.lower() for f in title_filter.split(",")]
-                        if not any(f in title_lower for f in filters):
-                            continue
-
-                    job = JobListing(
-                        title=title,
-                        company=company_name or company_slug,
-                        location=job_data.get("location", {}).get("name", ""),
-                        url=job_data.get("absolute_url", ""),
-                        job_id=str(job_data.get("id", "")),
-                        source="greenhouse"
-                    )
-                    jobs.append(job)
-
-                return jobs
-
-        # Fallback: HTML scraping
-        time.sleep(random.uniform(1, 3))
-        resp = requests.get(board_url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        for opening in soup.find_all("div", class_="opening"):
-            job = JobListing(source="greenhouse")
-
-            link = opening.find("a")
-            if link:
-                job.title = link.get_text(strip=True)
-                href = link.get("href", "")
-                job.url = href if href.startswith("http") else board_url.rstrip("/") + href
-
-            loc = opening.find("span", class_="location")
-            if loc:
-                job.location = loc.get_text(strip=True)
-
-            job.company = company_name
-
-            if title_filter:
-                title_lower = job.title.lower()
-                filters = [f.lower() for f in title_filter.split(",")]
-                if not any(f in title_lower for f in filters):
-                    continue
-
-            if job.title:
-                jobs.append(job)
+def _lever_description(posting: dict) -> str:
+    """Opening text, each titled list (requirements, ...) and the closing text."""
+    parts = [posting.get("descriptionPlain") or fragment_text(posting.get("description", ""))]
+    for section in posting.get("lists") or []:
+        parts.append(section.get("text", ""))
+        parts.append(fragment_text(section.get("content", "")))
+    parts.append(posting.get("additionalPlain") or fragment_text(posting.get("additional", "")))
+    return "\n".join(part.strip() for part in parts if part and part.strip())
+
+
+def _lever_date(posting: dict) -> str:
+    created = posting.get("createdAt")
+    if not created:
+        return ""
+    return datetime.fromtimestamp(created / 1000, tz=timezone.utc).date().isoformat()
 
-    except Exception as e:
-        print(f"Greenhouse scraping error for {board_url}: {e}")
 
+def _parse_lever_api(data: list, company: str, title_filter: str = None,
+                     known: dict = None) -> list[JobListing]:
+    """Listings from the postings API; `known` works as in _parse_greenhouse_api."""
+    jobs = []
+    matches, keep = title_matcher(title_filter), listing_filter()
+    for posting in data:
+        title = posting.get("text", "")
+        if not matches(title):
+            continue
+
+        job_id = posting.get("id", "")
+        updated_at = str(posting.get("updatedAt") or "")
+        unchanged = known and updated_at and known.get(job_id) == updated_at
+        categories = posting.get("categories") or {}
+        job = JobListing(
+            title=title,
+            company=company,
+            location=categories.get("location", ""),
+            url=posting.get("hostedUrl", ""),
+            date_posted=_lever_date(posting),
+            job_id=job_id,
+            updated_at=updated_at,
+            source="lever"
+        )
+        if not keep(job):
+            continue
+        if not unchanged:
+            job.description = _lever_description(posting)
+            if not keep(job):
+                continue
+        jobs.append(job)
     return jobs
 
 
-def scrape_lever_board(board_url: str, company_name: str = "",
-                       title_filter: str = None) -> list[JobListing]:
-    """Scrape jobs from a Lever board."""
+def _parse_lever_html(html: str, company_name: str = "",
+                      title_filter: str = None) -> list[JobListing]:
     jobs = []
+    matches, keep = title_matcher(title_filter), listing_filter()
+    root = parse_html(html, ("posting",))
 
-    try:
-        # Lever also has a JSON API
-        api_url = board_url.rstrip("/")
-        if "jobs.lever.co" in api_url:
-            company_slug = api_url.split("/")[-1].split("?")[0]
-            json_url = f"https://api.lever.co/v0/postings/{company_slug}"
+    for posting in _LEVER_POSTINGS(root):
+        job = JobListing(source="lever")
 
-            resp = requests.get(json_url, headers=HEADERS, timeout=15)
-            if resp.status_code == 200:
-                data = resp.json()
-                for posting in data:
-                    title = posting.get("text", "")
-
-                    if title_filter:
-                        title_lower = title.lower()
-                        filters = [f.lower() for f in title_filter.split(",")]
-                        if not any(f in title_lower for f in filters):
-                            continue
-
-                    categories = posting.get("categories", {})
-                    job = JobListing(
-                        title=title,
-                        company=company_name or company_slug,
-                        location=categories.get("location", ""),
-                        url=posting.get("hostedUrl", ""),
-                        job_id=posting.get("id", ""),
-                        source="lever"
-                    )
-                    jobs.append(job)
-
-                return jobs
-
-        # Fallback: HTML
-        time.sleep(random.uniform(1, 3))
-        resp = requests.get(board_url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        for posting in soup.find_all("div", class_="posting"):
-            job = JobListing(source="lever")
-
-            title_elem = posting.find("h5")
-            if title_elem:
-                job.title = title_elem.get_text(strip=True)
-
-            link = posting.find("a", class_="posting-title")
-            if link:
-                job.url = link.get("href", "")
-                if not job.title:
-                    job.title = link.get_text(strip=True)
-
-            loc_elem = posting.find("span", class_="location")
-            if loc_elem:
-                job.location = loc_elem.get_text(strip=True)
-
-            job.company = company_name
-
-            if title_filter:
-                title_lower = job.title.lower()
-                filters = [f.lower() for f in title_filter.split(",")]
-                if not any(f in title_lower for f in filters):
-                    continue
-
-            if job.title:
-                jobs.append(job)
+        job.title = text(first(posting, _LEVER_HEADING))
+
+        link = first(posting, _LEVER_LINK)
+        if link is not None:
+            job.url = link.get("href", "")
+            if not job.title:
+                job.title = text(link)
+
+        job.location = text(first(posting, _LEVER_LOCATION))
+
+        job.company = company_name
+
+        if not matches(job.title) or not keep(job):
+            continue
+
+        if job.title:
+            jobs.append(job)
 
+    return jobs
+
+
+async def _list_lever_board(board_url: str, company_name: str = "",
+                            title_filter: str = None, known: dict = None,
+                            api_only: bool = False) -> list[JobListing]:
+    """
+    Every matching posting on a Lever board; raises if the board can't be
+    read. api_only raises instead of falling back to the HTML page.
+    """
+    # Lever also has a JSON API
+    api_url = board_url.rstrip("/")
+    if "jobs.lever.co" in api_url:
+        company_slug = api_url.split("/")[-1].split("?")[0]
+        json_url = f"https://api.lever.co/v0/postings/{company_slug}"
+
+        resp = await get(json_url)
+        if resp.status_code == 200:
+            return _parse_lever_api(resp.json(), company_name or company_slug,
+                                    title_filter, known)
+        if api_only:
+            resp.raise_for_status()
+    if api_only:
+        raise ValueError(f"No Lever API listing for {board_url}")
+
+    # Fallback: HTML
+    resp = await get(board_url)
+    resp.raise_for_status()
+    return _parse_lever_html(resp.text, company_name, title_filter)
+
+
+async def scrape_lever_board_async(board_url: str, company_name: str = "",
+                                   title_filter: str = None) -> list[JobListing]:
+    """Async scrape_lever_board()."""
+    try:
+        return await _list_lever_board(board_url, company_name, title_filter)
     except Exception as e:
         print(f"Lever scraping error for {board_url}: {e}")
+        return []
 
-    return jobs
+
+def scrape_lever_board(board_url: str, company_name: str = "",
+                       title_filter: str = None) -> list[JobListing]:
+    """Scrape jobs from a Lever board."""
+    return run(scrape_lever_board_async(board_url, company_name, title_filter))
+
+
+async def crawl_board_async(board_url: str, company_name: str = "", title_filter: str = None,
+                            state: CrawlState = None) -> BoardDelta:
+    """
+    Crawl a Greenhouse or Lever board incrementally: only postings that are
+    new or changed since the last crawl are returned (with descriptions),
+    plus the ones that disappeared. Raises if the board can't be read, so a
+    failed fetch never looks like every posting was removed. Only the JSON
+    APIs are used: HTML listings have no job IDs or updated_at to match the
+    stored postings against, and a script-rendered page can list nothing.
+    """
+    state = state or get_crawl_state()
+    known = state.known(board_url)
+    if "greenhouse" in board_url:
+        jobs = await _list_greenhouse_board(board_url, company_name, title_filter, known,
+                                            api_only=True)
+    elif "lever" in board_url:
+        jobs = await _list_lever_board(board_url, company_name, title_filter, known,
+                                       api_only=True)
+    else:
+        raise ValueError(f"Not a Greenhouse or Lever board: {board_url}")
+    return state.update(board_url, jobs)
+
+
+def crawl_board(board_url: str, company_name: str = "", title_filter: str = None,
+                state: CrawlState = None) -> BoardDelta:
+    """Synchronous crawl_board_async()."""
+    return run(crawl_board_async(board_url, company_name, title_filter, state))
+
+
+def parse_greenhouse_description(html: str) -> str:
+    """The job description text on a Greenhouse job page ("" if not found)."""
+    root = parse_html(html, _GH_DESCRIPTION_MARKERS)
+    return text(first(root, *_GH_DESCRIPTION), separator="\n")
+
+
+def parse_lever_description(html: str) -> str:
+    """The job description text on a Lever job page ("" if not found)."""
+    root = parse_html(html, _LEVER_DESCRIPTION_MARKERS)
+    return text(first(root, *_LEVER_DESCRIPTION), separator="\n")
+
+
+def _board_path(url: str, host_suffix: str) -> list[str]:
+    """Path segments of a job board URL on host_suffix ([] for other hosts)."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host != host_suffix and not host.endswith("." + host_suffix):
+        return []
+    return [segment for segment in parts.path.split("/") if segment]
+
+
+def _greenhouse_slug(url: str) -> str:
+    """Board name from a Greenhouse job URL ("" if it isn't one)."""
+    path = _board_path(url, "greenhouse.io")
+    if path[:1] == ["embed"]:
+        # boards.greenhouse.io/embed/job_app?for=<board>&token=<id>
+        return parse_qs(urlsplit(url).query).get("for", [""])[0]
+    return path[0] if path else ""
 
 
 def fetch_greenhouse_description(job: JobListing) -> str:
     """Fetch job description from Greenhouse."""
+    if job.description:
+        return job.description  # already included by the board API
     if not job.url:
         return ""
 
     try:
-        # Try JSON API first if we have job ID
-        if job.job_id and "greenhouse" in job.source:
-            api_url = f"https://boards-api.greenhouse.io/v1/boards/*/jobs/{job.job_id}"
-            # We need the board name, try to extract from URL
-            pass
-
-        time.sleep(random.uniform(1, 2))
-        resp = requests.get(job.url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        desc = soup.find("div", id="content")
-        if not desc:
-            desc = soup.find("div", class_="job-post")
-        if desc:
-            job.description = desc.get_text(separator="\n", strip=True)
+        # JSON API when the board is known: no HTML to parse
+        slug = _greenhouse_slug(job.url)
+        if job.job_id and slug:
+            api_url = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs/{job.job_id}"
+            resp = http_client.get(api_url)
+            if resp.status_code == 200:
+                description = _greenhouse_description(resp.json())
+                if description:
+                    job.description = description
+                    return job.description
+
+        resp = http_client.get(job.url)
+        description = parse_greenhouse_description(resp.text)
+        if description:
+            job.description = description
             return job.description
 
     except Exception as e:
@@ -206,19 +384,27 @@ def fetch_greenhouse_description(job: JobListing) -> str:
 
 def fetch_lever_description(job: JobListing) -> str:
     """Fetch job description from Lever."""
+    if job.description:
+        return job.description  # already included by the postings API
     if not job.url:
         return ""
 
     try:
-        time.sleep(random.uniform(1, 2))
-        resp = requests.get(job.url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        desc = soup.find("div", class_="posting-page")
-        if not desc:
-            desc = soup.find("div", {"class": lambda x: x and "description" in str(x).lower()})
-        if desc:
-            job.description = desc.get_text(separator="\n", strip=True)
+        # jobs.lever.co/<company>/<posting id>: use the postings API
+        path = _board_path(job.url, "lever.co")
+        if len(path) >= 2:
+            api_url = f"https://api.lever.co/v0/postings/{path[0]}/{path[1]}"
+            resp = http_client.get(api_url)
+            if resp.status_code == 200:
+                description = _lever_description(resp.json())
+                if description:
+                    job.description = description
+                    return job.description
+
+        resp = http_client.get(job.url)
+        description = parse_lever_description(resp.text)
+        if description:
+            job.description = description
             return job.description
 
     except Exception as e:
@@ -229,7 +415,7 @@ def fetch_lever_description(job: JobListing) -> str:
 
 if __name__ == "__main__":
     print("Greenhouse/Lever scraper ready.")
-    print("Add company board URLs to DEFAULT_BOARDS or pass them directly.")
+    print("Register company boards in config/boards.yaml or pass them directly.")
     print("\nExample usage:")
     print('  scrape_greenhouse_board("https://boards.greenhouse.io/openai", "OpenAI", "ML,AI")')
     print('  scrape_lever_board("https://jobs.lever.co/anthropic", "Anthropic", "ML,AI")')
@@ -0,0 +1,220 @@
+"""
+HTTP Response Cache
+Persistent, size-bounded cache of GET responses, keyed by URL.
+
+A response younger than its source's TTL is served straight from disk,
+without touching the network or the rate limiter. Once stale, the cached
+ETag / Last-Modified go out as If-None-Match / If-Modified-Since, and a
+304 refreshes the entry instead of downloading the page again.
+
+Entries live in one SQLite file (bodies zlib-compressed). When the total
+size passes max_mb, the least recently used entries are evicted.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from scrapers.config import project_path, scraper_settings
+
+DEFAULT_CACHE = {
+    "enabled": True,
+    "path": "scrapers/http_cache.db",
+    "max_mb": 200,
+    "ttl_minutes": {"default": 60},
+}
+
+# Host suffix -> source name used for ttl_minutes
+SOURCE_HOSTS = {
+    "linkedin.com": "linkedin",
+    "indeed.com": "indeed",
+    "greenhouse.io": "greenhouse",
+    "lever.co": "lever",
+    "google.com": "google",
+}
+
+# Headers that describe the wire encoding, not the decoded body we keep
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+def source_for(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    for suffix, source in SOURCE_HOSTS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return source
+    return "default"
+
+
+class HTTPCache:
+    """URL -> last good response, with conditional revalidation."""
+
+    def __init__(self, path: str, max_bytes: int, ttls: dict = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {"default": 60, **(ttls or {})}
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl(self, url: str) -> float:
+        """Freshness lifetime for url, in seconds."""
+        return self.ttls.get(source_for(url), self.ttls["default"]) * 60
+
+    def _row(self, url: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT status, headers, body, etag, last_modified, fetched_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+    def _touch(self, url: str, now: float, refetched: bool = False):
+        with self._lock:
+            if refetched:
+                self._conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? "
+                                   "WHERE url = ?", (now, now, url))
+            else:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?",
+                                   (now, url))
+
+    @staticmethod
+    def _response(url: str, row) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = row[0]
+        resp.headers = CaseInsensitiveDict(json.loads(row[1]))
+        resp._content = zlib.decompress(row[2])
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = url
+        resp.from_cache = True
+        return resp
+
+    def lookup(self, url: str, now: float = None):
+        """The cached response if still fresh, else None."""
+        now = time.time() if now is None else now
+        row = self._row(url)
+        if row is None or now - row[5] >= self.ttl(url):
+            return None
+        self._touch(url, now)
+        self.stats["hits"] += 1
+        return self._response(url, row)
+
+    def validators(self, url: str) -> dict:
+        """Conditional request headers for a stale entry ({} if none)."""
+        row = self._row(url)
+        if row is None:
+            return {}
+        headers = {}
+        if row[3]:
+            headers["If-None-Match"] = row[3]
+        if row[4]:
+            headers["If-Modified-Since"] = row[4]
+        return headers
+
+    def not_modified(self, url: str, now: float = None):
+        """Handle a 304: refresh the entry and return the cached response."""
+        now = time.time() if now is None else now
+        row = self._row(url)
+        if row is None:
+            return None
+        self._touch(url, now, refetched=True)
+        self.stats["revalidated"] += 1
+        return self._response(url, row)
+
+    def store(self, url: str, resp: requests.Response, now: float = None):
+        """Cache a 200 response unless the server forbids it."""
+        self.stats["misses"] += 1
+        if resp.status_code != 200 or "no-store" in resp.headers.get("Cache-Control", ""):
+            return
+        now = time.time() if now is None else now
+        headers = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+        body = zlib.compress(resp.content, 6)
+        header_text = json.dumps(headers)
+        size = len(body) + len(header_text) + len(url)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, resp.status_code, header_text, body, resp.headers.get("ETag"),
+                 resp.headers.get("Last-Modified"), now, now, size)
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (lock held)."""
+        # Evict down to 90% so a full cache doesn't evict on every store
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        victims = []
+        for url, size in rows:
+            if self._size <= target:
+                break
+            victims.append((url,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_enabled = True  # set_enabled(False) bypasses the cache whatever settings.yaml says
+
+
+def get_cache():
+    """The process-wide cache from scrapers.cache in settings.yaml (None if disabled)."""
+    global _cache
+    with _cache_lock:
+        if not _enabled:
+            return None
+        if _cache is None:
+            settings = {**DEFAULT_CACHE, **(scraper_settings().get("cache") or {})}
+            if not settings["enabled"]:
+                return None
+            _cache = HTTPCache(project_path(settings["path"]),
+                               int(settings["max_mb"] * 1024 * 1024), settings["ttl_minutes"])
+        return _cache
+
+
+def set_enabled(enabled: bool):
+    """Turn the cache off (or back on) for this process."""
+    global _enabled
+    with _cache_lock:
+        _enabled = enabled
@@ -0,0 +1,153 @@
+"""
+Shared HTTP Client
+One requests.Session for every scraper and the JD fetcher.
+
+The session keeps a keep-alive connection pool per host, so fetching 200
+descriptions from one board reuses a handful of TCP/TLS connections
+instead of opening 200. Pool sizes and timeouts come from scrapers.http in
+settings.yaml. Responses are gzip/deflate compressed, plus brotli when the
+`brotli` package is installed (urllib3 decodes all of them transparently).
+
+Plain GETs go through the on-disk cache in scrapers/http_cache.py: fresh
+hits skip the network and the rate limiter, stale entries are revalidated
+with conditional requests. Network requests are retried and guarded by
+the per-source circuit breakers in scrapers/resilience.py.
+
+set_transport() swaps the connection adapter, e.g. for the record/replay
+transports in scrapers/replay.py.
+"""
+
+import itertools
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+from scrapers.config import scraper_settings
+from scrapers.http_cache import get_cache
+from scrapers.ratelimit import get_limiter
+from scrapers.resilience import get_resilience
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                   "AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    # "gzip, deflate", plus "br" when brotli is available to decode it
+    "Accept-Encoding": DEFAULT_ACCEPT_ENCODING,
+}
+
+DEFAULT_HTTP = {
+    "timeout": 15,          # seconds to wait for the response
+    "connect_timeout": 5,   # seconds to establish a connection
+    "pool_connections": 32, # hosts with a cached connection pool
+    "pool_maxsize": 8,      # keep-alive connections per host
+}
+
+_session = None
+_session_lock = threading.Lock()
+_transport = None  # adapter mounted instead of the pooled HTTPAdapter
+
+
+def http_settings() -> dict:
+    return {**DEFAULT_HTTP, **(scraper_settings().get("http") or {})}
+
+
+def session() -> requests.Session:
+    """The process-wide pooled session (thread-safe to share)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            settings = http_settings()
+            _session = requests.Session()
+            _session.headers.update(HEADERS)
+            adapter = _transport or HTTPAdapter(pool_connections=settings["pool_connections"],
+                                                pool_maxsize=settings["pool_maxsize"])
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def set_transport(adapter):
+    """Send every request through adapter (None restores the pooled HTTPAdapter)."""
+    global _transport
+    close()
+    with _session_lock:
+        _transport = adapter
+
+
+def from_cache(url: str, **kwargs):
+    """A fresh cached response for a plain GET of url, else None."""
+    cache = None if kwargs else get_cache()
+    return cache.lookup(url) if cache is not None else None
+
+
+def fetch(url: str, headers: dict = None, timeout=None, **kwargs) -> requests.Response:
+    """GET url on the shared session, without rate limiting.
+
+    Plain GETs (no extra kwargs) are revalidated against and stored in the
+    HTTP cache; a 304 comes back as the cached 200 response.
+    """
+    if timeout is None:
+        settings = http_settings()
+        timeout = (settings["connect_timeout"], settings["timeout"])
+    cache = None if kwargs else get_cache()
+    conditional = cache.validators(url) if cache is not None else {}
+    if conditional:
+        headers = {**conditional, **(headers or {})}
+
+    resp = session().get(url, headers=headers, timeout=timeout, **kwargs)
+
+    if cache is not None:
+        if resp.status_code == 304 and conditional:
+            cached = cache.not_modified(url)
+            if cached is not None:
+                return cached
+        cache.store(url, resp)
+    return resp
+
+
+def get(url: str, headers: dict = None, timeout=None, **kwargs) -> requests.Response:
+    """GET url from the cache, or once its host's rate limit allows.
+
+    Failures are retried with backoff; raises SourceUnavailable without a
+    request while url's source is blocked.
+    """
+    resp = from_cache(url, **kwargs)
+    if resp is not None:
+        return resp
+    guard = get_resilience()
+    for attempt in itertools.count():
+        # Fail fast before queueing on the limiter, then recheck: the
+        # source may have been blocked while we waited
+        guard.check(url, admit=False)
+        get_limiter().acquire(url)
+        guard.check(url)
+        started = time.monotonic()
+        try:
+            resp = fetch(url, headers=headers, timeout=timeout, **kwargs)
+        except Exception as e:
+            delay = guard.record(url, attempt, time.monotonic() - started, error=e)
+            if delay is None:
+                raise
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt): free a claimed probe
+            guard.release(url)
+            raise
+        else:
+            delay = guard.record(url, attempt, time.monotonic() - started, resp=resp)
+            if delay is None:
+                return resp
+        time.sleep(delay)
+
+
+def close():
+    """Drop pooled connections (the next request opens a new session)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -1,17 +1,138 @@
 """
 Indeed Job Scraper
 Scrapes job listings from Indeed's public search.
+Result pages are fetched concurrently, paced by the per-host rate limiter,
+and parsed with lxml using the precompiled selectors below. Registered as
+the "indeed" search source; listings stream out page by page.
 """
 
-import time
-import random
 from dataclasses import asdict
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
+from scrapers import http_client
+from scrapers.engine import get, in_order, run
+from scrapers.extract import class_contains, first, has_class, parse_html, text, xpath
+from scrapers.linkedin_scraper import JobListing
+from scrapers.sources import SearchSource, register
+
+# Search result cards, newest layout first
+_CARDS = (
+    xpath(f"//div[{has_class('job_seen_beacon')}]"),
+    xpath(f"//div[{class_contains('cardOutline')}]"),
+    xpath(f"//td[{has_class('resultContent')}]"),
+)
+_CARD_MARKERS = ("job_seen_beacon", "cardOutline", "resultContent")
+_CARD_TITLE = (
+    xpath(f".//h2[{has_class('jobTitle')}]"),
+    xpath(f".//a[{class_contains('Title')}]"),
+)
+_CARD_LINK = xpath(".//a")
+_CARD_COMPANY = (
+    xpath(".//span[@data-testid='company-name']"),
+    xpath(f".//span[{has_class('companyName')}]"),
+)
+_CARD_LOCATION = (
+    xpath(".//div[@data-testid='text-location']"),
+    xpath(f".//div[{has_class('companyLocation')}]"),
+)
+
+# Job page description containers
+_DESCRIPTION = (
+    xpath("//div[@id='jobDescriptionText']"),
+    xpath(f"//div[{class_contains('Description')}]"),
+)
+# No bare "Description" marker: it also matches the page <title> ("... Job
+# Description") in the <head>; pages without jobDescriptionText are parsed whole
+_DESCRIPTION_MARKERS = ("jobDescriptionText",)
+
+
+def _search_url(query: str, location: str, start: int) -> str:
+    return (
+        f"https://www.indeed.com/jobs"
+        f"?q={quote_plus(query)}"
+        f"&l={quote_plus(location)}"
+        f"&fromage=7"  # Past week
+        f"&start={start}"
+    )
+
+
+def parse_search_page(html: str) -> list[JobListing]:
+    """Job cards on one Indeed search results page."""
+    root = parse_html(html, _CARD_MARKERS)
+
+    # Indeed job cards
+    cards = []
+    for selector in _CARDS:
+        cards = selector(root)
+        if cards:
+            break
 
-from scrapers.linkedin_scraper import JobListing, HEADERS
+    jobs = []
+    for card in cards:
+        job = JobListing(source="indeed")
+
+        # Title
+        title_elem = first(card, *_CARD_TITLE)
+        if title_elem is not None:
+            job.title = text(title_elem)
+            link = first(title_elem, _CARD_LINK)
+            if link is not None:
+                href = link.get("href", "")
+                if href.startswith("/"):
+                    job.url = f"https://www.indeed.com{href}"
+                else:
+                    job.url = href
+                # Extract job ID
+                if "jk=" in job.url:
+                    job.job_id = job.url.split("jk=")[-1].split("&")[0]
+
+        job.company = text(first(card, *_CARD_COMPANY))
+        job.location = text(first(card, *_CARD_LOCATION))
+
+        if job.title and job.company:
+            jobs.append(job)
+
+    return jobs
+
+
+async def stream_indeed_jobs(
+    query: str = "AI Engineer",
+    location: str = "United States",
+    max_results: int = 25
+):
+    """
+    Yield Indeed listings page by page. All result pages are requested at
+    once; each page's listings are yielded as soon as it (and the pages
+    before it) has arrived.
+    """
+    urls = [_search_url(query, location, start) for start in range(0, max_results, 10)]
+    remaining, errors = max_results, []
+    async for page in in_order(get(url) for url in urls):
+        # A failed page (already retried) is skipped; the other pages still count
+        if isinstance(page, Exception):
+            errors.append(str(page))
+            continue
+        if page.status_code != 200:
+            errors.append(f"HTTP {page.status_code}")
+            continue
+        cards = parse_search_page(page.text)[:remaining]
+        for job in cards:
+            yield job
+        remaining -= len(cards)
+        if not remaining:
+            break
+
+    if errors:
+        print(f"Indeed: {len(errors)} of {len(urls)} pages failed ({errors[0]})")
+
+
+async def scrape_indeed_jobs_async(
+    query: str = "AI Engineer",
+    location: str = "United States",
+    max_results: int = 25
+) -> list[JobListing]:
+    """Async scrape_indeed_jobs(): all result pages are requested at once."""
+    return [job async for job in stream_indeed_jobs(query, location, max_results)]
 
 
 def scrape_indeed_jobs(
@@ -20,86 +141,13 @@ def scrape_indeed_jobs(
     max_results: int = 25
 ) -> list[JobListing]:
     """Scrape Indeed public job listings."""
-    jobs = []
-
-    for start in range(0, max_results, 10):
-        encoded_query = quote_plus(query)
-        encoded_location = quote_plus(location)
-
-        url = (
-            f"https://www.indeed.com/jobs"
-            f"?q={encoded_query}"
-            f"&l={encoded_location}"
-            f"&fromage=7"  # Past week
-            f"&start={start}"
-        )
-
-        try:
-            time.sleep(random.uniform(2, 5))
-            resp = requests.get(url, headers=HEADERS, timeout=15)
-
-            if resp.status_code != 200:
-                print(f"Indeed returned {resp.status_code}")
-                break
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            # Indeed job cards
-            cards = soup.find_all("div", class_="job_seen_beacon")
-            if not cards:
-                cards = soup.find_all("div", {"class": lambda x: x and "cardOutline" in x})
-            if not cards:
-                # Try alternative selectors
-                cards = soup.find_all("td", {"class": "resultContent"})
-
-            for card in cards:
-                job = JobListing(source="indeed")
-
-                # Title
-                title_elem = card.find("h2", class_="jobTitle")
-                if not title_elem:
-                    title_elem = card.find("a", {"class": lambda x: x and "Title" in str(x)})
-                if title_elem:
-                    job.title = title_elem.get_text(strip=True)
-                    link = title_elem.find("a")
-                    if link:
-                        href = link.get("href", "")
-                        if href.startswith("/"):
-                            job.url = f"https://www.indeed.com{href}"
-                        else:
-                            job.url = href
-                        # Extract job ID
-                        if "jk=" in job.url:
-                            job.job_id = job.url.split("jk=")[-1].split("&")[0]
-
-                # Company
-                company_elem = card.find("span", {"data-testid": "company-name"})
-                if not company_elem:
-                    company_elem = card.find("span", class_="companyName")
-                if company_elem:
-                    job.company = company_elem.get_text(strip=True)
-
-                # Location
-                loc_elem = card.find("div", {"data-testid": "text-location"})
-                if not loc_elem:
-                    loc_elem = card.find("div", class_="companyLocation")
-                if loc_elem:
-                    job.location = loc_elem.get_text(strip=True)
-
-                if job.title and job.company:
-                    jobs.append(job)
-
-                if len(jobs) >= max_results:
-                    break
-
-        except Exception as e:
-            print(f"Indeed scraping error: {e}")
-            break
+    return run(scrape_indeed_jobs_async(query, location, max_results))
 
-        if len(jobs) >= max_results:
-            break
 
-    return jobs[:max_results]
+def parse_description(html: str) -> str:
+    """The job description text on an Indeed job page ("" if not found)."""
+    root = parse_html(html, _DESCRIPTION_MARKERS)
+    return text(first(root, *_DESCRIPTION), separator="\n")
 
 
 def fetch_indeed_description(job: JobListing) -> str:
@@ -108,16 +156,10 @@ def fetch_indeed_description(job: JobListing) -> str:
         return ""
 
     try:
-        time.sleep(random.uniform(1, 3))
-        resp = requests.get(job.url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        desc = soup.find("div", id="jobDescriptionText")
-        if not desc:
-            desc = soup.find("div", {"class": lambda x: x and "Description" in str(x)})
-
-        if desc:
-            job.description = desc.get_text(separator="\n", strip=True)
+        resp = http_client.get(job.url)
+        description = parse_description(resp.text)
+        if description:
+            job.description = description
             return job.description
 
     except Exception as e:
@@ -126,6 +168,9 @@ def fetch_indeed_description(job: JobListing) -> str:
     return ""
 
 
+register(SearchSource("indeed", stream_indeed_jobs, "Indeed public job search"))
+
+
 if __name__ == "__main__":
     print("Searching Indeed for AI Engineer jobs...")
     results = scrape_indeed_jobs("AI ML Engineer", "United States", max_results=5)
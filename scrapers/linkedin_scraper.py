@@ -2,17 +2,20 @@
 LinkedIn Job Scraper
 Uses LinkedIn's public job search (no login required, read-only, safe).
 Falls back to Google search if LinkedIn blocks direct access.
+Result pages are fetched concurrently, paced by the per-host rate limiter,
+and parsed with lxml using the precompiled selectors below. Registered as
+the "linkedin" search source; listings stream out page by page.
 """
 
-import time
-import random
 import json
 from dataclasses import dataclass, field, asdict
 from typing import Optional
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
+from scrapers import http_client
+from scrapers.engine import get, in_order, run
+from scrapers.extract import first, has_class, parse_html, text, xpath
+from scrapers.sources import SearchSource, register
 
 
 @dataclass
@@ -26,18 +29,133 @@ class JobListing:
     date_posted: str = ""
     source: str = "linkedin"
     job_id: str = ""
+    updated_at: str = ""  # last change reported by the source, if any
 
     def to_dict(self):
         return asdict(self)
 
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                   "AppleWebKit/537.36 (KHTML, like Gecko) "
-                   "Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-}
+# Search result cards
+_CARDS = xpath(f"//div[{has_class('base-card')}]")
+_CARDS_OLD = xpath(f"//li[{has_class('result-card')}]")
+_CARD_TITLE = xpath(f".//h3[{has_class('base-search-card__title')}]")
+_CARD_COMPANY = xpath(f".//h4[{has_class('base-search-card__subtitle')}]")
+_CARD_LOCATION = xpath(f".//span[{has_class('job-search-card__location')}]")
+_CARD_LINK = xpath(f".//a[{has_class('base-card__full-link')}]")
+_CARD_TIME = xpath(".//time")
+_CARD_MARKERS = ("base-card", "result-card")
+
+# Google fallback results
+_GOOGLE_RESULTS = xpath(f"//div[{has_class('g')}]")
+_GOOGLE_LINK = xpath(".//a")
+_GOOGLE_TITLE = xpath(".//h3")
+
+# Job page description containers, in order of preference
+_DESCRIPTION = (
+    xpath(f"//div[{has_class('show-more-less-html__markup')}]"),
+    xpath(f"//div[{has_class('description__text')}]"),
+    xpath(f"//section[{has_class('description')}]"),
+)
+# Markers must not match the <head>: a bare "description" would find
+# <meta name="description"> and start the parse at the top of the page
+_DESCRIPTION_MARKERS = ("show-more-less-html__markup", "description__text", 'class="description')
+
+
+def _search_url(query: str, location: str, start: int, experience_level: str = None) -> str:
+    # LinkedIn public job search URL
+    # f_E=3,4 = mid-senior level, f_TPR=r604800 = past week
+    exp_filter = ""
+    if experience_level == "mid":
+        exp_filter = "&f_E=3,4"
+    elif experience_level == "senior":
+        exp_filter = "&f_E=4,5"
+
+    return (
+        f"https://www.linkedin.com/jobs/search/"
+        f"?keywords={quote_plus(query)}"
+        f"&location={quote_plus(location)}"
+        f"&f_TPR=r604800"  # past week
+        f"{exp_filter}"
+        f"&start={start}"
+    )
+
+
+def parse_search_page(html: str) -> list[JobListing]:
+    """Job cards on one LinkedIn search results page."""
+    root = parse_html(html, _CARD_MARKERS)
+
+    # LinkedIn public job cards
+    cards = _CARDS(root) or _CARDS_OLD(root)
+
+    jobs = []
+    for card in cards:
+        job = JobListing(source="linkedin")
+
+        job.title = text(first(card, _CARD_TITLE))
+        job.company = text(first(card, _CARD_COMPANY))
+        job.location = text(first(card, _CARD_LOCATION))
+
+        link_elem = first(card, _CARD_LINK)
+        if link_elem is not None:
+            job.url = link_elem.get("href", "").split("?")[0]
+            # Extract job ID from URL
+            if "/view/" in job.url:
+                job.job_id = job.url.split("/view/")[-1].rstrip("/")
+
+        date_elem = first(card, _CARD_TIME)
+        if date_elem is not None:
+            job.date_posted = date_elem.get("datetime", "")
+
+        if job.title and job.company:
+            jobs.append(job)
+
+    return jobs
+
+
+async def stream_linkedin_jobs(
+    query: str = "AI Engineer",
+    location: str = "United States",
+    max_results: int = 25,
+    experience_level: str = None
+):
+    """
+    Yield LinkedIn listings page by page. All result pages are requested
+    at once; each page's listings are yielded as soon as it (and the pages
+    before it) has arrived.
+    """
+    urls = [_search_url(query, location, start, experience_level)
+            for start in range(0, max_results, 25)]
+    remaining = max_results
+    async for page in in_order(get(url) for url in urls):
+        if isinstance(page, Exception):
+            print(f"LinkedIn scraping error: {page}, trying alternative method...")
+        elif page.status_code != 200:
+            print(f"LinkedIn returned {page.status_code} after retries, trying alternative method...")
+        else:
+            cards = parse_search_page(page.text)
+            if cards:
+                for job in cards[:remaining]:
+                    yield job
+                remaining -= min(len(cards), remaining)
+                if not remaining:
+                    return
+                continue
+            print("No job cards found. LinkedIn may have changed layout.")
+
+        for job in await _scrape_via_google_async(query, location, remaining):
+            yield job
+        return
+
+
+async def scrape_linkedin_jobs_async(
+    query: str = "AI Engineer",
+    location: str = "United States",
+    max_results: int = 25,
+    experience_level: str = None
+) -> list[JobListing]:
+    """Async scrape_linkedin_jobs(): all result pages are requested at once."""
+    return [job async for job in stream_linkedin_jobs(query, location, max_results,
+                                                      experience_level)]
 
 
 def scrape_linkedin_jobs(
@@ -50,134 +168,63 @@ def scrape_linkedin_jobs(
     Scrape LinkedIn public job listings (no login).
     Uses LinkedIn's guest job search API.
     """
+    return run(scrape_linkedin_jobs_async(query, location, max_results, experience_level))
+
+
+def _parse_google_results(html: str, max_results: int) -> list[JobListing]:
     jobs = []
-    encoded_query = quote_plus(query)
-    encoded_location = quote_plus(location)
+    root = parse_html(html)
 
-    # LinkedIn public job search URL
-    # f_E=3,4 = mid-senior level, f_TPR=r604800 = past week
-    exp_filter = ""
-    if experience_level == "mid":
-        exp_filter = "&f_E=3,4"
-    elif experience_level == "senior":
-        exp_filter = "&f_E=4,5"
+    for result in _GOOGLE_RESULTS(root):
+        link = first(result, _GOOGLE_LINK)
+        if link is None or "linkedin.com/jobs" not in link.get("href", ""):
+            continue
 
-    for start in range(0, max_results, 25):
-        url = (
-            f"https://www.linkedin.com/jobs/search/"
-            f"?keywords={encoded_query}"
-            f"&location={encoded_location}"
-            f"&f_TPR=r604800"  # past week
-            f"{exp_filter}"
-            f"&start={start}"
-        )
-
-        try:
-            time.sleep(random.uniform(2, 5))  # Be respectful
-            resp = requests.get(url, headers=HEADERS, timeout=15)
-
-            if resp.status_code != 200:
-                print(f"LinkedIn returned {resp.status_code}, trying alternative method...")
-                jobs.extend(_scrape_via_google(query, location, max_results))
-                break
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            # LinkedIn public job cards
-            cards = soup.find_all("div", class_="base-card")
-            if not cards:
-                cards = soup.find_all("li", class_="result-card")
-
-            if not cards:
-                print("No job cards found. LinkedIn may have changed layout.")
-                jobs.extend(_scrape_via_google(query, location, max_results - len(jobs)))
-                break
-
-            for card in cards:
-                job = JobListing(source="linkedin")
-
-                title_elem = card.find("h3", class_="base-search-card__title")
-                if title_elem:
-                    job.title = title_elem.get_text(strip=True)
-
-                company_elem = card.find("h4", class_="base-search-card__subtitle")
-                if company_elem:
-                    job.company = company_elem.get_text(strip=True)
-
-                loc_elem = card.find("span", class_="job-search-card__location")
-                if loc_elem:
-                    job.location = loc_elem.get_text(strip=True)
-
-                link_elem = card.find("a", class_="base-card__full-link")
-                if link_elem:
-                    job.url = link_elem.get("href", "").split("?")[0]
-                    # Extract job ID from URL
-                    if "/view/" in job.url:
-                        job.job_id = job.url.split("/view/")[-1].rstrip("/")
-
-                date_elem = card.find("time")
-                if date_elem:
-                    job.date_posted = date_elem.get("datetime", "")
-
-                if job.title and job.company:
-                    jobs.append(job)
-
-                if len(jobs) >= max_results:
-                    break
-
-        except Exception as e:
-            print(f"LinkedIn scraping error: {e}")
-            jobs.extend(_scrape_via_google(query, location, max_results - len(jobs)))
-            break
+        job = JobListing(source="linkedin_via_google")
+        job.url = link.get("href", "")
+
+        heading = text(first(result, _GOOGLE_TITLE))
+        if heading:
+            # Parse "Title - Company | LinkedIn" format
+            parts = heading.replace(" | LinkedIn", "").split(" - ", 1)
+            if len(parts) == 2:
+                job.title = parts[0].strip()
+                job.company = parts[1].strip()
+            else:
+                job.title = heading
+
+        if job.title:
+            jobs.append(job)
 
         if len(jobs) >= max_results:
             break
 
-    return jobs[:max_results]
+    return jobs
 
 
-def _scrape_via_google(query: str, location: str, max_results: int) -> list[JobListing]:
+async def _scrape_via_google_async(query: str, location: str, max_results: int) -> list[JobListing]:
     """
     Fallback: search Google for LinkedIn job postings.
     """
-    jobs = []
     search_query = f"site:linkedin.com/jobs/view {query} {location}"
     url = f"https://www.google.com/search?q={quote_plus(search_query)}&num={min(max_results, 20)}"
 
     try:
-        time.sleep(random.uniform(1, 3))
-        resp = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        for result in soup.find_all("div", class_="g"):
-            link = result.find("a")
-            if not link or "linkedin.com/jobs" not in link.get("href", ""):
-                continue
-
-            job = JobListing(source="linkedin_via_google")
-            job.url = link.get("href", "")
-
-            title_elem = result.find("h3")
-            if title_elem:
-                text = title_elem.get_text(strip=True)
-                # Parse "Title - Company | LinkedIn" format
-                parts = text.replace(" | LinkedIn", "").split(" - ", 1)
-                if len(parts) == 2:
-                    job.title = parts[0].strip()
-                    job.company = parts[1].strip()
-                else:
-                    job.title = text
+        resp = await get(url)
+        return _parse_google_results(resp.text, max_results)
+    except Exception as e:
+        print(f"Google fallback error: {e}")
+        return []
 
-            if job.title:
-                jobs.append(job)
 
-            if len(jobs) >= max_results:
-                break
+def _scrape_via_google(query: str, location: str, max_results: int) -> list[JobListing]:
+    return run(_scrape_via_google_async(query, location, max_results))
 
-    except Exception as e:
-        print(f"Google fallback error: {e}")
 
-    return jobs
+def parse_description(html: str) -> str:
+    """The job description text on a LinkedIn job page ("" if not found)."""
+    root = parse_html(html, _DESCRIPTION_MARKERS)
+    return text(first(root, *_DESCRIPTION), separator="\n")
 
 
 def fetch_job_description(job: JobListing) -> str:
@@ -186,19 +233,10 @@ def fetch_job_description(job: JobListing) -> str:
         return ""
 
     try:
-        time.sleep(random.uniform(1, 3))
-        resp = requests.get(job.url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # LinkedIn job description containers
-        desc = soup.find("div", class_="show-more-less-html__markup")
-        if not desc:
-            desc = soup.find("div", class_="description__text")
-        if not desc:
-            desc = soup.find("section", class_="description")
-
-        if desc:
-            job.description = desc.get_text(separator="\n", strip=True)
+        resp = http_client.get(job.url)
+        description = parse_description(resp.text)
+        if description:
+            job.description = description
             return job.description
 
     except Exception as e:
@@ -207,6 +245,9 @@ def fetch_job_description(job: JobListing) -> str:
     return ""
 
 
+register(SearchSource("linkedin", stream_linkedin_jobs, "LinkedIn public job search"))
+
+
 if __name__ == "__main__":
     print("Searching LinkedIn for AI Engineer jobs...")
     results = scrape_linkedin_jobs("AI ML Engineer", "United States", max_results=5)
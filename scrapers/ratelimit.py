@@ -0,0 +1,100 @@
+"""
+Per-host Rate Limiting
+Token buckets keyed by host. Each site gets its own request rate, so
+scrapers stay polite without global sleeps: a request to Indeed never
+waits on LinkedIn's limit.
+
+Buckets hand out reservations: taking a token returns how long to wait
+before using it, so the same bucket works from threads (acquire) and
+from asyncio tasks (acquire_async).
+"""
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+from scrapers.config import scraper_settings
+
+# Requests per second and burst size for hosts without their own entry
+DEFAULT_LIMIT = {"rate": 0.5, "burst": 2}
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # Negative tokens are reservations queued behind earlier callers
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class HostLimiter:
+    """One TokenBucket per host, configured from {host: {rate, burst}}."""
+
+    def __init__(self, limits: dict = None):
+        limits = dict(limits or {})
+        self.default = {**DEFAULT_LIMIT, **limits.pop("default", {})}
+        self.limits = limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = (urlsplit(url).hostname or url).lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limit = {**self.default, **self.limits.get(host, {})}
+                bucket = self._buckets[host] = TokenBucket(limit["rate"], limit["burst"])
+            return bucket
+
+    def acquire(self, url: str):
+        """Block until a request to url's host is allowed."""
+        self.bucket(url).acquire()
+
+    async def acquire_async(self, url: str):
+        await self.bucket(url).acquire_async()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> HostLimiter:
+    """The process-wide limiter, from scrapers.rate_limits in settings.yaml."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = HostLimiter(scraper_settings().get("rate_limits"))
+        return _limiter
+
+
+def set_limiter(limiter: HostLimiter = None):
+    """Replace the process-wide limiter (None reloads it from settings.yaml)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
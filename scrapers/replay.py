@@ -0,0 +1,213 @@
+"""
+Record & Replay
+Saves real responses (status, headers, body) into a fixture store and
+serves them back, so every scraper can run offline against recorded
+pages.
+
+Both modes are transports on the shared session in scrapers/http_client.py,
+so the scrapers, the description fetcher and the board crawler use them
+without changes:
+
+  record   real requests, each response also written to the store
+  replay   no network: responses come from the store. A URL that was
+           never recorded gets a 404 (not retried, and no circuit breaker
+           trips) and is listed in ReplayAdapter.missing
+
+The store is a directory holding responses.json ({url: status, reason,
+headers, body file}) and a bodies/ directory. Body files are named by
+content hash, so pages recorded under many URLs are stored once. Bodies
+are written as they arrive; the index is written by save(), which
+uninstall() (or process exit) calls once for a recording.
+
+    python main.py --record benchmarks/fixtures/recorded scrape
+    python main.py --replay benchmarks/fixtures/recorded scrape
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from scrapers import http_cache, http_client, ratelimit
+from scrapers.config import project_path
+from scrapers.http_cache import source_for
+
+INDEX = "responses.json"
+
+# Headers that describe the wire encoding, not the decoded body we keep
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection",
+                 "set-cookie"}
+
+# Body file extension by content type
+_EXTENSIONS = {"application/json": ".json", "text/html": ".html", "text/plain": ".txt"}
+
+
+class FixtureStore:
+    """Recorded responses in a directory, keyed by URL."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        index = os.path.join(path, INDEX)
+        if os.path.exists(index):
+            with open(index) as f:
+                self._entries = json.load(f)
+        else:
+            self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def urls(self) -> list[str]:
+        return list(self._entries)
+
+    def entry(self, url: str):
+        return self._entries.get(url)
+
+    def add(self, url: str, status: int, headers: dict, body: bytes, reason: str = ""):
+        """Store a response (replacing any earlier one for url)."""
+        content_type = CaseInsensitiveDict(headers).get("Content-Type") or ""
+        extension = _EXTENSIONS.get(content_type.split(";")[0].strip(), ".bin")
+        name = f"bodies/{source_for(url)}-{hashlib.sha256(body).hexdigest()[:16]}{extension}"
+        entry = {
+            "status": status,
+            "reason": reason,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+            "body": name,
+        }
+        with self._lock:
+            body_path = os.path.join(self.path, name)
+            if not os.path.exists(body_path):
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                with open(body_path, "wb") as f:
+                    f.write(body)
+            self._entries[url] = entry
+            self._dirty = True
+
+    def record(self, resp: requests.Response):
+        self.add(resp.url, resp.status_code, dict(resp.headers), resp.content, resp.reason or "")
+
+    def body(self, url: str) -> bytes:
+        with open(os.path.join(self.path, self._entries[url]["body"]), "rb") as f:
+            return f.read()
+
+    def response(self, url: str, request: requests.PreparedRequest = None):
+        """The recorded response for url as a requests.Response, or None."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.reason = entry.get("reason", "")
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp._content = self.body(url)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = url
+        resp.request = request
+        return resp
+
+    def save(self):
+        """Write the index if responses were added since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            tmp = os.path.join(self.path, INDEX + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, os.path.join(self.path, INDEX))
+            self._dirty = False
+
+
+class RecordingAdapter(HTTPAdapter):
+    """A normal transport that also saves every response it receives."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        if request.method == "GET":
+            self.store.record(resp)
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses from a FixtureStore; never touches the network."""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+        self.served = []   # URLs answered from the store, in order
+        self.missing = []  # URLs that were never recorded (answered 404)
+
+    def send(self, request, **kwargs):
+        resp = self.store.response(request.url, request)
+        if resp is None:
+            self.missing.append(request.url)
+            resp = requests.Response()
+            resp.status_code, resp.reason = 404, "Not Recorded"
+            resp._content = b""
+            resp.url, resp.request = request.url, request
+            return resp
+        self.served.append(request.url)
+        return resp
+
+    def close(self):
+        pass
+
+
+_store = None  # the store behind the installed transport
+
+
+def install(mode: str, path: str):
+    """
+    Route the shared session through a recording or replay transport.
+    The HTTP cache is bypassed in both modes (a cached page would never be
+    recorded, or would hide the replayed one), and replay also lifts the
+    per-host rate limits. Returns the adapter.
+    """
+    global _store
+    uninstall()
+    store = FixtureStore(project_path(path))
+    if mode == "record":
+        settings = http_client.http_settings()
+        adapter = RecordingAdapter(store, pool_connections=settings["pool_connections"],
+                                   pool_maxsize=settings["pool_maxsize"])
+        # main.py never uninstalls: the recording is saved on exit
+        atexit.register(store.save)
+    elif mode == "replay":
+        adapter = ReplayAdapter(store)
+        ratelimit.set_limiter(ratelimit.HostLimiter({"default": {"rate": 1e9, "burst": 10**9}}))
+    else:
+        raise ValueError(f"mode must be 'record' or 'replay', got {mode!r}")
+    http_cache.set_enabled(False)
+    http_client.set_transport(adapter)
+    _store = store
+    return adapter
+
+
+def uninstall():
+    """
+    Back to the network (with the cache and limits from settings.yaml),
+    saving what was recorded.
+    """
+    global _store
+    if _store is not None:
+        _store.save()
+        atexit.unregister(_store.save)
+        _store = None
+    http_client.set_transport(None)
+    http_cache.set_enabled(True)
+    ratelimit.set_limiter(None)
@@ -0,0 +1,300 @@
+"""
+Source Resilience
+Retries, backoff and a circuit breaker per scraping source, plus health
+metrics for each.
+
+A failed request (network error, timeout, 429 or 5xx) is retried with
+exponential backoff and full jitter. A 429 or 503 with a Retry-After
+header waits as long as the server asks, unless that is longer than
+scrapers.retry.max_retry_after, in which case the source's breaker opens
+instead of the request sleeping.
+
+Each source (LinkedIn, Indeed, Google, a board host, ...) has a breaker.
+After `failure_threshold` consecutive failures, including any 403, it
+opens: requests to the source fail immediately with SourceUnavailable
+instead of waiting on a blocked site. After the cooldown one probe
+request is let through. If it succeeds the breaker closes; if it fails
+the breaker reopens for twice as long (up to max_cooldown_seconds). A
+probe that is cancelled gives its slot back, and one that has not
+reported within probe_timeout seconds is replaced by a new probe.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from scrapers.config import scraper_settings
+from scrapers.http_cache import source_for
+
+DEFAULT_RETRY = {
+    "max_attempts": 3,             # tries per request, including the first
+    "base_delay": 1.0,             # seconds; doubles on every retry
+    "max_delay": 30.0,
+    "max_retry_after": 120,        # longer Retry-After values open the breaker instead
+    "failure_threshold": 3,        # consecutive failures that open a source's breaker
+    "cooldown_seconds": 300,
+    "max_cooldown_seconds": 3600,
+    "probe_timeout": 120,          # seconds before an unanswered probe is given up
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Responses that mean the source is refusing us, not having a bad moment
+BLOCK_STATUSES = {403, 429}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class SourceUnavailable(requests.RequestException):
+    """Raised instead of requesting a source whose breaker is open."""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"{source} unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.source = source
+        self.retry_in = retry_in
+
+
+def retry_settings() -> dict:
+    return {**DEFAULT_RETRY, **(scraper_settings().get("retry") or {})}
+
+
+def source_key(url: str) -> str:
+    """The breaker a URL belongs to: its known source, else its host."""
+    source = source_for(url)
+    if source != "default":
+        return source
+    return (urlsplit(url).hostname or url).lower()
+
+
+def retry_after(resp: requests.Response, now: float = None) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), else None."""
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(when - (time.time() if now is None else now), 0.0)
+
+
+@dataclass
+class SourceHealth:
+    """Counters for one source since the process started."""
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    blocked: int = 0               # 403/429 responses
+    short_circuited: int = 0       # requests refused while the breaker was open
+    latency: float = 0.0           # total seconds spent on completed requests
+    last_status: Optional[int] = None
+    last_error: str = ""
+    statuses: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        done = self.successes + self.failures
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "blocked": self.blocked,
+            "short_circuited": self.short_circuited,
+            "success_rate": round(self.successes / done, 3) if done else None,
+            "avg_latency_ms": round(self.latency / done * 1000, 1) if done else None,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "statuses": dict(self.statuses),
+        }
+
+
+class CircuitBreaker:
+    """closed -> open after repeated failures -> half_open probe -> closed or open."""
+
+    def __init__(self, threshold: int, cooldown: float, max_cooldown: float,
+                 probe_timeout: float = 120.0):
+        self.threshold = max(1, threshold)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.probe_timeout = probe_timeout
+        self._probing = False
+        self._probe_started = 0.0
+
+    def allow(self, now: float, claim: bool = True) -> bool:
+        """Whether a request may go out now; claim takes the half-open probe."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now >= self.open_until:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and (
+                not self._probing or now - self._probe_started >= self.probe_timeout):
+            if claim:
+                self._probing, self._probe_started = True, now
+            return True
+        return False
+
+    def release(self):
+        """Give back a claimed probe whose request never completed."""
+        self._probing = False
+
+    def success(self):
+        self.state, self.failures, self._probing = CLOSED, 0, False
+        self.cooldown = self.base_cooldown
+
+    def failure(self, now: float, hold: float = 0.0, trip: bool = False):
+        """Count a failure; trip opens the breaker regardless of the count."""
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            # The probe failed: back off harder
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            trip = True
+        if trip or self.failures >= self.threshold:
+            self.state, self._probing = OPEN, False
+            self.open_until = now + max(self.cooldown, hold)
+
+
+class Resilience:
+    """Per-source breakers, retry decisions and health for every request."""
+
+    def __init__(self, settings: dict = None, clock=time.time, rng: random.Random = None):
+        self.settings = {**DEFAULT_RETRY, **(settings or {})}
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._breakers = {}
+        self._health = {}
+        self._lock = threading.Lock()
+
+    def _source(self, source: str):
+        breaker = self._breakers.get(source)
+        if breaker is None:
+            s = self.settings
+            breaker = self._breakers[source] = CircuitBreaker(
+                s["failure_threshold"], s["cooldown_seconds"], s["max_cooldown_seconds"],
+                s["probe_timeout"],
+            )
+            self._health[source] = SourceHealth()
+        return breaker, self._health[source]
+
+    def check(self, url: str, admit: bool = True):
+        """
+        Raise SourceUnavailable if url's source is refusing requests.
+        admit=False only looks (before waiting on the rate limiter);
+        admit=True counts the request about to be sent.
+        """
+        source = source_key(url)
+        now = self.clock()
+        with self._lock:
+            breaker, health = self._source(source)
+            if breaker.allow(now, claim=admit):
+                health.requests += admit
+                return
+            health.short_circuited += 1
+            retry_in = max(breaker.open_until - now, 0.0)
+        raise SourceUnavailable(source, retry_in)
+
+    def release(self, url: str):
+        """
+        Undo check() for a request that was abandoned (cancelled or
+        interrupted) before it had an outcome, so its source is not left
+        waiting on a probe that will never report.
+        """
+        with self._lock:
+            breaker, health = self._source(source_key(url))
+            health.requests -= 1
+            breaker.release()
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry (0-based)."""
+        s = self.settings
+        return self.rng.uniform(0, min(s["base_delay"] * 2 ** attempt, s["max_delay"]))
+
+    def record(self, url: str, attempt: int, elapsed: float,
+               resp: requests.Response = None, error: Exception = None) -> Optional[float]:
+        """
+        Record one attempt's outcome. Returns the seconds to wait before
+        retrying, or None when the caller should stop (success, a response
+        not worth retrying, or attempts exhausted).
+        """
+        s = self.settings
+        now = self.clock()
+        status = resp.status_code if resp is not None else None
+        failed = error is not None or (status is not None and (status in RETRY_STATUSES
+                                                               or status in BLOCK_STATUSES))
+        hold = (retry_after(resp, now) or 0.0) if resp is not None else 0.0
+
+        with self._lock:
+            breaker, health = self._source(source_key(url))
+            health.latency += elapsed
+            if status is not None:
+                health.last_status = status
+                health.statuses[status] = health.statuses.get(status, 0) + 1
+            if not failed:
+                health.successes += 1
+                breaker.success()
+                return None
+
+            health.failures += 1
+            health.last_error = f"HTTP {status}" if error is None else (
+                str(error) or type(error).__name__)
+            blocked = status in BLOCK_STATUSES
+            health.blocked += blocked
+            # A 403 is a refusal, and so is a 429 asking us to stay away for long
+            trip = status == 403 or hold > s["max_retry_after"]
+            breaker.failure(now, hold=hold, trip=trip)
+
+            retryable = isinstance(error, requests.RequestException) or status in RETRY_STATUSES
+            if (not retryable or trip or breaker.state == OPEN
+                    or attempt + 1 >= s["max_attempts"]):
+                return None
+            health.retries += 1
+        return hold if hold else self.backoff(attempt)
+
+    def health(self) -> dict:
+        """{source: metrics and breaker state}, for display and the API."""
+        now = self.clock()
+        with self._lock:
+            report = {}
+            for source, health in sorted(self._health.items()):
+                breaker = self._breakers[source]
+                state = breaker.state
+                if state == OPEN and now >= breaker.open_until:
+                    state = HALF_OPEN
+                report[source] = {
+                    **health.to_dict(),
+                    "state": state,
+                    "retry_in": round(max(breaker.open_until - now, 0.0), 1)
+                    if state == OPEN else 0.0,
+                }
+            return report
+
+    def reset(self, source: str = None):
+        """Close one source's breaker (or all) and clear its metrics."""
+        with self._lock:
+            for name in ([source] if source else list(self._breakers)):
+                self._breakers.pop(name, None)
+                self._health.pop(name, None)
+
+
+_resilience = None
+_resilience_lock = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """The process-wide breakers and health, from scrapers.retry in settings.yaml."""
+    global _resilience
+    with _resilience_lock:
+        if _resilience is None:
+            _resilience = Resilience(retry_settings())
+        return _resilience
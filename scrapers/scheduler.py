@@ -0,0 +1,161 @@
+"""
+Board Crawl Scheduler
+Crawls the registered boards as they come due, concurrently under a
+global cap, and reports each board's new/changed/removed postings.
+
+Each board's crawl interval adapts to how often it actually changes: it
+is halved after a crawl that found changes and grows by half after one
+that didn't, within [min_interval, max_interval]. Next-crawl times get
+random jitter so boards added together drift apart instead of being
+crawled in lockstep.
+
+The clock, sleep and random source are injectable so the loop can be
+driven by a fake clock in tests.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from scrapers.boards import Board
+from scrapers.config import scraper_settings
+from scrapers.crawl_state import BoardDelta, CrawlState, get_crawl_state
+from scrapers.engine import run
+from scrapers.greenhouse_lever import crawl_board_async
+
+DEFAULT_CRAWL = {
+    "max_concurrency": 8,          # boards crawled at once
+    "initial_interval_hours": 6,
+    "min_interval_hours": 1,
+    "max_interval_hours": 72,
+    "jitter": 0.2,                 # +/- fraction applied to each interval
+}
+
+HOUR = 3600.0
+
+
+def crawl_settings() -> dict:
+    return {**DEFAULT_CRAWL, **(scraper_settings().get("crawl") or {})}
+
+
+@dataclass
+class CrawlResult:
+    """One board's crawl: its delta, or the error that stopped it."""
+    board: Board
+    delta: Optional[BoardDelta] = None
+    error: str = ""
+
+
+class CrawlScheduler:
+    """Adaptive, jittered crawl loop over a board registry."""
+
+    def __init__(
+        self,
+        boards: Union[list[Board], Callable[[], list[Board]]],
+        on_result: Callable[[CrawlResult], None] = None,
+        state: CrawlState = None,
+        settings: dict = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random = None,
+        max_sleep: float = HOUR
+    ):
+        """
+        boards is a list, or a function returning the current registry
+        (re-read on every pass). on_result is called once per crawled
+        board, as each one finishes. max_sleep caps each sleep so registry
+        edits are picked up.
+        """
+        settings = {**crawl_settings(), **(settings or {})}
+        self._boards = boards
+        self.on_result = on_result
+        self.state = state or get_crawl_state()
+        self.max_concurrency = max(1, settings["max_concurrency"])
+        self.initial_interval = settings["initial_interval_hours"] * HOUR
+        self.min_interval = settings["min_interval_hours"] * HOUR
+        self.max_interval = settings["max_interval_hours"] * HOUR
+        self.jitter = settings["jitter"]
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.max_sleep = max_sleep
+
+    @property
+    def boards(self) -> list[Board]:
+        return self._boards() if callable(self._boards) else self._boards
+
+    def next_crawl_at(self, board: Board) -> float:
+        """When board is due (0 if it has never been crawled)."""
+        info = self.state.board(board.url)
+        return (info or {}).get("next_crawl_at") or 0.0
+
+    def due(self, now: float = None) -> list[Board]:
+        """Boards whose next crawl time has passed, most overdue first."""
+        now = self.clock() if now is None else now
+        due = [(self.next_crawl_at(board), board) for board in self.boards]
+        return [board for at, board in sorted(due, key=lambda item: item[0]) if at <= now]
+
+    def next_interval(self, interval: Optional[float], changed: Optional[bool]) -> float:
+        """The interval after a crawl; changed is None when there's no signal."""
+        interval = interval or self.initial_interval
+        if changed is True:
+            interval /= 2
+        elif changed is False:
+            interval *= 1.5
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _reschedule(self, board: Board, interval: float, now: float, failed: bool = False):
+        # A failed crawl is retried after the shortest interval
+        wait = self.min_interval if failed else interval
+        wait *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+        self.state.set_schedule(board.url, interval, now + wait)
+
+    async def _crawl_one(self, board: Board, semaphore: asyncio.Semaphore) -> CrawlResult:
+        info = self.state.board(board.url) or {}
+        async with semaphore:
+            try:
+                delta = await crawl_board_async(board.url, board.name, board.filter, self.state)
+            except Exception as e:
+                interval = info.get("interval") or self.initial_interval
+                self._reschedule(board, interval, self.clock(), failed=True)
+                return CrawlResult(board, error=str(e) or type(e).__name__)
+        # A first crawl reports everything as new, which says nothing about change rate
+        changed = delta.has_changes if info.get("crawled_at") else None
+        self._reschedule(board, self.next_interval(info.get("interval"), changed), self.clock())
+        return CrawlResult(board, delta)
+
+    async def crawl_async(self, boards: list[Board] = None) -> list[CrawlResult]:
+        """Crawl boards (default: the due ones) concurrently; results in completion order."""
+        boards = self.due() if boards is None else boards
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = []
+        for task in asyncio.as_completed([self._crawl_one(b, semaphore) for b in boards]):
+            result = await task
+            if self.on_result:
+                self.on_result(result)
+            results.append(result)
+        return results
+
+    def crawl(self, boards: list[Board] = None) -> list[CrawlResult]:
+        """Synchronous crawl_async()."""
+        return run(self.crawl_async(boards))
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the next board comes due (capped at max_sleep)."""
+        boards = self.boards
+        if not boards:
+            return self.max_sleep
+        soonest = min(self.next_crawl_at(board) for board in boards)
+        return min(max(soonest - self.clock(), 0.0), self.max_sleep)
+
+    def run(self, max_iterations: Optional[int] = None):
+        """Crawl due boards, then sleep until the next one. Runs forever by default."""
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            due = self.due()
+            if due:
+                self.crawl(due)
+            self.sleep(self.seconds_until_next())
+            iterations += 1
@@ -0,0 +1,104 @@
+"""
+Search Source Registry
+Job search sources (LinkedIn, Indeed, ...) register here. The CLI, the
+API and the engine look sources up by name instead of importing each
+scraper, so adding a source means writing one module.
+
+A source is a streaming search: an async generator yielding JobListings
+as each result page arrives, so callers can dedupe, track and fetch
+descriptions for the first page while later pages are still
+downloading. SearchSource adds the listing filters (scrapers/filters.py),
+a sync iterator and a list-returning helper on top of it.
+
+Built-in sources live in BUILTIN_MODULES. Extra modules listed under
+scrapers.plugins in settings.yaml are imported too, and register
+themselves the same way:
+
+    from scrapers.sources import SearchSource, register
+
+    async def stream_example_jobs(query, location, max_results=25):
+        ...yield JobListing(...)
+
+    register(SearchSource("example", stream_example_jobs, "Example job board"))
+"""
+
+import importlib
+import threading
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator
+
+from scrapers.config import scraper_settings
+from scrapers.engine import iterate
+from scrapers.filters import listing_filter
+
+BUILTIN_MODULES = ("scrapers.linkedin_scraper", "scrapers.indeed_scraper")
+
+
+@dataclass
+class SearchSource:
+    """A registered job search: name plus a streaming search function."""
+    name: str
+    stream: Callable[..., AsyncIterator]  # (query, location, max_results) -> JobListings
+    description: str = ""
+
+    async def search_async(self, query: str, location: str, max_results: int = 25):
+        """JobListings that pass the listing filters, as their result pages arrive."""
+        keep = listing_filter()
+        async with aclosing(self.stream(query, location, max_results=max_results)) as jobs:
+            async for job in jobs:
+                if keep(job):
+                    yield job
+
+    def search(self, query: str, location: str, max_results: int = 25) -> Iterator:
+        """Sync search_async(); pages keep downloading while the caller works."""
+        return iterate(self.search_async(query, location, max_results))
+
+    async def collect(self, query: str, location: str, max_results: int = 25) -> list:
+        return [job async for job in self.search_async(query, location, max_results)]
+
+
+_sources = {}
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def register(source: SearchSource) -> SearchSource:
+    """Add (or replace) a source under its name."""
+    _sources[source.name] = source
+    return source
+
+
+def _load():
+    global _loaded
+    with _load_lock:
+        if _loaded:
+            return
+        plugins = scraper_settings().get("plugins") or []
+        for module in (*BUILTIN_MODULES, *plugins):
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                print(f"Could not load scraper source {module}: {e}")
+        _loaded = True
+
+
+def get_source(name: str) -> SearchSource:
+    _load()
+    try:
+        return _sources[name]
+    except KeyError:
+        raise KeyError(f"Unknown source {name!r} (registered: {', '.join(source_names())})")
+
+
+def source_names() -> list[str]:
+    """Every registered source, in registration order."""
+    _load()
+    return list(_sources)
+
+
+def enabled_sources() -> list[str]:
+    """Registered sources not disabled with scrapers.<name>.enabled: false."""
+    settings = scraper_settings()
+    return [name for name in source_names()
+            if (settings.get(name) or {}).get("enabled", True)]
@@ -1,34 +1,149 @@
 """
 Application Tracker
-JSON-based tracker for job applications.
-Tracks: company, role, resume version, status, dates, notes.
+Tracks job applications: company, role, resume version, status, dates, notes.
+Persistence is pluggable (see tracker/storage.py); SQLite is the default and
+a legacy applications.json next to it is migrated on first use.
 """
 
+import base64
 import json
 import os
+import threading
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Optional
 from pathlib import Path
-import threading
 
-TRACKER_PATH = os.path.join(os.path.dirname(__file__), "applications.json")
-_lock = threading.Lock()
+from tracker.near_duplicates import NearDuplicateIndex
+from tracker.search import parse_query
+from tracker.storage import (
+    open_storage, migrate_json_to_sqlite, APP_FIELDS, SORT_FIELDS
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TRACKER_PATH = os.path.join(os.path.dirname(__file__), "applications.db")
+LEGACY_JSON_PATH = os.path.join(os.path.dirname(__file__), "applications.json")
+
+
+SETTINGS_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "settings.yaml")
+
+
+@lru_cache(maxsize=1)
+def _tracker_settings() -> dict:
+    """The tracker section of settings.yaml."""
+    try:
+        import yaml
+        with open(SETTINGS_PATH) as f:
+            return (yaml.safe_load(f) or {}).get("tracker", {}) or {}
+    except (ImportError, OSError):
+        return {}
+
+
+def _tracker_path() -> str:
+    """tracker.db_path from settings.yaml (relative to the project root)."""
+    path = _tracker_settings().get("db_path")
+    return os.path.join(PROJECT_ROOT, path) if path else DEFAULT_TRACKER_PATH
+
+
+# .db = SQLite, .json = the JSON backend
+TRACKER_PATH = _tracker_path()
+
+
+def _json_options() -> dict:
+    """JSON backend options from the tracker settings."""
+    settings = _tracker_settings()
+    return {
+        "compact": bool(settings.get("json_compact", False)),
+        "commit_window": settings.get("json_commit_window_ms", 2) / 1000,
+        "snapshot_bytes": int(settings.get("json_snapshot_kb", 1024) * 1024),
+    }
+
+
+def _storage(db_path: str = None):
+    """Resolve the storage backend for a tracker path."""
+    return open_storage(db_path or TRACKER_PATH, **_json_options())
+
+
+# Read-through snapshot cache: {storage path: (version, {name: value})}.
+# Entries are dropped as soon as the storage version changes, so reads
+# between writes are served from memory.
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def _cached(db_path: str, name, compute):
+    """Return compute(storage), memoized until the tracker is written."""
+    storage = _storage(db_path)
+    version = storage.version()
+    with _snapshots_lock:
+        entry = _snapshots.get(storage.path)
+        if entry is None or entry[0] != version:
+            entry = (version, {})
+            _snapshots[storage.path] = entry
+        memo = entry[1]
+        if name not in memo:
+            memo[name] = compute(storage)
+        return memo[name]
+
+
+def clear_cache():
+    """Drop all cached tracker snapshots."""
+    with _snapshots_lock:
+        _snapshots.clear()
 
 
 def _load_data(db_path: str = None) -> dict:
-    """Load tracker data from JSON file."""
-    path = db_path or TRACKER_PATH
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return {"next_id": 1, "applications": []}
+    """Load the full tracker document ({"next_id", "applications"})."""
+    return _storage(db_path).load()
 
 
 def _save_data(data: dict, db_path: str = None):
-    """Save tracker data to JSON file."""
-    path = db_path or TRACKER_PATH
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    """Replace the full tracker document."""
+    _storage(db_path).replace(data)
+
+
+def _new_application(
+    company: str,
+    title: str,
+    location: str = "",
+    url: str = "",
+    source: str = "",
+    status: str = "discovered",
+    resume_path: str = "",
+    cover_letter_path: str = "",
+    ats_score: float = 0.0,
+    keywords_matched: list = None,
+    keywords_missing: list = None,
+    notes: str = "",
+    job_id: str = "",
+    description: str = ""
+) -> dict:
+    """Build a new application record (without an ID)."""
+    now = datetime.now().isoformat()
+    return {
+        "company": company,
+        "title": title,
+        "location": location,
+        "url": url,
+        "source": source,
+        "job_id": job_id,
+        "status": status,
+        "resume_path": resume_path,
+        "cover_letter_path": cover_letter_path,
+        "ats_score": ats_score,
+        "keywords_matched": keywords_matched or [],
+        "keywords_missing": keywords_missing or [],
+        "notes": notes,
+        "description": description,
+        "date_discovered": now,
+        "date_applied": "",
+        "date_response": "",
+        "date_interview": "",
+        "follow_up_date": "",
+        "created_at": now,
+        "updated_at": now,
+        "status_changed_at": now
+    }
 
 
 def add_application(
@@ -44,134 +159,297 @@ def add_application(
     keywords_matched: list = None,
     keywords_missing: list = None,
     notes: str = "",
+    description: str = "",
     db_path: str = None
 ) -> int:
-    """Add a new application to the tracker. Returns the application ID."""
-    with _lock:
-        data = _load_data(db_path)
-        now = datetime.now().isoformat()
-        app_id = data["next_id"]
-        data["next_id"] += 1
-
-        app = {
-            "id": app_id,
-            "company": company,
-            "title": title,
-            "location": location,
-            "url": url,
-            "source": source,
-            "status": status,
-            "resume_path": resume_path,
-            "cover_letter_path": cover_letter_path,
-            "ats_score": ats_score,
-            "keywords_matched": keywords_matched or [],
-            "keywords_missing": keywords_missing or [],
-            "notes": notes,
-            "date_discovered": now,
-            "date_applied": "",
-            "date_response": "",
-            "date_interview": "",
-            "follow_up_date": "",
-            "created_at": now,
-            "updated_at": now
-        }
-        data["applications"].append(app)
-        _save_data(data, db_path)
-        return app_id
-
-
-def update_status(app_id: int, status: str, notes: str = None, db_path: str = None):
-    """Update application status."""
-    with _lock:
-        data = _load_data(db_path)
-        now = datetime.now().isoformat()
-
-        for app in data["applications"]:
-            if app["id"] == app_id:
-                app["status"] = status
-                app["updated_at"] = now
-
-                if status == "applied":
-                    app["date_applied"] = now
-                elif status == "response":
-                    app["date_response"] = now
-                elif status == "interview":
-                    app["date_interview"] = now
-
-                if notes:
-                    existing = app.get("notes", "")
-                    app["notes"] = f"{existing}\n[{now[:10]}] {notes}".strip()
-                break
-
-        _save_data(data, db_path)
-
-
-def set_follow_up(app_id: int, days: int = 7, db_path: str = None):
-    """Set a follow-up reminder."""
-    with _lock:
-        data = _load_data(db_path)
-        follow_up = (datetime.now() + timedelta(days=days)).isoformat()
-
-        for app in data["applications"]:
-            if app["id"] == app_id:
-                app["follow_up_date"] = follow_up
-                app["updated_at"] = datetime.now().isoformat()
-                break
-
-        _save_data(data, db_path)
+    """
+    Add a new application to the tracker. Returns the application ID.
+    `description` is the job description text (searchable).
+    """
+    app = _new_application(
+        company, title, location=location, url=url, source=source,
+        status=status, resume_path=resume_path,
+        cover_letter_path=cover_letter_path, ats_score=ats_score,
+        keywords_matched=keywords_matched, keywords_missing=keywords_missing,
+        notes=notes, description=description
+    )
+    return _storage(db_path).insert([app])[0]
+
+
+# Scraped listings are added to the tracker in batches of this many
+TRACK_BATCH = 25
+
+
+def add_applications_bulk(jobs: list, status: str = "discovered",
+                          db_path: str = None) -> tuple[list[int], int]:
+    """
+    Track a whole scrape result in one transaction.
+    Accepts JobListing objects or dicts. Jobs already tracked (or repeated
+    within the batch) are skipped. Returns (new_ids, skipped_count).
+    """
+    apps = []
+    for job in jobs:
+        job = job.to_dict() if hasattr(job, "to_dict") else job
+        if not job.get("title"):
+            continue
+        apps.append(_new_application(
+            company=job.get("company", ""),
+            title=job["title"],
+            location=job.get("location", ""),
+            url=job.get("url", ""),
+            source=job.get("source", ""),
+            job_id=job.get("job_id", ""),
+            description=job.get("description", ""),
+            status=status
+        ))
+    ids = _storage(db_path).insert(apps, unique=True)
+    return ids, len(jobs) - len(ids)
+
+
+def update_status(app_id: int, status: str, notes: str = None,
+                  db_path: str = None) -> Optional[dict]:
+    """
+    Update application status.
+    The change is appended to the application's status history; returns
+    the recorded event, or None if there is no such application.
+    """
+    return _storage(db_path).record_status(
+        app_id, status, note=notes or "", at=datetime.now().isoformat()
+    )
 
 
-def get_applications(status: str = None, db_path: str = None) -> list[dict]:
-    """Get all applications, optionally filtered by status."""
-    data = _load_data(db_path)
-    apps = data["applications"]
-    if status:
-        apps = [a for a in apps if a["status"] == status]
-    return sorted(apps, key=lambda x: x.get("created_at", ""), reverse=True)
+def get_status_history(app_id: int, db_path: str = None) -> list[dict]:
+    """Status events for an application ({seq, app_id, from, to, at, note}), oldest first."""
+    return _storage(db_path).events(app_id)
 
 
-def get_follow_ups(db_path: str = None) -> list[dict]:
-    """Get applications with pending follow-ups."""
-    data = _load_data(db_path)
-    now = datetime.now().isoformat()
-    excluded = {"rejected", "withdrawn", "offer"}
-    return [
-        a for a in data["applications"]
-        if a.get("follow_up_date") and a["follow_up_date"] <= now
-        and a["status"] not in excluded
-    ]
-
-
-def check_duplicate(company: str, title: str, db_path: str = None) -> bool:
-    """Check if we already have this application."""
-    data = _load_data(db_path)
-    return any(
-        a["company"] == company and a["title"] == title
-        for a in data["applications"]
-    )
+def set_follow_up(app_id: int, days: int = 7, db_path: str = None):
+    """Set a follow-up reminder."""
+    follow_up = (datetime.now() + timedelta(days=days)).isoformat()
+
+    def apply(app):
+        app["follow_up_date"] = follow_up
+        app["updated_at"] = datetime.now().isoformat()
+
+    _storage(db_path).modify(app_id, apply)
+
+
+def set_description(app_id: int, description: str, db_path: str = None) -> Optional[dict]:
+    """Store the job description text for an application. Returns it, or None for an unknown ID."""
+    def apply(app):
+        app["description"] = description
+        app["updated_at"] = datetime.now().isoformat()
+
+    return _storage(db_path).modify(app_id, apply)
+
+
+def refresh_postings(jobs: list, db_path: str = None) -> list[int]:
+    """
+    Store the new descriptions of changed postings (JobListings or dicts)
+    on the applications tracking them. Returns the updated IDs; postings
+    that aren't tracked are ignored.
+
+    Postings are matched by job ID or URL only: a different opening with
+    the same company, title and location is not the same posting, and
+    archived applications are left alone.
+    """
+    storage = _storage(db_path)
+    updated = []
+    for job in jobs:
+        job = job.to_dict() if hasattr(job, "to_dict") else job
+        if not job.get("description"):
+            continue
+        app_id = storage.find_posting(job)
+        if app_id is not None and set_description(app_id, job["description"], db_path):
+            updated.append(app_id)
+    return updated
+
+
+def search_applications(query: str, limit: int = 20, include_archived: bool = False,
+                        db_path: str = None) -> list[dict]:
+    """
+    Full-text search over company, title, location, notes, ATS keywords and
+    the stored job description. Every word must match (as a prefix, so
+    "kube" finds "Kubernetes"). Results are best first, each with a "score".
+    """
+    terms = parse_query(query)
+    if not terms:
+        return []
+    limit = max(1, min(limit, 200))
+    return _storage(db_path).search(terms, limit=limit, include_archived=include_archived)
+
+
+def get_applications(status: str = None, db_path: str = None,
+                     include_archived: bool = False) -> list[dict]:
+    """
+    Get all applications, optionally filtered by status.
+    Archived applications are only included with include_archived=True.
+    """
+    apps = _cached(db_path, ("applications", status, include_archived), lambda st: sorted(
+        st.all(status=status, include_archived=include_archived),
+        key=lambda x: x.get("created_at", ""), reverse=True
+    ))
+    return list(apps)
+
+
+def archive_stale(now: datetime = None, db_path: str = None) -> list[int]:
+    """
+    Move closed (rejected/withdrawn/low_match) applications older than
+    tracker.archive_after_days, and discovered ones older than
+    tracker.archive_discovered_after_days, to the archive tier.
+    Returns the archived IDs.
+    """
+    settings = _tracker_settings()
+    now = now or datetime.now()
+    closed_before = now - timedelta(days=settings.get("archive_after_days", 30))
+    discovered_before = now - timedelta(days=settings.get("archive_discovered_after_days", 60))
+    return _storage(db_path).archive(closed_before.isoformat(), discovered_before.isoformat())
+
+
+def _encode_cursor(app: dict, sort: str) -> str:
+    raw = json.dumps([app.get(sort), app["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        value, app_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return (value, app_id)
+
+
+def query_applications(
+    status: str = None,
+    source: str = None,
+    company_prefix: str = None,
+    created_after: str = None,
+    created_before: str = None,
+    min_ats_score: float = None,
+    sort: str = "created_at",
+    descending: bool = True,
+    limit: int = 50,
+    cursor: str = None,
+    fields: list = None,
+    include_archived: bool = False,
+    db_path: str = None
+) -> dict:
+    """
+    One page of applications, filtered and sorted by the storage backend.
+    Pass the returned next_cursor back in to get the following page;
+    it is None on the last page. `fields` limits the keys returned
+    ("id" is always included). include_archived also pages through the
+    archive tier.
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Cannot sort by {sort!r}; choose from {', '.join(SORT_FIELDS)}")
+    unknown = [f for f in fields or [] if f not in APP_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    limit = max(1, min(limit, 500))
+    if fields and sort not in fields:
+        fields = list(fields) + [sort]
+
+    filters = {
+        "status": status,
+        "source": source,
+        "company_prefix": company_prefix,
+        "created_after": created_after,
+        "created_before": created_before,
+        "min_ats_score": min_ats_score,
+    }
+    after = _decode_cursor(cursor) if cursor else None
+    items = _storage(db_path).query(filters, sort=sort, descending=descending,
+                                    limit=limit + 1, after=after, fields=fields,
+                                    include_archived=include_archived)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor(items[-1], sort)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def get_follow_ups(db_path: str = None, now: datetime = None) -> list[dict]:
+    """Get applications with pending follow-ups (due now), soonest first."""
+    until = (now or datetime.now()).isoformat()
+    return _storage(db_path).follow_ups(until=until)
+
+
+def next_follow_ups(limit: int = 10, after: datetime = None,
+                    db_path: str = None) -> list[dict]:
+    """
+    The next `limit` follow-ups due strictly after `after` (default: now).
+    Served from the due-date index, so no scan of the tracker.
+    """
+    after = (after or datetime.now()).isoformat()
+    return _storage(db_path).follow_ups(after=after, limit=limit)
+
+
+def check_duplicate(company: str, title: str, location: str = "", url: str = "",
+                    job_id: str = "", source: str = "", db_path: str = None) -> bool:
+    """
+    Check if we already have this application.
+    Matches on a normalized company/title(/location) fingerprint, or on the
+    source job ID or URL when given. O(1) via the persistent dedupe index.
+    """
+    job = {"company": company, "title": title, "location": location,
+           "url": url, "job_id": job_id, "source": source}
+    return _storage(db_path).find_duplicate(job) is not None
+
+
+def near_duplicate_threshold() -> float:
+    """tracker.near_duplicate_threshold from settings.yaml."""
+    return _tracker_settings().get("near_duplicate_threshold", 0.7)
+
+
+def near_duplicate_index(status: str = "discovered", db_path: str = None) -> NearDuplicateIndex:
+    """
+    A near-duplicate index seeded with the applications in `status`, so
+    cross-source variants of jobs already waiting to be tailored are
+    recognized (see tracker/near_duplicates.py). The seeded index is
+    cached until the tracker is written; each caller gets its own copy.
+    """
+    def build(storage):
+        index = NearDuplicateIndex(near_duplicate_threshold())
+        for app in sorted(storage.all(status=status),
+                          key=lambda x: x.get("created_at", ""), reverse=True):
+            index.add(app)
+        return index
+
+    return _cached(db_path, ("near_duplicates", status), build).copy()
 
 
 def get_stats(db_path: str = None) -> dict:
-    """Get application statistics."""
-    data = _load_data(db_path)
-    apps = data["applications"]
-    total = len(apps)
-
-    by_status = {}
-    for app in apps:
-        s = app["status"]
-        by_status[s] = by_status.get(s, 0) + 1
-
-    scores = [a["ats_score"] for a in apps if a.get("ats_score", 0) > 0]
-    avg_score = sum(scores) / len(scores) if scores else 0
+    """
+    Get application statistics.
+    Read from counters maintained on every write, so this is O(1) in the
+    number of applications. Counts cover archived applications too.
+    """
+    stats = _cached(db_path, "stats", lambda st: st.stats())
+    avg_score = stats["score_sum"] / stats["score_count"] if stats["score_count"] else 0
+    days_in_stage = {
+        status: round(stats["stage_seconds"].get(status, 0) / exits / 86400, 1)
+        for status, exits in stats["stage_exits"].items()
+    }
 
     return {
-        "total": total,
-        "by_status": by_status,
-        "avg_ats_score": round(avg_score, 2)
+        "total": sum(stats["by_status"].values()),
+        "by_status": dict(stats["by_status"]),
+        "by_source": dict(stats["by_source"]),
+        "by_week": dict(stats["by_week"]),
+        "avg_ats_score": round(avg_score, 2),
+        # Applications that ever entered each status
+        "funnel": dict(stats["entered"]),
+        "avg_days_in_stage": days_in_stage
     }
 
 
+def rebuild_stats(db_path: str = None) -> dict:
+    """Recompute the stored aggregate counters from scratch."""
+    _storage(db_path).rebuild_stats()
+    return get_stats(db_path)
+
+
 def print_dashboard(db_path: str = None):
     """Print a dashboard summary."""
     stats = get_stats(db_path)
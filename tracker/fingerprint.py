@@ -0,0 +1,110 @@
+"""
+Dedupe Fingerprints
+Normalizes company/title/location/URL so that "Acme Inc." and "acme",
+or "Sr.  ML Engineer" and "Senior ML Engineer", map to the same key.
+
+Stored applications register index_keys(); incoming jobs probe with
+lookup_keys(). A hit on any key means the job is already tracked.
+"""
+
+import hashlib
+import re
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "ag", "sa", "lp", "llp", "pbc",
+}
+TITLE_ABBREVIATIONS = {
+    "sr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer",
+    "mgr": "manager", "dev": "developer", "swe": "software engineer",
+}
+TRACKING_PARAMS = ("utm_", "ref", "trk", "tracking", "src", "gh_src", "lever-")
+
+
+def words(text: str) -> list[str]:
+    """Lowercased words of text, with "&" spelled "and"."""
+    return _NON_WORD.sub(" ", (text or "").lower().replace("&", " and ")).split()
+
+
+def normalize_company(company: str) -> str:
+    parts = words(company)
+    while len(parts) > 1 and parts[-1] in COMPANY_SUFFIXES:
+        parts.pop()
+    return " ".join(parts)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(TITLE_ABBREVIATIONS.get(w, w) for w in words(title))
+
+
+def normalize_location(location: str) -> str:
+    return " ".join(words(location))
+
+
+def normalize_url(url: str) -> str:
+    """Drop scheme, www, fragment, trailing slash and tracking parameters."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    normalized = host + parts.path.rstrip("/")
+    if query:
+        normalized += "?" + urlencode(query)
+    return normalized
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=10).hexdigest()
+
+
+def _ctl_key(app: dict, location: str) -> str:
+    return "ctl:" + _digest(normalize_company(app.get("company", "")),
+                            normalize_title(app.get("title", "")),
+                            location)
+
+
+def index_keys(app: dict) -> list[str]:
+    """Keys a stored application is registered under."""
+    keys = [
+        _ctl_key(app, normalize_location(app.get("location", ""))),
+        "ct:" + _digest(normalize_company(app.get("company", "")),
+                        normalize_title(app.get("title", ""))),
+    ]
+    if app.get("job_id"):
+        keys.append(f"job:{app.get('source', '')}:{app['job_id']}")
+    if app.get("url"):
+        keys.append("url:" + _digest(normalize_url(app["url"])))
+    return keys
+
+
+def posting_keys(app: dict) -> list[str]:
+    """Keys naming one specific posting: its source job ID and its URL."""
+    keys = []
+    if app.get("job_id"):
+        keys.append(f"job:{app.get('source', '')}:{app['job_id']}")
+    if app.get("url"):
+        keys.append("url:" + _digest(normalize_url(app["url"])))
+    return keys
+
+
+def lookup_keys(app: dict) -> list[str]:
+    """
+    Keys to probe for an incoming job. With a location we match the same
+    location or records stored without one; without a location we match
+    the company/title on any location.
+    """
+    keys = posting_keys(app)
+    location = normalize_location(app.get("location", ""))
+    if location:
+        keys += [_ctl_key(app, location), _ctl_key(app, "")]
+    else:
+        keys.append("ct:" + _digest(normalize_company(app.get("company", "")),
+                                    normalize_title(app.get("title", ""))))
+    return keys
@@ -0,0 +1,223 @@
+"""
+Near-Duplicate Postings
+Groups listings of the same job from different sources (LinkedIn, the
+Google fallback, Indeed, the company's Greenhouse/Lever board) into one
+canonical posting, even when titles differ slightly ("Sr. ML Engineer"
+vs "Senior Machine Learning Engineer - Healthcare").
+
+Each listing is shingled per field, after the fingerprint normalization:
+title character trigrams, company words, location words, and word
+trigrams from the start of the description. The title gets a MinHash
+signature, and LSH banding on it finds candidate matches: each band is
+`rows` signature values keyed by the company's first word, so only
+listings at the same company with a similar title share a bucket.
+Lookups cost O(bands) buckets instead of a scan over every posting.
+
+Candidates are verified: the company words must mostly agree, titles
+naming different seniority levels never match, and the rest is a
+weighted similarity of exact Jaccard on the small title/location sets
+and a MinHash estimate for the description. A field only counts when
+both listings have it.
+
+The signatures use one-permutation hashing with densification: each
+shingle is hashed once into one of k bins, which keeps signing pure
+Python and linear in the shingle count.
+"""
+
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+from tracker.fingerprint import normalize_company, normalize_location, normalize_title, words
+
+MASK64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15  # 2^64 / golden ratio
+EMPTY = MASK64
+
+# Field -> similarity weight (fields missing on either side are skipped)
+FIELD_WEIGHTS = {"title": 0.5, "location": 0.1, "description": 0.4}
+
+# "Senior X" and "Staff X" at one company are different openings
+SENIORITY = {"intern", "junior", "senior", "staff", "principal", "lead", "head",
+             "ii", "iii", "iv"}
+
+# Description words shingled; the opening is enough to tell roles apart
+DESCRIPTION_WORDS = 200
+
+# Source -> preference for the canonical listing (company boards first)
+SOURCE_RANK = {"greenhouse": 3, "lever": 3, "linkedin": 2, "indeed": 2}
+
+
+def _get(listing, name: str) -> str:
+    return (listing.get(name) if isinstance(listing, dict) else getattr(listing, name, "")) or ""
+
+
+def shingles(listing) -> dict:
+    """{field: set of shingles} for a JobListing or application dict."""
+    title = f" {normalize_title(_get(listing, 'title'))} "
+    description = words(_get(listing, "description"))[:DESCRIPTION_WORDS]
+    return {
+        "title": {title[i:i + 3] for i in range(len(title) - 2)} if title.strip() else set(),
+        "level": SENIORITY.intersection(title.split()),
+        "company": normalize_company(_get(listing, "company")).split(),
+        "location": set(normalize_location(_get(listing, "location")).split()),
+        "description": {" ".join(description[i:i + 3]) for i in range(len(description) - 2)},
+    }
+
+
+def minhash(items: set, k: int) -> tuple:
+    """
+    k-value MinHash signature by one-permutation hashing. Empty bins take
+    the next non-empty bin's value (circularly), offset by the distance,
+    so signatures stay aligned for LSH.
+    """
+    bins = [EMPTY] * k
+    crc32 = zlib.crc32
+    for item in items:
+        h = (crc32(item.encode()) * _MIX) & MASK64
+        b, value = h % k, h // k
+        if value < bins[b]:
+            bins[b] = value
+    if EMPTY in bins and len(set(bins)) > 1:
+        original, following = bins[:], None
+        # Walk right to left twice round, so the last bins see the first
+        for i in range(2 * k - 1, -1, -1):
+            if original[i % k] != EMPTY:
+                following = i
+            elif i < k:
+                bins[i] = (original[following % k] + (following - i) * _MIX) & MASK64
+    return tuple(bins)
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def estimate(a: tuple, b: tuple) -> float:
+    """Jaccard similarity estimated from two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def _rank(listing) -> tuple:
+    source = _get(listing, "source").split("_")[0]
+    return (SOURCE_RANK.get(source, 1), len(_get(listing, "description")))
+
+
+@dataclass
+class Posting:
+    """One job, as listed by one or more sources."""
+    id: int
+    listings: list = field(default_factory=list)
+
+    @property
+    def canonical(self):
+        """The richest listing: a company board over aggregators, then the longest description."""
+        return max(self.listings, key=_rank)
+
+    @property
+    def sources(self) -> list[str]:
+        return sorted({_get(listing, "source") for listing in self.listings})
+
+
+@dataclass
+class _Entry:
+    posting: int
+    sets: dict
+    description: Optional[tuple]
+
+
+class NearDuplicateIndex:
+    """Incrementally groups listings into canonical postings."""
+
+    def __init__(self, threshold: float = 0.7, bands: int = 10, rows: int = 3,
+                 description_perm: int = 64, min_company: float = 0.5):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.description_perm = description_perm
+        self.min_company = min_company
+        self.postings = []
+        self._entries = []
+        self._buckets = {}
+        self.comparisons = 0
+
+    def _band_keys(self, sets: dict) -> list:
+        title = minhash(sets["title"], self.bands * self.rows)
+        company = sets["company"][0] if sets["company"] else ""
+        r = self.rows
+        return [hash((band, company, title[band * r:(band + 1) * r]))
+                for band in range(self.bands)]
+
+    def similarity(self, a: _Entry, b: _Entry) -> float:
+        """Weighted field similarity; 0 for different companies or seniority levels."""
+        if jaccard(set(a.sets["company"]), set(b.sets["company"])) < self.min_company:
+            return 0.0
+        if a.sets["level"] != b.sets["level"]:
+            return 0.0
+        scores = {"title": jaccard(a.sets["title"], b.sets["title"])}
+        if a.sets["location"] and b.sets["location"]:
+            scores["location"] = jaccard(a.sets["location"], b.sets["location"])
+        if a.description and b.description:
+            scores["description"] = estimate(a.description, b.description)
+        total = sum(FIELD_WEIGHTS[name] for name in scores)
+        return sum(FIELD_WEIGHTS[name] * score for name, score in scores.items()) / total
+
+    def _prepare(self, listing):
+        sets = shingles(listing)
+        description = (minhash(sets["description"], self.description_perm)
+                       if sets["description"] else None)
+        return _Entry(-1, sets, description), self._band_keys(sets)
+
+    def _best(self, entry: _Entry, keys: list) -> Optional[int]:
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            other = self._entries[candidate]
+            self.comparisons += 1
+            score = self.similarity(entry, other)
+            if score >= best_score:
+                best, best_score = other.posting, score
+        return best
+
+    def match(self, listing) -> Optional[Posting]:
+        """The posting listing duplicates, without adding it."""
+        entry, keys = self._prepare(listing)
+        found = self._best(entry, keys)
+        return None if found is None else self.postings[found]
+
+    def add(self, listing) -> tuple[Posting, bool]:
+        """Add listing to its posting (or a new one). Returns (posting, is_new)."""
+        entry, keys = self._prepare(listing)
+        found = self._best(entry, keys)
+        if found is None:
+            found = len(self.postings)
+            self.postings.append(Posting(found))
+        posting = self.postings[found]
+        posting.listings.append(listing)
+        entry.posting = found
+        self._entries.append(entry)
+        if entry.sets["title"]:
+            for key in keys:
+                self._buckets.setdefault(key, []).append(len(self._entries) - 1)
+        return posting, len(posting.listings) == 1
+
+    def copy(self) -> "NearDuplicateIndex":
+        """An independent copy that can be added to without re-signing anything."""
+        clone = NearDuplicateIndex(self.threshold, self.bands, self.rows,
+                                   self.description_perm, self.min_company)
+        clone.postings = [Posting(p.id, list(p.listings)) for p in self.postings]
+        clone._entries = list(self._entries)
+        clone._buckets = {key: list(entries) for key, entries in self._buckets.items()}
+        return clone
+
+
+def group_postings(listings, threshold: float = 0.7) -> list[Posting]:
+    """Group listings into postings, in order of first appearance."""
+    index = NearDuplicateIndex(threshold)
+    for listing in listings:
+        index.add(listing)
+    return index.postings
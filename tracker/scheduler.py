@@ -0,0 +1,67 @@
+"""
+Follow-up Reminder Scheduler
+Fires reminders as follow-ups come due. Instead of polling, it asks the
+due-date index for the next follow-up and sleeps until then.
+
+The clock and sleep functions are injectable so the loop can be driven
+by a fake clock in tests.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from tracker.application_tracker import get_follow_ups, next_follow_ups
+
+
+class FollowUpScheduler:
+    """Sleep-until-due reminder loop over the tracker's follow-up index."""
+
+    def __init__(
+        self,
+        on_due: Callable[[dict], None],
+        db_path: str = None,
+        clock: Callable[[], datetime] = datetime.now,
+        sleep: Callable[[float], None] = time.sleep,
+        max_sleep: float = 3600.0
+    ):
+        """
+        on_due is called once per (application, follow_up_date).
+        max_sleep caps each sleep so follow-ups set by other processes
+        while we sleep are still picked up.
+        """
+        self.on_due = on_due
+        self.db_path = db_path
+        self.clock = clock
+        self.sleep = sleep
+        self.max_sleep = max_sleep
+        self._fired = set()
+
+    def fire_due(self) -> list[dict]:
+        """Fire reminders for every follow-up due now. Returns the fired apps."""
+        fired = []
+        for app in get_follow_ups(self.db_path, now=self.clock()):
+            key = (app["id"], app["follow_up_date"])
+            if key in self._fired:
+                continue
+            self._fired.add(key)
+            self.on_due(app)
+            fired.append(app)
+        return fired
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the next follow-up comes due (capped at max_sleep)."""
+        now = self.clock()
+        upcoming = next_follow_ups(limit=1, after=now, db_path=self.db_path)
+        if not upcoming:
+            return self.max_sleep
+        due = datetime.fromisoformat(upcoming[0]["follow_up_date"])
+        return min(max((due - now).total_seconds(), 0.0), self.max_sleep)
+
+    def run(self, max_iterations: Optional[int] = None):
+        """Fire due reminders, then sleep until the next one. Runs forever by default."""
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            self.fire_due()
+            self.sleep(self.seconds_until_next())
+            iterations += 1
@@ -0,0 +1,133 @@
+"""
+Application Search
+Tokenizing, query parsing and BM25 ranking for tracker full-text search.
+
+SQLiteStorage indexes with FTS5; JSONStorage keeps an InvertedIndex in
+memory. Both use the same tokens (letters, digits, "+" and "#", so "c++"
+and "c#" survive), the same field weights, and match every query term
+as a prefix ("kube" finds "kubernetes").
+"""
+
+import math
+import re
+from bisect import bisect_left, insort
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+# Field -> BM25 weight. A hit in the company or title outranks one buried
+# in a job description.
+SEARCH_FIELDS = {
+    "company": 10.0,
+    "title": 8.0,
+    "keywords": 4.0,
+    "location": 2.0,
+    "notes": 1.0,
+    "description": 1.0,
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+def search_fields(app: dict) -> dict:
+    """The searchable text of an application, by field."""
+    keywords = (app.get("keywords_matched") or []) + (app.get("keywords_missing") or [])
+    return {
+        "company": app.get("company", ""),
+        "title": app.get("title", ""),
+        "keywords": " ".join(keywords),
+        "location": app.get("location", ""),
+        "notes": app.get("notes", ""),
+        "description": app.get("description", ""),
+    }
+
+
+def parse_query(query: str) -> list[str]:
+    """Query terms; all of them must match."""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def fts_query(terms: list[str]) -> str:
+    """An FTS5 MATCH expression: every term, as a prefix."""
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+class InvertedIndex:
+    """
+    In-memory BM25F index: term -> {doc_id: weighted term frequency}.
+    add() and remove() update it incrementally.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = []  # sorted, for prefix lookups
+        self.doc_terms = {}
+        self.doc_len = {}
+        self.total_len = 0.0
+
+    def add(self, doc_id: int, fields: dict):
+        self.remove(doc_id)
+        weights = {}
+        length = 0.0
+        for field, text in fields.items():
+            weight = SEARCH_FIELDS.get(field, 1.0)
+            tokens = tokenize(text)
+            length += weight * len(tokens)
+            for token in tokens:
+                weights[token] = weights.get(token, 0.0) + weight
+        for term, tf in weights.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                insort(self.vocabulary, term)
+            posting[doc_id] = tf
+        self.doc_terms[doc_id] = list(weights)
+        self.doc_len[doc_id] = length
+        self.total_len += length
+
+    def remove(self, doc_id: int):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_len -= self.doc_len.pop(doc_id)
+        for term in terms:
+            posting = self.postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self.postings[term]
+                del self.vocabulary[bisect_left(self.vocabulary, term)]
+
+    def _expand(self, prefix: str) -> list[str]:
+        start = bisect_left(self.vocabulary, prefix)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(prefix):
+            end += 1
+        return self.vocabulary[start:end]
+
+    def search(self, terms: list[str]) -> list[tuple[int, float]]:
+        """(doc_id, score) for documents matching every term, best first."""
+        if not terms or not self.doc_len:
+            return []
+        n = len(self.doc_len)
+        avg_len = self.total_len / n or 1.0
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for expanded in self._expand(term):
+                posting = self.postings[expanded]
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_len[doc_id] / avg_len)
+                    term_scores[doc_id] = (term_scores.get(doc_id, 0.0)
+                                           + idf * tf * (self.K1 + 1) / (tf + norm))
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
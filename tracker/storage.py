@@ -0,0 +1,1524 @@
+"""
+Tracker Storage Backends
+Pluggable persistence for the application tracker.
+
+- SQLiteStorage (default): one row per application, WAL mode, indexed on
+  status, company/title and follow_up_date. Writes touch a single row.
+- JSONStorage: the original applications.json format, plus an append-only
+  status event log next to it. Inserts rewrite the whole file, so it is
+  only suitable for small trackers.
+
+Status changes are recorded as events {seq, app_id, from, to, at, note};
+the application record is the state materialized from them.
+
+Both backends keep a full-text index (tracker/search.py) up to date on
+every write: FTS5 for SQLite, an in-memory inverted index for JSON.
+
+Closed and stale applications can be moved to a compressed cold tier
+("<path>.archive.jsonl.gz"). Reads only see the active set unless
+include_archived is passed; dedupe keys and counters cover both tiers.
+
+The backend is picked from the file extension: ".json" uses JSONStorage,
+anything else (".db", ".sqlite") uses SQLiteStorage.
+"""
+
+import contextlib
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from tracker.fingerprint import index_keys, lookup_keys, posting_keys
+from tracker.search import SEARCH_FIELDS, InvertedIndex, fts_query, search_fields
+
+
+APP_FIELDS = [
+    "id", "company", "title", "location", "url", "source", "job_id", "status",
+    "resume_path", "cover_letter_path", "ats_score",
+    "keywords_matched", "keywords_missing", "notes", "description",
+    "date_discovered", "date_applied", "date_response", "date_interview",
+    "follow_up_date", "created_at", "updated_at", "status_changed_at",
+]
+LIST_FIELDS = ("keywords_matched", "keywords_missing")
+SORT_FIELDS = (
+    "created_at", "updated_at", "date_applied", "follow_up_date",
+    "ats_score", "company", "title", "status", "id",
+)
+NUMERIC_FIELDS = ("id", "ats_score")
+# Applications in these states never get follow-up reminders
+FOLLOW_UP_EXCLUDED = ("rejected", "withdrawn", "offer")
+# Closed states that move to the archive once they are old enough
+ARCHIVE_STATUSES = ("rejected", "withdrawn", "low_match")
+
+
+def _sort_key(sort: str):
+    default = 0 if sort in NUMERIC_FIELDS else ""
+    return lambda app: (app.get(sort) or default, app["id"])
+
+
+def _matches(app: dict, filters: dict) -> bool:
+    """In-Python equivalent of SQLiteStorage.query's WHERE clause."""
+    if filters.get("status") and app["status"] != filters["status"]:
+        return False
+    if filters.get("source") and app.get("source") != filters["source"]:
+        return False
+    if filters.get("company_prefix") and not app.get("company", "").lower().startswith(
+            filters["company_prefix"].lower()):
+        return False
+    if filters.get("created_after") and app.get("created_at", "") < filters["created_after"]:
+        return False
+    if filters.get("created_before") and app.get("created_at", "") >= filters["created_before"]:
+        return False
+    if filters.get("min_ats_score") is not None and (app.get("ats_score") or 0) < filters["min_ats_score"]:
+        return False
+    return True
+
+
+def _project(app: dict, fields: Optional[list]) -> dict:
+    if not fields:
+        return app
+    return {f: app.get(f) for f in ["id"] + [f for f in fields if f != "id"]}
+
+
+def _page(ordered: list, filters: dict, sort: str, descending: bool, limit: int,
+          after: Optional[tuple], fields: Optional[list]) -> list[dict]:
+    """Keyset page over applications already sorted by _sort_key(sort)."""
+    key = _sort_key(sort)
+    if descending:
+        start = bisect_left(ordered, tuple(after), key=key) if after else len(ordered)
+        indexes = range(start - 1, -1, -1)
+    else:
+        start = bisect_right(ordered, tuple(after), key=key) if after else 0
+        indexes = range(start, len(ordered))
+    page = []
+    for i in indexes:
+        if _matches(ordered[i], filters):
+            page.append(_project(ordered[i], fields))
+            if len(page) >= limit:
+                break
+    return page
+
+
+def _merge_pages(hot: list, cold: list, sort: str, descending: bool, limit: int) -> list:
+    return sorted(hot + cold, key=_sort_key(sort), reverse=descending)[:limit]
+
+
+def _is_stale(app: dict, closed_before: str, discovered_before: str) -> bool:
+    """Whether an application belongs in the archive (see SQLiteStorage.STALE_SQL)."""
+    if app.get("status") in ARCHIVE_STATUSES:
+        return (app.get("status_changed_at") or app.get("updated_at", "")) < closed_before
+    return app.get("status") == "discovered" and app.get("created_at", "") < discovered_before
+
+
+def _file_stat(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _has_open_follow_up(app: dict) -> bool:
+    return bool(app.get("follow_up_date")) and app.get("status") not in FOLLOW_UP_EXCLUDED
+
+
+def _empty_data() -> dict:
+    return {"next_id": 1, "applications": [], "dedupe": {}, "stats": {}}
+
+
+# ── Aggregate counters ───────────────────────────────────────────
+# Stored next to the data as {metric: {key: value}} and adjusted by
+# stat_deltas() on every insert/update, so stats never need a scan.
+
+def _week(date: str) -> str:
+    try:
+        year, week, _ = datetime.fromisoformat(date).isocalendar()
+    except (TypeError, ValueError):
+        return ""
+    return f"{year}-W{week:02d}"
+
+
+def stat_deltas(old: Optional[dict], new: Optional[dict]) -> list[tuple]:
+    """(metric, key, delta) counter changes for replacing old with new."""
+    totals = {}
+    for app, sign in ((old, -1), (new, 1)):
+        if app is None:
+            continue
+        changes = [
+            ("status", app.get("status", ""), sign),
+            ("source", app.get("source", ""), sign),
+            ("week", _week(app.get("date_discovered", "")), sign),
+        ]
+        score = app.get("ats_score") or 0
+        if score > 0:
+            changes += [("ats_sum", "", sign * score), ("ats_count", "", sign)]
+        for metric, key, delta in changes:
+            totals[(metric, key)] = totals.get((metric, key), 0) + delta
+    return [(m, k, d) for (m, k), d in totals.items() if d]
+
+
+def _seconds_between(start: str, end: str) -> Optional[float]:
+    try:
+        return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+def transition_deltas(app: dict, event: dict) -> list[tuple]:
+    """Funnel and time-in-stage counter changes for a status event on app."""
+    if event["from"] == event["to"]:
+        return []
+    deltas = [("entered", event["to"], 1)]
+    since = app.get("status_changed_at") or app.get("created_at", "")
+    seconds = _seconds_between(since, event["at"])
+    if seconds is not None:
+        deltas += [("stage_exits", event["from"], 1),
+                   ("stage_seconds", event["from"], seconds)]
+    return deltas
+
+
+def insert_deltas(app: dict) -> list[tuple]:
+    return stat_deltas(None, app) + [("entered", app.get("status", ""), 1)]
+
+
+def rebuild_deltas(apps: list[dict], events: list[dict]) -> list[tuple]:
+    """All counters for apps, with funnel/stage history replayed from events."""
+    by_app = {}
+    for event in events:
+        by_app.setdefault(event["app_id"], []).append(event)
+    deltas = []
+    for app in apps:
+        history = sorted(by_app.get(app["id"], []), key=lambda e: e["seq"])
+        state = {"status": history[0]["from"] if history else app.get("status", ""),
+                 "created_at": app.get("created_at", "")}
+        deltas += stat_deltas(None, app) + [("entered", state["status"], 1)]
+        for event in history:
+            deltas += transition_deltas(state, event)
+            apply_status_event(state, event)
+    return deltas
+
+
+def _stats_view(stats: dict) -> dict:
+    """Shape raw {metric: {key: value}} counters for callers."""
+    return {
+        "by_status": {k: int(v) for k, v in stats.get("status", {}).items() if v},
+        "by_source": {k: int(v) for k, v in stats.get("source", {}).items() if v},
+        "by_week": dict(sorted(
+            (k, int(v)) for k, v in stats.get("week", {}).items() if v
+        )),
+        "score_sum": stats.get("ats_sum", {}).get("", 0.0),
+        "score_count": int(stats.get("ats_count", {}).get("", 0)),
+        "entered": {k: int(v) for k, v in stats.get("entered", {}).items() if v},
+        "stage_seconds": dict(stats.get("stage_seconds", {})),
+        "stage_exits": {k: int(v) for k, v in stats.get("stage_exits", {}).items() if v},
+    }
+
+
+# ── Status events ────────────────────────────────────────────────
+
+STATUS_DATE_FIELDS = {
+    "applied": "date_applied",
+    "response": "date_response",
+    "interview": "date_interview",
+}
+
+
+def apply_status_event(app: dict, event: dict):
+    """Materialize a status event onto its application (in place)."""
+    if event["to"] != app.get("status"):
+        app["status_changed_at"] = event["at"]
+    app["status"] = event["to"]
+    app["updated_at"] = event["at"]
+    if event["to"] in STATUS_DATE_FIELDS:
+        app[STATUS_DATE_FIELDS[event["to"]]] = event["at"]
+    if event.get("note"):
+        existing = app.get("notes", "")
+        app["notes"] = f"{existing}\n[{event['at'][:10]}] {event['note']}".strip()
+
+
+class _FileLock:
+    """
+    Exclusive advisory lock on a sidecar file, shared by every process
+    (e.g. each uvicorn worker) that opens the same tracker.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            import msvcrt
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                import msvcrt
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+        return False
+
+
+class _Archive:
+    """
+    Cold tier: archived applications as gzip-compressed JSON lines.
+    Each archive run appends one gzip member, so the file is only ever
+    appended to; callers serialize appends with the backend's write lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._apps = {}
+        self._stat = None
+        self._end = 0
+
+    def load(self) -> dict:
+        """{app_id: application} for every archived application."""
+        with self._lock:
+            stat = _file_stat(self.path)
+            if stat != self._stat:
+                self._apps, self._end = self._read() if stat else ({}, 0)
+                self._stat = stat
+            return self._apps
+
+    def _read(self) -> tuple[dict, int]:
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        apps, pos = {}, 0
+        while pos < len(raw):
+            member = zlib.decompressobj(wbits=31)
+            try:
+                text = member.decompress(raw[pos:])
+            except zlib.error:
+                break
+            if not member.eof:
+                break  # torn member from an interrupted archive run
+            for line in text.splitlines():
+                if line.strip():
+                    app = json.loads(line)
+                    apps[app["id"]] = app
+            pos = len(raw) - len(member.unused_data)
+        return apps, pos
+
+    def append(self, apps: list[dict]):
+        if not apps:
+            return
+        self.load()
+        payload = "".join(json.dumps(a, separators=(",", ":")) + "\n" for a in apps)
+        with open(self.path, "ab") as f:
+            if f.tell() != self._end:
+                f.truncate(self._end)
+            f.write(gzip.compress(payload.encode()))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class _Ticket:
+    """A write queued for the next JSON group commit."""
+
+    __slots__ = ("op", "log", "result", "error", "done")
+
+    def __init__(self, op, log: bool = False):
+        self.op = op
+        self.log = log
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class JSONStorage:
+    """
+    Legacy whole-file JSON storage.
+    The parsed document is kept in memory and only re-read when the file's
+    mtime or size changes, so reads between writes skip the JSON parse.
+
+    Writes are group-committed: each write is queued as an operation on
+    the document, and every write arriving within `commit_window` seconds
+    shares a single flush. Flushes go to a temp file that is fsynced and
+    then os.replace()d over the tracker, so a killed process never leaves
+    a truncated file. `compact` drops the indentation from the file.
+
+    Commits hold an exclusive lock on "<path>.lock" and re-read the file
+    if another process changed it, so several processes can share one
+    tracker without lost updates or duplicate IDs.
+
+    Status changes only append one line to "<name>.events.jsonl"; load()
+    replays the log on top of the snapshot. Once the unfolded tail of the
+    log reaches `snapshot_bytes` the next commit rewrites the snapshot,
+    with every event folded into its per-application "history", and
+    starts a new log generation ("<name>.<n>.events.jsonl", n is stored in
+    the snapshot) instead of truncating the old log in place. A reader
+    always pairs a snapshot with its own generation's log, so it never
+    replays a log that was emptied under it. The log therefore only holds
+    the events since the last snapshot, and history lookups never scan it.
+    """
+
+    kind = "json"
+
+    def __init__(self, path: str, compact: bool = False, commit_window: float = 0.002,
+                 snapshot_bytes: int = 1 << 20):
+        self.path = path
+        self._log_base = os.path.splitext(path)[0]
+        self.compact = compact
+        self.commit_window = commit_window
+        self.snapshot_bytes = snapshot_bytes
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._queue = []
+        self._committing = False
+        self._deferred = []
+        self._cache = None
+        self._cache_stat = None
+        self._log_gen = 0
+        self._log_pos = 0
+        self._sorted = {}
+        self._search = None
+        self._writes = 0
+        self._file_lock = _FileLock(path + ".lock")
+        self._archive = _Archive(path + ".archive.jsonl.gz")
+
+    def _log_file(self, generation: int) -> str:
+        suffix = f".{generation}" if generation else ""
+        return f"{self._log_base}{suffix}.events.jsonl"
+
+    @property
+    def log_path(self) -> str:
+        """The event log that belongs to the cached snapshot."""
+        return self._log_file(self._log_gen)
+
+    def _stat(self) -> tuple:
+        # os.replace() gives every snapshot a new inode and every log append
+        # grows the log, so this changes on each write even when mtime
+        # resolution is coarse.
+        return (_file_stat(self.path), _file_stat(self.log_path))
+
+    def version(self) -> tuple:
+        """Changes whenever the tracker is written (by us or another process)."""
+        return (self._writes, self._stat())
+
+    def load(self) -> dict:
+        """Load the full tracker document. Treat the result as read-only."""
+        with self._lock:
+            snapshot_stat = _file_stat(self.path)
+            reloaded = self._cache is None or snapshot_stat != self._cache_stat[0]
+            if reloaded:
+                if snapshot_stat is None:
+                    self._cache = _empty_data()
+                else:
+                    with open(self.path, "r") as f:
+                        self._cache = json.load(f)
+                self._cache_stat = (snapshot_stat, None)
+                self._log_gen = self._cache.get("log_generation", 0)
+                self._log_pos = self._cache.get("log_offset", 0)
+                if "history" not in self._cache:
+                    self._cache["history"] = self._read_history(self._log_pos)
+                self._sorted = {}
+                self._search = None
+            log_stat = _file_stat(self.log_path)
+            if log_stat is not None and log_stat[2] < self._log_pos:
+                if not reloaded:
+                    # The log shrank under us: start again from the snapshot
+                    self._discard_cache()
+                    return self.load()
+                self._log_pos = log_stat[2]
+            if log_stat != self._cache_stat[1]:
+                self._replay_log(self._cache)
+                self._cache_stat = (snapshot_stat, log_stat)
+            return self._cache
+
+    def _read_history(self, end: int) -> dict:
+        """
+        Per-app history of the first `end` bytes of the log, for snapshots
+        written before events were folded into them.
+        """
+        history = {}
+        try:
+            with open(self.log_path, "rb") as f:
+                raw = f.read(end)
+        except FileNotFoundError:
+            return history
+        for line in raw[:raw.rfind(b"\n") + 1].splitlines():
+            if line.strip():
+                event = json.loads(line)
+                history.setdefault(str(event["app_id"]), []).append(event)
+        return history
+
+    def _rotate_log(self, data: dict):
+        """
+        Write data as the new snapshot and start the next log generation.
+        Called with the file lock held, once data holds every logged event.
+        """
+        old_log = self.log_path
+        data["log_generation"] = data.get("log_generation", 0) + 1
+        data["log_offset"] = 0
+        self._flush(data)
+        self._log_gen, self._log_pos = data["log_generation"], 0
+        # Readers of the new snapshot never open the old log; a crash
+        # before this unlink only leaves a stale file behind.
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(old_log)
+
+    def _replay_log(self, data: dict):
+        """Apply the events appended to the log since data was read."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_pos)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        # Stop at the last complete line; a torn write is not an event
+        end = tail.rfind(b"\n") + 1
+        for line in tail[:end].splitlines():
+            if line.strip():
+                self._apply_event(data, json.loads(line))
+        self._log_pos += end
+        if end:
+            self._sorted = {}
+
+    def _append_log(self, events: list[dict]):
+        payload = "".join(
+            json.dumps(e, separators=(",", ":")) + "\n" for e in events
+        ).encode()
+        with open(self.log_path, "ab") as f:
+            size = f.tell()
+            if size < self._log_pos:
+                # Never extend the log (that would pad it with NUL bytes)
+                raise OSError(f"{self.log_path} is shorter than the replayed events")
+            if size > self._log_pos:
+                # Drop a torn line left by a process killed mid-append
+                f.truncate(self._log_pos)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_pos += len(payload)
+
+    def _flush(self, data: dict):
+        """Atomically replace the tracker file with data."""
+        directory = os.path.dirname(self.path) or "."
+        mode = os.stat(self.path).st_mode & 0o777 if os.path.exists(self.path) else 0o644
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tracker-", suffix=".tmp")
+        try:
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, "w") as f:
+                if self.compact:
+                    json.dump(data, f, separators=(",", ":"))
+                else:
+                    json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    def _submit(self, op: Callable[[dict], object], log: bool = False):
+        """
+        Queue op(document) -> result for the next group commit and wait
+        until it is on disk. The first waiting writer leads the commit.
+        With log=True, op returns a status event (or None) that is appended
+        to the event log instead of rewriting the snapshot.
+        """
+        ticket = _Ticket(op, log)
+        with self._cond:
+            self._queue.append(ticket)
+            while not ticket.done:
+                if self._committing:
+                    self._cond.wait()
+                else:
+                    self._lead_commit()
+        if ticket.error:
+            raise ticket.error
+        return ticket.result
+
+    def _lead_commit(self):
+        """Apply every queued op and flush once. Called with the lock held."""
+        self._committing = True
+        batch = []
+        try:
+            # Let concurrent writers join this commit
+            deadline = time.monotonic() + self.commit_window
+            while (remaining := deadline - time.monotonic()) > 0:
+                self._cond.wait(remaining)
+            batch, self._queue = self._queue, []
+            with self._file_lock:
+                # load() re-reads the file if another process wrote it
+                data = self._apply_batch(batch)
+                applied = [t for t in batch if t.error is None]
+                if applied:
+                    try:
+                        # The archive is written before the snapshot that
+                        # drops its applications (the active copy wins)
+                        for write in self._deferred:
+                            write()
+                        events = [t.result for t in applied if t.log and t.result]
+                        if events:
+                            self._append_log(events)
+                        unfolded = self._log_pos - data.get("log_offset", 0)
+                        if (any(not t.log for t in applied)
+                                or unfolded >= self.snapshot_bytes):
+                            # Events are folded into the snapshot's history
+                            self._rotate_log(data)
+                        self._cache, self._cache_stat = data, self._stat()
+                    except OSError as e:
+                        self._discard_cache()
+                        for t in batch:
+                            t.error = t.error or e
+                    self._sorted = {}
+                    self._writes += 1
+        finally:
+            self._deferred = []
+            for t in batch:
+                t.done = True
+            self._committing = False
+            self._cond.notify_all()
+
+    def _defer(self, write: Callable[[], None]):
+        """
+        Run a write outside the document (e.g. to the archive) once the
+        batch is applied, so ops replayed after a failure never repeat it.
+        """
+        self._deferred.append(write)
+
+    def _apply_batch(self, batch: list) -> dict:
+        data = self.load()
+        self._deferred = []
+        for ticket in batch:
+            try:
+                ticket.result = ticket.op(data)
+            except Exception as e:
+                ticket.error = e
+                # The failed op may have half-mutated the document: reload
+                # it and replay the ops that succeeded before it.
+                self._discard_cache()
+                self._deferred = []
+                data = self.load()
+                for done in batch:
+                    if done is ticket:
+                        break
+                    if done.error is None:
+                        done.result = done.op(data)
+        return data
+
+    def _discard_cache(self):
+        """Drop a cached document that a failed write may have half-mutated."""
+        self._cache = None
+        self._sorted = {}
+        self._search = None
+
+    def query(self, filters: dict, sort: str = "created_at", descending: bool = True,
+              limit: int = 50, after: tuple = None, fields: list = None,
+              include_archived: bool = False) -> list[dict]:
+        """
+        Filtered, keyset-paginated listing. `after` is the (sort value, id)
+        of the last row of the previous page.
+        """
+        with self._lock:
+            self.load()
+            if sort not in self._sorted:
+                self._sorted[sort] = sorted(self.all(), key=_sort_key(sort))
+            ordered = self._sorted[sort]
+        page = _page(ordered, filters, sort, descending, limit, after, fields)
+        if include_archived:
+            cold = sorted(self.archived(), key=_sort_key(sort))
+            page = _merge_pages(page, _page(cold, filters, sort, descending, limit, after, fields),
+                                sort, descending, limit)
+        return page
+
+    def all(self, status: str = None, include_archived: bool = False) -> list[dict]:
+        apps = self.load()["applications"]
+        if include_archived:
+            apps = sorted(apps + self.archived(), key=lambda a: a["id"])
+        if status:
+            apps = [a for a in apps if a["status"] == status]
+        return apps
+
+    def archived(self, status: str = None) -> list[dict]:
+        """Archived applications, in ID order."""
+        data = self.load()
+        # An app still in the active set (archive run interrupted) wins
+        apps = [a for app_id, a in sorted(self._archive.load().items())
+                if self._find(data, app_id) is None]
+        if status:
+            apps = [a for a in apps if a["status"] == status]
+        return apps
+
+    def archive(self, closed_before: str, discovered_before: str) -> list[int]:
+        """Move stale applications to the archive. Returns their IDs."""
+        def op(data):
+            stale = [a for a in data["applications"]
+                     if _is_stale(a, closed_before, discovered_before)]
+            if not stale:
+                return []
+            self._defer(lambda: self._archive.append(stale))
+            moved = {a["id"] for a in stale}
+            data["applications"] = [a for a in data["applications"] if a["id"] not in moved]
+            data["follow_ups"] = [e for e in self._follow_up_index(data) if e[1] not in moved]
+            return sorted(moved)
+
+        return self._submit(op)
+
+    @staticmethod
+    def _dedupe_index(data: dict) -> dict:
+        """The persisted fingerprint -> app ID index, built on first use."""
+        if "dedupe" not in data:
+            data["dedupe"] = {
+                key: app["id"]
+                for app in data["applications"] for key in index_keys(app)
+            }
+        return data["dedupe"]
+
+    def find_duplicate(self, app: dict) -> Optional[int]:
+        index = self._dedupe_index(self.load())
+        for key in lookup_keys(app):
+            if key in index:
+                return index[key]
+        return None
+
+    def find_posting(self, app: dict) -> Optional[int]:
+        """The active application for app's exact posting (job ID or URL), if any."""
+        data = self.load()
+        index = self._dedupe_index(data)
+        for key in posting_keys(app):
+            app_id = index.get(key)
+            if app_id is not None and self._find(data, app_id) is not None:
+                return app_id
+        return None
+
+    def count(self) -> int:
+        return len(self.all())
+
+    @staticmethod
+    def _find(data: dict, app_id: int) -> Optional[dict]:
+        """Binary search; applications are kept in ID order."""
+        apps = data["applications"]
+        i = bisect_left(apps, app_id, key=lambda a: a["id"])
+        if i < len(apps) and apps[i]["id"] == app_id:
+            return apps[i]
+        return None
+
+    def get(self, app_id: int) -> Optional[dict]:
+        return self._find(self.load(), app_id)
+
+    @staticmethod
+    def _follow_up_index(data: dict) -> list:
+        """Persisted, sorted [follow_up_date, app_id] pairs for open follow-ups."""
+        if "follow_ups" not in data:
+            data["follow_ups"] = sorted(
+                [a["follow_up_date"], a["id"]]
+                for a in data["applications"] if _has_open_follow_up(a)
+            )
+        return data["follow_ups"]
+
+    @staticmethod
+    def _reindex_follow_up(index: list, before: Optional[dict], after: dict):
+        if before and _has_open_follow_up(before):
+            entry = [before["follow_up_date"], before["id"]]
+            i = bisect_left(index, entry)
+            if i < len(index) and index[i] == entry:
+                del index[i]
+        if _has_open_follow_up(after):
+            insort(index, [after["follow_up_date"], after["id"]])
+
+    def follow_ups(self, after: str = None, until: str = None,
+                   limit: int = None) -> list[dict]:
+        """Open follow-ups with after < date <= until, soonest first."""
+        data = self.load()
+        index = self._follow_up_index(data)
+        start = bisect_right(index, [after, float("inf")]) if after else 0
+        end = bisect_right(index, [until, float("inf")]) if until else len(index)
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self._find(data, app_id) for _, app_id in index[start:end]]
+
+    @staticmethod
+    def _stats(data: dict) -> dict:
+        """The persisted aggregate counters, built on first use."""
+        stats = data.get("stats")
+        if stats is None or (data["applications"] and "entered" not in stats):
+            data["stats"] = {}
+            JSONStorage._apply_deltas(data["stats"], rebuild_deltas(data["applications"], []))
+        return data["stats"]
+
+    @staticmethod
+    def _apply_deltas(stats: dict, deltas: list[tuple]):
+        for metric, key, delta in deltas:
+            bucket = stats.setdefault(metric, {})
+            value = bucket.get(key, 0) + delta
+            if abs(value) > 1e-9:
+                bucket[key] = value
+            else:
+                bucket.pop(key, None)
+
+    def stats(self) -> dict:
+        return _stats_view(self._stats(self.load()))
+
+    def rebuild_stats(self) -> dict:
+        def op(data):
+            apps = data["applications"] + self.archived()
+            data["stats"] = {}
+            self._apply_deltas(data["stats"], rebuild_deltas(apps, self._events(data)))
+
+        self._submit(op)
+        return self.stats()
+
+    def replace(self, data: dict):
+        """Replace the full tracker contents, rebuilding derived indexes."""
+        new = {"next_id": data.get("next_id", 1),
+               "applications": sorted(data.get("applications", []), key=lambda a: a["id"])}
+        self._dedupe_index(new)
+        self._stats(new)
+        self._follow_up_index(new)
+
+        def op(doc):
+            # Events already in the log must not be replayed onto the new data
+            new["event_seq"] = doc.get("event_seq", 0)
+            new["history"] = doc.get("history", {})
+            doc.clear()
+            doc.update(new)
+            self._search = None
+
+        self._submit(op)
+
+    def insert(self, apps: list[dict], unique: bool = False) -> list[int]:
+        """
+        Insert applications, assigning IDs. Returns the new IDs.
+        With unique=True, applications matching an existing fingerprint (or
+        an earlier one in the same batch) are skipped.
+        """
+        prepared = [(app, index_keys(app), lookup_keys(app)) for app in apps]
+
+        def op(data):
+            index = self._dedupe_index(data)
+            stats = self._stats(data)
+            follow_ups = self._follow_up_index(data)
+            ids = []
+            for app, keys, probes in prepared:
+                if unique and any(k in index for k in probes):
+                    continue
+                app = {"id": data["next_id"], **app}
+                data["next_id"] += 1
+                data["applications"].append(app)
+                for key in keys:
+                    index.setdefault(key, app["id"])
+                self._apply_deltas(stats, insert_deltas(app))
+                self._reindex_follow_up(follow_ups, None, app)
+                self._reindex_search(app)
+                ids.append(app["id"])
+            return ids
+
+        return self._submit(op)
+
+    def modify(self, app_id: int, fn: Callable[[dict], None]) -> Optional[dict]:
+        """Apply fn to a copy of the application and persist the result."""
+        def op(data):
+            apps = data["applications"]
+            i = bisect_left(apps, app_id, key=lambda a: a["id"])
+            if i == len(apps) or apps[i]["id"] != app_id:
+                return None
+            before = apps[i]
+            after = dict(before)
+            fn(after)
+            self._apply_deltas(self._stats(data), stat_deltas(before, after))
+            self._reindex_follow_up(self._follow_up_index(data), before, after)
+            self._reindex_search(after)
+            apps[i] = after
+            return after
+
+        return self._submit(op)
+
+    def _apply_event(self, data: dict, event: dict):
+        if event["seq"] <= data.get("event_seq", 0):
+            return  # already folded into the snapshot
+        data["event_seq"] = event["seq"]
+        data.setdefault("history", {}).setdefault(str(event["app_id"]), []).append(event)
+        apps = data["applications"]
+        i = bisect_left(apps, event["app_id"], key=lambda a: a["id"])
+        if i == len(apps) or apps[i]["id"] != event["app_id"]:
+            return
+        before = apps[i]
+        after = dict(before)
+        apply_status_event(after, event)
+        self._apply_deltas(self._stats(data),
+                           stat_deltas(before, after) + transition_deltas(before, event))
+        self._reindex_follow_up(self._follow_up_index(data), before, after)
+        if event.get("note"):
+            self._reindex_search(after)
+        apps[i] = after
+
+    def record_status(self, app_id: int, status: str, note: str = "",
+                      at: str = None) -> Optional[dict]:
+        """Append a status-change event. Returns it, or None for an unknown ID."""
+        at = at or datetime.now().isoformat()
+
+        def op(data):
+            app = self._find(data, app_id)
+            if app is None:
+                return None
+            event = {"seq": data.get("event_seq", 0) + 1, "app_id": app_id,
+                     "from": app["status"], "to": status, "at": at, "note": note or ""}
+            self._apply_event(data, event)
+            return event
+
+        return self._submit(op, log=True)
+
+    @staticmethod
+    def _events(data: dict, app_id: int = None) -> list[dict]:
+        history = data.get("history", {})
+        if app_id is not None:
+            return list(history.get(str(app_id), []))
+        return sorted((e for events in history.values() for e in events),
+                      key=lambda e: e["seq"])
+
+    def events(self, app_id: int = None) -> list[dict]:
+        """Status events in the order they were recorded."""
+        with self._lock:
+            return self._events(self.load(), app_id)
+
+    def _reindex_search(self, app: dict):
+        if self._search is not None:
+            self._search.add(app["id"], search_fields(app))
+
+    def search(self, terms: list[str], limit: int = 20,
+               include_archived: bool = False) -> list[dict]:
+        """Applications matching every term, best first, each with a "score"."""
+        with self._lock:
+            data = self.load()
+            if self._search is None:
+                # Archived applications stay indexed; they are filtered below
+                self._search = InvertedIndex()
+                for app in data["applications"] + self.archived():
+                    self._search.add(app["id"], search_fields(app))
+            ranked = self._search.search(terms)
+            cold = self._archive.load() if include_archived else {}
+            results = []
+            for app_id, score in ranked:
+                app = self._find(data, app_id) or cold.get(app_id)
+                if app is not None:
+                    results.append(dict(app, score=round(score, 3)))
+                    if len(results) >= limit:
+                        break
+            return results
+
+    def checkpoint(self):
+        """Fold the event log into a fresh snapshot."""
+        self._submit(lambda data: None)
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage:
+    """
+    Row-per-application SQLite storage (WAL mode).
+    Status events go to the status_events table in the same transaction
+    that updates the application row.
+    """
+
+    kind = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS applications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company TEXT NOT NULL DEFAULT '',
+        title TEXT NOT NULL DEFAULT '',
+        location TEXT NOT NULL DEFAULT '',
+        url TEXT NOT NULL DEFAULT '',
+        source TEXT NOT NULL DEFAULT '',
+        job_id TEXT NOT NULL DEFAULT '',
+        status TEXT NOT NULL DEFAULT 'discovered',
+        resume_path TEXT NOT NULL DEFAULT '',
+        cover_letter_path TEXT NOT NULL DEFAULT '',
+        ats_score REAL NOT NULL DEFAULT 0,
+        keywords_matched TEXT NOT NULL DEFAULT '[]',
+        keywords_missing TEXT NOT NULL DEFAULT '[]',
+        notes TEXT NOT NULL DEFAULT '',
+        description TEXT NOT NULL DEFAULT '',
+        date_discovered TEXT NOT NULL DEFAULT '',
+        date_applied TEXT NOT NULL DEFAULT '',
+        date_response TEXT NOT NULL DEFAULT '',
+        date_interview TEXT NOT NULL DEFAULT '',
+        follow_up_date TEXT NOT NULL DEFAULT '',
+        created_at TEXT NOT NULL DEFAULT '',
+        updated_at TEXT NOT NULL DEFAULT '',
+        status_changed_at TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX IF NOT EXISTS idx_apps_status ON applications(status);
+    CREATE INDEX IF NOT EXISTS idx_apps_company_title ON applications(company, title);
+    CREATE INDEX IF NOT EXISTS idx_apps_follow_up ON applications(follow_up_date);
+    CREATE INDEX IF NOT EXISTS idx_apps_created ON applications(created_at);
+    CREATE INDEX IF NOT EXISTS idx_apps_follow_up_open ON applications(follow_up_date, id)
+        WHERE follow_up_date != '' AND status NOT IN ('rejected', 'withdrawn', 'offer');
+    CREATE TABLE IF NOT EXISTS dedupe_keys (
+        key TEXT PRIMARY KEY,
+        app_id INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS stats (
+        metric TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (metric, key)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS status_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_id INTEGER NOT NULL,
+        from_status TEXT NOT NULL DEFAULT '',
+        to_status TEXT NOT NULL,
+        at TEXT NOT NULL,
+        note TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_app ON status_events(app_id, seq);
+    CREATE VIRTUAL TABLE IF NOT EXISTS app_search USING fts5(
+        """ + ", ".join(SEARCH_FIELDS) + """,
+        tokenize = "unicode61 tokenchars '+#'"
+    );
+    """
+    # SQL equivalent of _is_stale()
+    STALE_SQL = (
+        f"(status IN ({', '.join(repr(s) for s in ARCHIVE_STATUSES)}) "
+        "AND COALESCE(NULLIF(status_changed_at, ''), updated_at) < :closed_before) "
+        "OR (status = 'discovered' AND created_at < :discovered_before)"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._writes = 0
+        self._archive = _Archive(path + ".archive.jsonl.gz")
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._add_missing_columns()
+        has_apps = self.conn.execute("SELECT 1 FROM applications LIMIT 1").fetchone()
+        if has_apps and not self.conn.execute("SELECT 1 FROM app_search LIMIT 1").fetchone():
+            with self._transaction() as conn:
+                self._rebuild_search(conn)
+        if has_apps and not self.conn.execute("SELECT 1 FROM dedupe_keys LIMIT 1").fetchone():
+            with self._transaction() as conn:
+                self._rebuild_dedupe(conn)
+        # Trackers from before the funnel counters have no "entered" metric
+        if has_apps and not self.conn.execute(
+                "SELECT 1 FROM stats WHERE metric = 'entered' LIMIT 1").fetchone():
+            with self._transaction() as conn:
+                self._rebuild_stats(conn)
+
+    def _add_missing_columns(self):
+        """Bring trackers created by older versions up to the current schema."""
+        existing = {r["name"] for r in self.conn.execute("PRAGMA table_info(applications)")}
+        for field in APP_FIELDS:
+            if field not in existing:
+                self.conn.execute(
+                    f"ALTER TABLE applications ADD COLUMN {field} TEXT NOT NULL DEFAULT ''"
+                )
+
+    # ── Row conversion ───────────────────────────────────────────
+
+    @staticmethod
+    def _to_row(app: dict) -> dict:
+        row = {f: app.get(f, "") for f in APP_FIELDS if f != "id"}
+        row["ats_score"] = app.get("ats_score") or 0.0
+        for f in LIST_FIELDS:
+            row[f] = json.dumps(app.get(f) or [])
+        return row
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> dict:
+        app = dict(row)
+        for f in LIST_FIELDS:
+            if f in app:
+                app[f] = json.loads(app[f] or "[]")
+        return app
+
+    def _transaction(self):
+        return _SQLiteTransaction(self)
+
+    def version(self) -> tuple:
+        """
+        Our own commit counter plus SQLite's data_version, which changes
+        when another connection (or process) commits.
+        """
+        with self._lock:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self._writes, data_version)
+
+    # ── Storage interface ────────────────────────────────────────
+
+    def load(self) -> dict:
+        apps = self.all()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'applications'"
+            ).fetchone()
+        next_id = (row["seq"] if row else 0) + 1
+        return {"next_id": next_id, "applications": apps}
+
+    def replace(self, data: dict):
+        """Replace the full tracker contents, rebuilding derived indexes."""
+        with self._transaction() as conn:
+            self._replace(conn, data)
+
+    def import_if_empty(self, data: dict) -> bool:
+        """replace() only if the tracker is still empty (safe across processes)."""
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM applications LIMIT 1").fetchone():
+                return False
+            self._replace(conn, data)
+            return True
+
+    def _replace(self, conn, data: dict):
+        conn.execute("DELETE FROM applications")
+        self._insert_rows(conn, data.get("applications", []), keep_ids=True)
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'applications'")
+        conn.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('applications', ?)",
+            (data.get("next_id", 1) - 1,)
+        )
+        if "events" in data:
+            conn.execute("DELETE FROM status_events")
+            conn.executemany(
+                "INSERT INTO status_events (seq, app_id, from_status, to_status, at, note) "
+                "VALUES (:seq, :app_id, :from, :to, :at, :note)",
+                data["events"]
+            )
+        self._rebuild_dedupe(conn)
+        self._rebuild_search(conn)
+        self._rebuild_stats(conn)
+
+    def _rebuild_dedupe(self, conn):
+        conn.execute("DELETE FROM dedupe_keys")
+        for row in conn.execute("SELECT * FROM applications ORDER BY id").fetchall():
+            self._index_app(conn, self._from_row(row))
+        for app in self._archived(conn):
+            self._index_app(conn, app)
+
+    @staticmethod
+    def _index_app(conn, app: dict):
+        conn.executemany(
+            "INSERT OR IGNORE INTO dedupe_keys (key, app_id) VALUES (?, ?)",
+            [(key, app["id"]) for key in index_keys(app)]
+        )
+
+    @staticmethod
+    def _index_search(conn, app: dict):
+        fields = search_fields(app)
+        conn.execute("DELETE FROM app_search WHERE rowid = ?", (app["id"],))
+        conn.execute(
+            f"INSERT INTO app_search (rowid, {', '.join(fields)}) "
+            f"VALUES (?, {', '.join('?' * len(fields))})",
+            [app["id"], *fields.values()]
+        )
+
+    def _rebuild_search(self, conn):
+        conn.execute("DELETE FROM app_search")
+        for row in conn.execute("SELECT * FROM applications").fetchall():
+            self._index_search(conn, self._from_row(row))
+        for app in self._archived(conn):
+            self._index_search(conn, app)
+
+    def search(self, terms: list[str], limit: int = 20,
+               include_archived: bool = False) -> list[dict]:
+        """Applications matching every term, best first, each with a "score"."""
+        weights = ", ".join(str(w) for w in SEARCH_FIELDS.values())
+        # Archived applications stay in app_search; the join drops them
+        if include_archived:
+            sql = (f"SELECT rowid AS id, bm25(app_search, {weights}) AS rank "
+                   "FROM app_search WHERE app_search MATCH ? ORDER BY rank LIMIT ?")
+        else:
+            sql = (f"SELECT a.*, bm25(app_search, {weights}) AS rank FROM app_search "
+                   "JOIN applications a ON a.id = app_search.rowid "
+                   "WHERE app_search MATCH ? ORDER BY rank LIMIT ?")
+        with self._lock:
+            rows = self.conn.execute(sql, (fts_query(terms), limit)).fetchall()
+        cold = self._archive.load() if include_archived else {}
+        results = []
+        for row in rows:
+            app = self._from_row(row)
+            rank = app.pop("rank")
+            if include_archived:
+                app = self.get(app["id"]) or cold.get(app["id"])
+                if app is None:
+                    continue
+            results.append(dict(app, score=round(-rank, 3)))
+        return results
+
+    @staticmethod
+    def _find_duplicate(conn, app: dict) -> Optional[int]:
+        keys = lookup_keys(app)
+        row = conn.execute(
+            f"SELECT app_id FROM dedupe_keys WHERE key IN ({', '.join('?' * len(keys))}) LIMIT 1",
+            keys
+        ).fetchone()
+        return row[0] if row else None
+
+    def find_duplicate(self, app: dict) -> Optional[int]:
+        with self._lock:
+            return self._find_duplicate(self.conn, app)
+
+    def find_posting(self, app: dict) -> Optional[int]:
+        """The active application for app's exact posting (job ID or URL), if any."""
+        with self._lock:
+            for key in posting_keys(app):
+                # The join skips keys of archived applications
+                row = self.conn.execute(
+                    "SELECT d.app_id FROM dedupe_keys d JOIN applications a ON a.id = d.app_id "
+                    "WHERE d.key = ?", (key,)
+                ).fetchone()
+                if row:
+                    return row[0]
+        return None
+
+    def all(self, status: str = None, include_archived: bool = False) -> list[dict]:
+        with self._lock:
+            if status:
+                rows = self.conn.execute(
+                    "SELECT * FROM applications WHERE status = ? ORDER BY id", (status,)
+                ).fetchall()
+            else:
+                rows = self.conn.execute("SELECT * FROM applications ORDER BY id").fetchall()
+        apps = [self._from_row(r) for r in rows]
+        if include_archived:
+            apps = sorted(apps + self.archived(status), key=lambda a: a["id"])
+        return apps
+
+    def _archived(self, conn) -> list[dict]:
+        # An app still in the active set (archive run interrupted) wins
+        hot = {row[0] for row in conn.execute("SELECT id FROM applications")}
+        return [a for app_id, a in sorted(self._archive.load().items()) if app_id not in hot]
+
+    def archived(self, status: str = None) -> list[dict]:
+        """Archived applications, in ID order."""
+        with self._lock:
+            apps = self._archived(self.conn)
+        if status:
+            apps = [a for a in apps if a["status"] == status]
+        return apps
+
+    def archive(self, closed_before: str, discovered_before: str) -> list[int]:
+        """Move stale applications to the archive. Returns their IDs."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM applications WHERE {self.STALE_SQL} ORDER BY id",
+                {"closed_before": closed_before, "discovered_before": discovered_before}
+            ).fetchall()
+            stale = [self._from_row(r) for r in rows]
+            # Written before the delete: a crash in between leaves the app in
+            # both tiers, and the active copy wins
+            self._archive.append(stale)
+            conn.executemany("DELETE FROM applications WHERE id = ?",
+                             [(a["id"],) for a in stale])
+            return [a["id"] for a in stale]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def query(self, filters: dict, sort: str = "created_at", descending: bool = True,
+              limit: int = 50, after: tuple = None, fields: list = None,
+              include_archived: bool = False) -> list[dict]:
+        """
+        Filtered, keyset-paginated listing pushed down into SQL.
+        Archived applications are paged in Python and merged in.
+        """
+        where, params = [], []
+        if filters.get("status"):
+            where.append("status = ?")
+            params.append(filters["status"])
+        if filters.get("source"):
+            where.append("source = ?")
+            params.append(filters["source"])
+        if filters.get("company_prefix"):
+            prefix = filters["company_prefix"]
+            prefix = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("company LIKE ? ESCAPE '\\'")
+            params.append(prefix + "%")
+        if filters.get("created_after"):
+            where.append("created_at >= ?")
+            params.append(filters["created_after"])
+        if filters.get("created_before"):
+            where.append("created_at < ?")
+            params.append(filters["created_before"])
+        if filters.get("min_ats_score") is not None:
+            where.append("ats_score >= ?")
+            params.append(filters["min_ats_score"])
+        if after:
+            where.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            params += list(after)
+
+        direction = "DESC" if descending else "ASC"
+        columns = ", ".join(["id"] + [f for f in fields if f != "id"]) if fields else "*"
+        sql = f"SELECT {columns} FROM applications"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {sort} {direction}, id {direction} LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        page = [self._from_row(r) for r in rows]
+        if include_archived:
+            cold = sorted(self.archived(), key=_sort_key(sort))
+            page = _merge_pages(page, _page(cold, filters, sort, descending, limit, after, fields),
+                                sort, descending, limit)
+        return page
+
+    def follow_ups(self, after: str = None, until: str = None,
+                   limit: int = None) -> list[dict]:
+        """Open follow-ups with after < date <= until, soonest first (partial index)."""
+        sql = ("SELECT * FROM applications WHERE follow_up_date != '' "
+               "AND status NOT IN ('rejected', 'withdrawn', 'offer')")
+        params = []
+        if after:
+            sql += " AND follow_up_date > ?"
+            params.append(after)
+        if until:
+            sql += " AND follow_up_date <= ?"
+            params.append(until)
+        sql += " ORDER BY follow_up_date, id LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    def get(self, app_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM applications WHERE id = ?", (app_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    @staticmethod
+    def _apply_deltas(conn, deltas: list[tuple]):
+        conn.executemany(
+            "INSERT INTO stats (metric, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value",
+            deltas
+        )
+
+    def _rebuild_stats(self, conn):
+        conn.execute("DELETE FROM stats")
+        apps = [self._from_row(r) for r in conn.execute("SELECT * FROM applications")]
+        apps += self._archived(conn)
+        self._apply_deltas(conn, rebuild_deltas(apps, self._events(conn)))
+        conn.execute("DELETE FROM stats WHERE value = 0")
+
+    def stats(self) -> dict:
+        raw = {}
+        with self._lock:
+            for metric, key, value in self.conn.execute("SELECT metric, key, value FROM stats"):
+                raw.setdefault(metric, {})[key] = value
+        return _stats_view(raw)
+
+    def rebuild_stats(self) -> dict:
+        with self._transaction() as conn:
+            self._rebuild_stats(conn)
+        return self.stats()
+
+    def _insert_rows(self, conn, apps: list[dict], keep_ids: bool = False) -> list[int]:
+        cols = [f for f in APP_FIELDS if f != "id"]
+        if keep_ids:
+            cols = ["id"] + cols
+        sql = (f"INSERT INTO applications ({', '.join(cols)}) "
+               f"VALUES ({', '.join(':' + c for c in cols)})")
+        ids = []
+        for app in apps:
+            row = self._to_row(app)
+            if keep_ids:
+                row["id"] = app["id"]
+            cur = conn.execute(sql, row)
+            app["id"] = cur.lastrowid
+            ids.append(cur.lastrowid)
+        return ids
+
+    def insert(self, apps: list[dict], unique: bool = False) -> list[int]:
+        with self._transaction() as conn:
+            ids = []
+            for app in apps:
+                if unique and self._find_duplicate(conn, app) is not None:
+                    continue
+                ids += self._insert_rows(conn, [app])
+                self._index_app(conn, app)
+                self._index_search(conn, app)
+                self._apply_deltas(conn, insert_deltas(app))
+            return ids
+
+    def modify(self, app_id: int, fn: Callable[[dict], None]) -> Optional[dict]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM applications WHERE id = ?", (app_id,)
+            ).fetchone()
+            if not row:
+                return None
+            app = self._from_row(row)
+            before = dict(app)
+            fn(app)
+            self._apply_deltas(conn, stat_deltas(before, app))
+            self._update_row(conn, app)
+            return app
+
+    def _update_row(self, conn, app: dict):
+        row = self._to_row(app)
+        assignments = ", ".join(f"{c} = :{c}" for c in row)
+        row["id"] = app["id"]
+        conn.execute(f"UPDATE applications SET {assignments} WHERE id = :id", row)
+        self._index_search(conn, app)
+
+    def record_status(self, app_id: int, status: str, note: str = "",
+                      at: str = None) -> Optional[dict]:
+        """Append a status-change event. Returns it, or None for an unknown ID."""
+        at = at or datetime.now().isoformat()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM applications WHERE id = ?", (app_id,)
+            ).fetchone()
+            if not row:
+                return None
+            before = self._from_row(row)
+            event = {"app_id": app_id, "from": before["status"], "to": status,
+                     "at": at, "note": note or ""}
+            event["seq"] = conn.execute(
+                "INSERT INTO status_events (app_id, from_status, to_status, at, note) "
+                "VALUES (:app_id, :from, :to, :at, :note)", event
+            ).lastrowid
+            after = dict(before)
+            apply_status_event(after, event)
+            self._apply_deltas(conn, stat_deltas(before, after) + transition_deltas(before, event))
+            self._update_row(conn, after)
+            return event
+
+    @staticmethod
+    def _events(conn, app_id: int = None) -> list[dict]:
+        sql = "SELECT seq, app_id, from_status, to_status, at, note FROM status_events"
+        params = ()
+        if app_id is not None:
+            sql += " WHERE app_id = ?"
+            params = (app_id,)
+        return [
+            {"seq": seq, "app_id": a, "from": f, "to": t, "at": at, "note": note}
+            for seq, a, f, t, at, note in conn.execute(sql + " ORDER BY seq", params)
+        ]
+
+    def events(self, app_id: int = None) -> list[dict]:
+        """Status events in the order they were recorded."""
+        with self._lock:
+            return self._events(self.conn, app_id)
+
+    def checkpoint(self):
+        """Checkpoint the WAL into the main database file."""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class _SQLiteTransaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK around the storage connection."""
+
+    def __init__(self, storage: SQLiteStorage):
+        self.storage = storage
+
+    def __enter__(self):
+        self.storage._lock.acquire()
+        self.storage.conn.execute("BEGIN IMMEDIATE")
+        return self.storage.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.storage.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            self.storage._writes += 1
+        finally:
+            self.storage._lock.release()
+        return False
+
+
+# ── Backend registry ─────────────────────────────────────────────
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+
+def open_storage(path: str, **json_options):
+    """
+    Return the (cached) storage backend for a tracker path.
+    json_options (compact, commit_window, snapshot_bytes) configure a
+    JSONStorage on first open.
+    """
+    path = os.path.abspath(path)
+    with _storages_lock:
+        storage = _storages.get(path)
+        if storage is None:
+            if path.endswith(".json"):
+                storage = JSONStorage(path, **json_options)
+            else:
+                is_new = not os.path.exists(path)
+                storage = SQLiteStorage(path)
+                legacy = os.path.splitext(path)[0] + ".json"
+                if is_new and os.path.exists(legacy):
+                    data = _export(JSONStorage(legacy))
+                    # Another worker may be doing the same migration right now
+                    if storage.import_if_empty(data):
+                        print(f"Migrated {len(data['applications'])} applications from {legacy}")
+            _storages[path] = storage
+        return storage
+
+
+def close_storages():
+    """Close every cached backend (tests, benchmarks, shutdown)."""
+    with _storages_lock:
+        for storage in _storages.values():
+            storage.close()
+        _storages.clear()
+
+
+def _export(src) -> dict:
+    """Full document of src for replace(): both tiers plus status events."""
+    data = dict(src.load(), events=src.events())
+    data["applications"] = src.all(include_archived=True)
+    return data
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """
+    One-shot migration of a legacy applications.json into a SQLite tracker.
+    Application IDs and next_id are preserved. Returns the number migrated.
+    """
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"No JSON tracker at {json_path}")
+    path = os.path.abspath(db_path)
+    if path.endswith(".json"):
+        raise ValueError(f"Migration target must be a SQLite path, got {db_path}")
+    # Not open_storage(): its automatic import of a sibling applications.json
+    # would fill the target before this migration could
+    with _storages_lock:
+        dst = _storages.get(path)
+        if dst is None:
+            dst = _storages[path] = SQLiteStorage(path)
+    data = _export(JSONStorage(json_path))
+    if not dst.import_if_empty(data):
+        raise ValueError(f"{db_path} already contains applications")
+    return len(data["applications"])